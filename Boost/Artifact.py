@@ -0,0 +1,236 @@
+# C++Boost as a Python package
+#
+# Copyright (C) 2017 Stefan Zimmermann <user@zimmermann.co>
+#
+# This is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Relocatable binary artifacts of built Boost prefixes.
+
+Built prefixes are exported as compressed ``.tar.gz`` archives, named after
+their SHA256 hash, to an artifact :class:`Boost.Artifact.Store`. A JSON
+manifest, named after the :func:`Boost.Artifact.key` of all build
+parameters, points to the archive. :func:`Boost.resolve` imports matching
+artifacts instead of building from source
+"""
+
+import hashlib
+import json
+import os
+import sys
+import sysconfig
+import tarfile
+
+from path import Path
+
+from . import Config, Events, HTTP
+from .Download import CHUNK_SIZE, sha256sum
+from .Prefix import parse_components
+from .Source import BITS, TOOLSET, _extractall
+
+__all__ = ('Store', 'parameters', 'key', 'store')
+
+
+def python_abi():
+    """
+    Get ABI tag of running Python, like ``'cpython-36m-x86_64-linux-gnu'``.
+    """
+    return (sysconfig.get_config_var('SOABI')
+            or sys.implementation.cache_tag)
+
+
+def parameters(version, components=None, variant='release', link='shared',
+               cxxflags=(), linkflags=()):
+    """
+    Get ``dict`` of all parameters determining a Boost build.
+
+    Besides the given ones, those are :const:`Boost.TOOLSET`,
+    :const:`Boost.Source.BITS`, platform, and :func:`.python_abi`. Extra
+    `cxxflags` and `linkflags` are only included if there are any
+    """
+    parameters = {
+        'version': str(version),
+        'toolset': TOOLSET,
+        'bits': BITS,
+        'platform': sysconfig.get_platform(),
+        'python': python_abi(),
+        'components': parse_components(components),
+        'variant': variant,
+        'link': link,
+    }
+    if cxxflags or linkflags:
+        parameters.update(cxxflags=list(cxxflags), linkflags=list(linkflags))
+    return parameters
+
+
+def key(parameters):
+    """
+    Get hex digest identifying artifacts built with `parameters`.
+    """
+    return hashlib.sha256(json.dumps(
+        parameters, sort_keys=True).encode('utf-8')).hexdigest()[:32]
+
+
+def store():
+    """
+    Get :class:`.Store` at :const:`Boost.Config.ARTIFACTS`.
+
+    :return: ``None`` if not configured
+    """
+    if not Config.ARTIFACTS:
+        return None
+
+    return Store(Config.ARTIFACTS, push=Config.ARTIFACTS_PUSH)
+
+
+class Store(object):
+    """
+    Artifact store in a local directory or on a plain HTTP server.
+
+    HTTP stores are read via ``GET`` and written via ``PUT`` requests
+    """
+
+    def __init__(self, location, push=False):
+        """
+        Prepare store at `location` directory path or HTTP(S) URL.
+
+        :param push:
+           Export built prefixes to this store
+        """
+        self.location = str(location)
+        self.push = push
+
+    @property
+    def remote(self):
+        """
+        Whether this store is on an HTTP server.
+        """
+        return self.location.startswith(('http://', 'https://'))
+
+    def _url(self, name):
+        return self.location.rstrip('/') + '/' + name
+
+    def _read(self, name, path):
+        """
+        Copy stored file `name` to local `path`.
+
+        :return: ``False`` if not existing
+        """
+        if not self.remote:
+            source = Path(self.location) / name
+            if not source.isfile():
+                return False
+
+            source.copy(path)
+            return True
+
+        response = HTTP.session().get(self._url(name), stream=True)
+        if response.status_code == 404:
+            return False
+
+        response.raise_for_status()
+        with open(path, 'wb') as file:
+            for data in response.iter_content(CHUNK_SIZE):
+                file.write(data)
+        return True
+
+    def _write(self, name, path):
+        """
+        Store local file at `path` as `name`.
+        """
+        if self.remote:
+            with open(path, 'rb') as file:
+                HTTP.session().put(
+                    self._url(name), data=file).raise_for_status()
+            return
+
+        target = Path(self.location).makedirs_p() / name
+        temp = target.dirname() / '.{}.tmp-{}'.format(name, os.getpid())
+        Path(path).copy(temp)
+        os.replace(temp, target)
+
+    def fetch(self, parameters, prefix):
+        """
+        Import artifact built with `parameters` into `prefix` directory.
+
+        :return: ``False`` if there is no such artifact
+        :raises RuntimeError: on corrupted artifacts
+        """
+        prefix = Path(prefix).makedirs_p()
+        name = key(parameters)
+        manifest = prefix / '.{}.json'.format(name)
+        archive = prefix / '.{}.tar.gz'.format(name)
+        try:
+            if not self._read(name + '.json', manifest):
+                Events.emit('cache', cache='artifact', hit=False, key=name)
+                return False
+
+            with manifest.open() as file:
+                sha256 = json.load(file)['sha256']
+            Events.emit('cache', cache='artifact', hit=True, key=name)
+            with Events.phase(
+                    'artifact.fetch', "Fetching Boost artifact {} from {!r}"
+                    .format(sha256, self.location), sha256=sha256,
+                    location=self.location) as results:
+                if not self._read(sha256 + '.tar.gz', archive):
+                    raise RuntimeError("Missing Boost artifact {} in {!r}"
+                                       .format(sha256, self.location))
+
+                results['bytes'] = archive.size
+            if sha256sum(archive) != sha256:
+                raise RuntimeError("SHA256 mismatch of Boost artifact {} "
+                                   "from {!r}".format(sha256, self.location))
+
+            with Events.phase(
+                    'extract', "Extracting Boost artifact {} to {!r}"
+                    .format(sha256, prefix), archive=str(archive)) as results, \
+                    tarfile.open(archive) as tar:
+                _extractall(tar, prefix)
+                results['files'] = len(tar.members)
+        finally:
+            manifest.remove_p()
+            archive.remove_p()
+        return True
+
+    def publish(self, parameters, prefix):
+        """
+        Export `prefix` directory as artifact built with `parameters`.
+
+        :return: SHA256 hex digest of the artifact archive
+        """
+        prefix = Path(prefix)
+        name = key(parameters)
+        temp = prefix.dirname() / '.{}.tmp-{}'.format(name, os.getpid())
+        temp.makedirs_p()
+        try:
+            archive = temp / 'artifact.tar.gz'
+            with tarfile.open(archive, 'w:gz') as tar:
+                for path in sorted(prefix.listdir()):
+                    tar.add(path, arcname=path.basename())
+            sha256 = sha256sum(archive)
+            with Events.phase(
+                    'artifact.publish', "Publishing Boost artifact {} to {!r}"
+                    .format(sha256, self.location), sha256=sha256,
+                    location=self.location, bytes=archive.size):
+                self._write(sha256 + '.tar.gz', archive)
+
+            manifest = temp / 'manifest.json'
+            with manifest.open('w') as file:
+                json.dump({'sha256': sha256, 'parameters': parameters},
+                          file, indent=2, sort_keys=True)
+            # written last, making the artifact visible
+            self._write(name + '.json', manifest)
+        finally:
+            temp.rmtree_p()
+        return sha256
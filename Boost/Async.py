@@ -0,0 +1,110 @@
+# C++Boost as a Python package
+#
+# Copyright (C) 2017 Stefan Zimmermann <user@zimmermann.co>
+#
+# This is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Executors behind the asyncio API of the Boost package.
+
+The ``a*`` coroutines like :meth:`Boost.Source.adownload` or
+:func:`Boost.aresolve` run the blocking implementations in thread pools, so
+that steps for different Boost versions overlap. Network transfers and
+decompression go through the :func:`.io_executor`, CPU-heavy ``b2`` builds
+through the :func:`.build_executor`, which is bounded by
+:const:`Boost.Config.PARALLEL_BUILDS`
+
+Only steps of *different* Boost versions may overlap. The ``a*`` methods of
+one :class:`Boost.Source` must not run concurrently, as they share its
+source tree. :func:`Boost.aresolve` serializes them with :func:`Boost.lock`
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import threading
+
+from . import Config
+
+__all__ = ('io_executor', 'build_executor', 'io', 'build',
+           'build_blocking')
+
+
+#: Number of threads for concurrent network transfers and decompression
+IO_WORKERS = 8
+
+_lock = threading.Lock()
+
+_executors = {}
+
+
+def _executor(kind, workers):
+    with _lock:
+        executor, current = _executors.get(kind, (None, None))
+        if executor is None or workers != current:
+            if executor is not None:
+                executor.shutdown(wait=False)
+            executor = ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix='Boost-' + kind)
+            _executors[kind] = executor, workers
+        return executor
+
+
+def io_executor():
+    """
+    Get shared executor with :const:`.IO_WORKERS` threads.
+    """
+    return _executor('io', IO_WORKERS)
+
+
+def build_executor():
+    """
+    Get shared executor limited to :const:`Boost.Config.PARALLEL_BUILDS`.
+
+    Gets re-created if the setting was changed since last time
+    """
+    return _executor('build', max(1, Config.PARALLEL_BUILDS))
+
+
+def io(func, *args, **kwargs):
+    """
+    Run blocking `func` with `args` and `kwargs` in :func:`.io_executor`.
+
+    Must be called from a running event loop
+
+    :return: ``asyncio.Future`` of the result
+    """
+    return asyncio.get_running_loop().run_in_executor(
+        io_executor(), partial(func, *args, **kwargs))
+
+
+def build(func, *args, **kwargs):
+    """
+    Run blocking `func` with `args` and `kwargs` in :func:`.build_executor`.
+
+    Must be called from a running event loop
+
+    :return: ``asyncio.Future`` of the result
+    """
+    return asyncio.get_running_loop().run_in_executor(
+        build_executor(), partial(func, *args, **kwargs))
+
+
+def build_blocking(func, *args, **kwargs):
+    """
+    Run `func` in :func:`.build_executor` and wait for its result.
+
+    For bounding builds started by threads of the :func:`.io_executor`
+    """
+    return build_executor().submit(func, *args, **kwargs).result()
@@ -0,0 +1,322 @@
+# C++Boost as a Python package
+#
+# Copyright (C) 2017 Stefan Zimmermann <user@zimmermann.co>
+#
+# This is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Size-budgeted LRU eviction of Boost downloads, sources and installations
+with :class:`Boost.Cache.Cache`.
+"""
+
+import json
+import os
+import re
+import time
+
+from path import Path
+
+from . import Config, Events
+from .Lock import Lock
+from .Prefix import Prefix
+from .Source import TOOLSET
+
+__all__ = ('Cache', )
+
+
+#: Shared locks on prefixes, held by this process until it exits
+_held = {}
+
+
+def size(path):
+    """
+    Get disk usage of file or directory tree at `path` in bytes.
+
+    Hardlinked files within the tree are only counted once
+    """
+    path = Path(path)
+    if not path.isdir():
+        return path.lstat().st_size
+
+    inodes = set()
+    total = 0
+    for file in path.walkfiles():
+        stat = file.lstat()
+        if (stat.st_dev, stat.st_ino) not in inodes:
+            inodes.add((stat.st_dev, stat.st_ino))
+            total += stat.st_size
+    return total
+
+
+#: Names of temporary directories, ending with the ID of the owning process
+TEMP_NAME = re.compile(r'^\..+\.tmp-(?P<pid>[0-9]+)$')
+
+
+def alive(pid):
+    """
+    Check if a process with ID `pid` is running.
+    """
+    if os.name == 'nt':  # pragma: no cover
+        # os.kill() would terminate the process on Windows
+        import ctypes
+
+        kernel32 = ctypes.windll.kernel32
+        # PROCESS_QUERY_LIMITED_INFORMATION
+        handle = kernel32.OpenProcess(0x1000, False, pid)
+        if not handle:
+            return False
+
+        kernel32.CloseHandle(handle)
+        return True
+
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+
+    return True
+
+
+class Cache(object):
+    """
+    Manager of Boost source archives, source trees and installed prefixes.
+
+    Records their last use in a JSON database and evicts the least recently
+    used ones if their total size exceeds a budget. Entries are only evicted
+    while holding their locks exclusively. Source archives and trees are
+    protected by the build lock of their Boost version and prefixes by the
+    shared locks from :meth:`.hold`. Shared locks are not supported on
+    Windows, so prefixes in use are not protected there
+    """
+
+    def __init__(self, home, cache):
+        """
+        Manage prefixes in `home` and sources in `cache` directory.
+        """
+        self.home = Path(home)
+        self.cache = Path(cache)
+
+    @property
+    def usage_file(self):
+        """
+        Absolute path of JSON database with usage times and sizes.
+        """
+        return self.home / '.usage.json'
+
+    def build_lock(self, boost_lib_version):
+        """
+        Get :class:`Boost.Lock.Lock` for building a Boost version.
+
+        Like ``'1_66_0'``. Specific to :const:`Boost.TOOLSET`
+        """
+        return Lock(self.home / '.locks' / '{}-{}.lock'.format(
+            boost_lib_version, TOOLSET))
+
+    def prefix_lock(self, prefix, shared=False):
+        """
+        Get :class:`Boost.Lock.Lock` for using or evicting `prefix`.
+        """
+        prefix = Path(prefix)
+        return Lock(self.home / '.locks' / 'prefixes' / prefix.dirname()
+                    .basename() / prefix.basename() + '.lock', shared=shared)
+
+    def hold(self, prefix):
+        """
+        Protect `prefix` from eviction until this process exits.
+
+        :return: ``False`` if `prefix` doesn't exist (anymore)
+        """
+        prefix = Path(prefix)
+        if prefix not in _held:
+            _held[prefix] = self.prefix_lock(prefix, shared=True)
+            _held[prefix].acquire()
+        if not prefix.isdir():
+            _held.pop(prefix).release()
+            return False
+
+        return True
+
+    def usage(self):
+        """
+        Get ``dict`` of usage records by path relative to :attr:`.home`.
+
+        Records are ``dict`` with last ``'used'`` time and known ``'size'``
+        """
+        try:
+            with self.usage_file.open() as file:
+                usage = json.load(file)
+        except (IOError, OSError, ValueError):
+            return {}
+
+        return usage if isinstance(usage, dict) else {}
+
+    def _update(self, update):
+        """
+        Apply `update` function to :meth:`.usage` and save it atomically.
+        """
+        with Lock(self.home / '.locks' / 'usage.lock'):
+            usage = self.usage()
+            update(usage)
+            temp = self.usage_file + '.tmp-{}'.format(os.getpid())
+            with temp.open('w') as file:
+                json.dump(usage, file, indent=2, sort_keys=True)
+            os.replace(temp, self.usage_file)
+
+    def touch(self, paths, changed=False):
+        """
+        Record usage of `paths` now.
+
+        :param changed:
+           Forget the recorded sizes, like for source trees, which grow
+           while building. Sizes get determined again by :meth:`.collect`
+        """
+        now = time.time()
+
+        def update(usage):
+            for path in paths:
+                record = usage.setdefault(
+                    str(self.home.relpathto(path)), {})
+                record['used'] = now
+                if changed:
+                    record.pop('size', None)
+        self._update(update)
+
+    def entries(self):
+        """
+        Get all source archives, source trees and prefixes.
+
+        :return:
+           ``list`` of ``(path, lock)`` tuples, where `lock` must be held
+           exclusively for evicting
+        """
+        entries = []
+        if self.cache.isdir():
+            for path in sorted(self.cache.listdir('boost_*')):
+                if path.isdir():
+                    version = path.basename()[len('boost_'):]
+                elif path.endswith('.tar.bz2'):
+                    version = path.basename()[len('boost_'):-len('.tar.bz2')]
+                else:
+                    continue
+
+                entries.append((path, self.build_lock(version)))
+        for home in sorted(self.home.dirs()) if self.home.isdir() else ():
+            if home.basename().startswith('.'):
+                continue
+
+            for path in sorted(home.dirs()):
+                if not path.basename().startswith('.'):
+                    entries.append((Prefix(path), self.prefix_lock(path)))
+        return entries
+
+    def leftovers(self):
+        """
+        Get temporary directories of processes, which are not running anymore.
+
+        Like source trees and prefixes renamed for eviction, or prefixes
+        being installed, which were left behind by crashed processes
+        """
+        dirs = [self.cache] if self.cache.isdir() else []
+        if self.home.isdir():
+            dirs.extend(home for home in sorted(self.home.dirs())
+                        if not home.basename().startswith('.'))
+        return [path for directory in dirs
+                for path in sorted(directory.dirs('.*.tmp-*'))
+                if TEMP_NAME.match(path.basename())
+                and not alive(int(TEMP_NAME.match(path.basename())
+                                  .group('pid')))]
+
+    def clean(self):
+        """
+        Remove all :meth:`.leftovers`.
+
+        Tolerates other processes removing them at the same time
+
+        :return: ``list`` of removed paths
+        """
+        removed = self.leftovers()
+        for path in removed:
+            Events.emit('remove', "Removing {!r}".format(path),
+                        path=str(path))
+            path.rmtree(ignore_errors=True)
+        return removed
+
+    def collect(self, budget=None):
+        """
+        Evict least recently used entries exceeding size `budget`.
+
+        Also removes all :meth:`.leftovers` via :meth:`.clean`
+
+        :param budget:
+           Maximum total size in bytes. Defaults to
+           :const:`Boost.Config.CACHE_BUDGET`. Nothing is evicted if
+           neither is defined
+        :return: ``list`` of evicted paths
+        """
+        self.clean()
+        if budget is None:
+            budget = Config.CACHE_BUDGET
+        if budget is None:
+            return []
+
+        usage = self.usage()
+        entries = []
+        for path, lock in self.entries():
+            record = usage.get(str(self.home.relpathto(path)), {})
+            if record.get('size') is None:
+                record['size'] = size(path)
+            entries.append((record.get('used') or path.mtime, path, lock,
+                            record['size']))
+
+        total = sum(entry[3] for entry in entries)
+        evicted = []
+        for _, path, lock, entry_size in sorted(entries):
+            if total <= budget:
+                break
+
+            if not lock.acquire(blocking=False):
+                Events.emit('cache.busy', "Not evicting {!r}, which is in use"
+                            .format(path), path=str(path))
+                continue
+
+            try:
+                Events.emit('cache.evict', "Evicting {!r} ({} bytes)".format(
+                    path, entry_size), path=str(path), size=entry_size)
+                if path.isdir():
+                    # atomically hide prefixes from readers. Leftovers of
+                    # crashes get cleaned by .leftovers()
+                    temp = path.dirname() / '.{}.tmp-{}'.format(
+                        path.basename(), os.getpid())
+                    os.rename(path, temp)
+                    temp.rmtree()
+                elif path.exists():
+                    path.remove()
+            finally:
+                lock.release()
+            total -= entry_size
+            evicted.append(path)
+
+        known = {str(self.home.relpathto(path)): entry_size
+                 for _, path, _, entry_size in entries if path not in evicted}
+
+        def update(usage):
+            for key in list(usage):
+                if key not in known:
+                    del usage[key]
+            for key, entry_size in known.items():
+                usage.setdefault(key, {})['size'] = entry_size
+        self._update(update)
+        return evicted
@@ -0,0 +1,193 @@
+# C++Boost as a Python package
+#
+# Copyright (C) 2017 Stefan Zimmermann <user@zimmermann.co>
+#
+# This is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Compile Boost through ``ccache`` or ``sccache`` compiler caches.
+
+``b2`` gets a generated ``user-config.jam``, which prepends the cache
+launcher to the compiler command. Rebuilding the same Boost sources for other
+prefixes, components or Python ABIs then mostly consists of cache hits
+"""
+
+import json
+import os
+import re
+import shutil
+import subprocess
+
+from path import Path
+
+from . import Config, Events
+
+__all__ = ('find', 'user_config', 'environ', 'stats', 'report')
+
+
+#: Supported compiler cache launchers in order of preference
+LAUNCHERS = ('ccache', 'sccache')
+
+#: Compiler commands of ``b2`` toolsets, which get wrapped by a launcher
+COMPILERS = {
+    'gcc': 'g++',
+    'msvc': 'cl',
+}
+
+
+def find(launcher=None):
+    """
+    Get absolute path of compiler cache `launcher` executable.
+
+    :param launcher:
+       ``'auto'`` for the first one of :const:`.LAUNCHERS` found in
+       ``PATH``, ``'off'`` for none at all, or an explicit name or path,
+       which raises ``RuntimeError`` if not found. Defaults to
+       :const:`Boost.Config.COMPILER_CACHE`
+    :return: ``None`` if no launcher should or can be used
+    """
+    launcher = (launcher or Config.COMPILER_CACHE).strip()
+    if launcher.lower() in ('', '0', 'false', 'no', 'off', 'none'):
+        return None
+
+    if launcher.lower() == 'auto':
+        for name in LAUNCHERS:
+            path = shutil.which(name)
+            if path:
+                return Path(path).realpath()
+
+        return None
+
+    path = shutil.which(launcher)
+    if path is None:
+        raise RuntimeError("Compiler cache {!r} not found".format(launcher))
+
+    return Path(path).realpath()
+
+
+def _kind(launcher):
+    """
+    Get ``'ccache'`` or ``'sccache'`` from `launcher` executable path.
+    """
+    name = Path(launcher).basename().lower()
+    return 'sccache' if name.startswith('sccache') else 'ccache'
+
+
+def user_config(launcher, path, toolset):
+    """
+    Write ``b2`` ``user-config.jam`` to `path`.
+
+    Sets up `toolset` to run its compiler through `launcher`
+
+    :return: Absolute `path`
+    """
+    path = Path(path).realpath()
+    path.write_text('using {} : : "{}" {} ;\n'.format(
+        toolset, Path(launcher).replace('\\', '/'), COMPILERS[toolset]))
+    return path
+
+
+def environ(launcher, basedir):
+    """
+    Get environment for running ``b2`` with compiler cache `launcher`.
+
+    Lets ``ccache`` rewrite absolute paths below `basedir` to relative
+    ones, so Boost source trees in other locations share cache entries
+    """
+    env = dict(os.environ)
+    if _kind(launcher) == 'ccache':
+        env.setdefault('CCACHE_BASEDIR', str(Path(basedir).realpath()))
+    return env
+
+
+def _output(command):
+    """
+    Get stdout of `command` or ``None`` on failure.
+    """
+    try:
+        return subprocess.check_output(
+            command, stderr=subprocess.STDOUT).decode('utf-8', 'replace')
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def stats(launcher):
+    """
+    Get cumulative cache statistics of compiler cache `launcher`.
+
+    :return:
+       ``dict`` with numbers of ``'hits'`` and ``'misses'`` or ``None`` if
+       statistics are not available
+    """
+    if _kind(launcher) == 'sccache':
+        output = _output([launcher, '--show-stats', '--stats-format=json'])
+        try:
+            data = json.loads(output)['stats']
+            return {
+                key: sum(data['cache_' + key]['counts'].values())
+                for key in ('hits', 'misses')}
+
+        except (TypeError, ValueError, KeyError, AttributeError):
+            return None
+
+    # ccache >= 4 has machine-readable statistics
+    output = _output([launcher, '--print-stats'])
+    if output is not None:
+        counters = {}
+        for line in output.splitlines():
+            key, _, value = line.partition('\t')
+            if value.strip().isdigit():
+                counters[key.strip()] = int(value)
+        if counters:
+            return {
+                'hits': counters.get('direct_cache_hit', 0)
+                + counters.get('preprocessed_cache_hit', 0),
+                'misses': counters.get('cache_miss', 0),
+            }
+
+    # ccache 3 only has human-readable ones
+    output = _output([launcher, '-s'])
+    if output is None:
+        return None
+
+    hits = re.findall(r'^cache hit \(\w+\)\s+(\d+)', output, re.MULTILINE)
+    misses = re.findall(r'^cache miss\s+(\d+)', output, re.MULTILINE)
+    if not (hits or misses):
+        return None
+
+    return {'hits': sum(map(int, hits)), 'misses': sum(map(int, misses))}
+
+
+def report(launcher, before, after):
+    """
+    Report cache hits and misses between `before` and `after` :func:`.stats`.
+
+    Emits a ``'compiler_cache'`` event
+
+    :return: ``dict`` with differences or ``None`` if unknown
+    """
+    if before is None or after is None:
+        Events.emit('compiler_cache', "No statistics available from "
+                    "compiler cache {!r}".format(launcher),
+                    launcher=str(launcher), hits=None, misses=None)
+        return None
+
+    diff = {key: after[key] - before[key] for key in ('hits', 'misses')}
+    total = diff['hits'] + diff['misses']
+    Events.emit('compiler_cache', "Compiler cache {!r}: {} hits, {} misses{}"
+                .format(launcher, diff['hits'], diff['misses'], total and
+                        " ({:.0f}% hit rate)".format(
+                            100.0 * diff['hits'] / total) or ""),
+                launcher=str(launcher), **diff)
+    return diff
@@ -0,0 +1,222 @@
+# C++Boost as a Python package
+#
+# Copyright (C) 2017 Stefan Zimmermann <user@zimmermann.co>
+#
+# This is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Settings of the Boost package, taken from ``CAREFREE_BOOST_*`` env vars.
+
+All settings are plain module constants, determined once on import. They can
+be overridden at runtime by assigning to the module attributes
+"""
+
+import os
+import re
+
+__all__ = ('OFFLINE', 'INDEX_TTL', 'JOBS', 'MEMORY_PER_JOB',
+           'DOWNLOAD_CONNECTIONS', 'HEADER_ONLY', 'HEADERS_LINK',
+           'LOCK_TIMEOUT', 'COMPILER_CACHE', 'ARTIFACTS', 'ARTIFACTS_PUSH',
+           'DEDUPE', 'CACHE_BUDGET', 'EVENTS_FILE', 'HTTP_TIMEOUT',
+           'HTTP_RETRIES', 'HTTP_BACKOFF', 'HTTP_PROXY', 'CA_BUNDLE',
+           'MIRRORS', 'PARALLEL_BUILDS', 'PROFILE', 'CXXFLAGS', 'LINKFLAGS',
+           'DISCOVERY', 'BOOST_ROOT', 'CMAKE_PREFIX_PATH', 'SYSTEM_PREFIXES',
+           'VERSION')
+
+
+def flag(name, default=False):
+    """
+    Get boolean value of environment variable `name`.
+
+    ``''``, ``'0'``, ``'false'``, ``'no'`` and ``'off'`` (case-insensitive)
+    are considered ``False``. Returns `default` if variable is not defined
+    """
+    value = os.environ.get(name)
+    if value is None:
+        return default
+
+    return value.strip().lower() not in ('', '0', 'false', 'no', 'off')
+
+
+def number(name, default=None, type=float):
+    """
+    Get numeric value of environment variable `name`.
+
+    Returns `default` if variable is not defined or empty
+    """
+    value = os.environ.get(name, '').strip()
+    if not value:
+        return default
+
+    try:
+        return type(value)
+    except ValueError:
+        raise ValueError("Invalid value {!r} of environment variable {}"
+                         .format(value, name))
+
+
+SIZE_UNITS = {
+    '': 1,
+    'K': 1024,
+    'M': 1024 ** 2,
+    'G': 1024 ** 3,
+    'T': 1024 ** 4,
+}
+
+
+def size(name, default=None):
+    """
+    Get byte size value of environment variable `name`.
+
+    Supports binary unit suffixes like ``'512M'``, ``'2G'`` or ``'1.5T'``.
+    Returns `default` if variable is not defined or empty
+    """
+    value = os.environ.get(name, '').strip()
+    if not value:
+        return default
+
+    return parse_size(value, name=name)
+
+
+def parse_size(value, name=None):
+    """
+    Convert byte size string `value` like ``'2G'`` to ``int`` bytes.
+    """
+    match = re.match(r'^([0-9.]+)\s*([KMGT]?)i?B?$', str(value).strip(),
+                     re.IGNORECASE)
+    if not match:
+        raise ValueError("Invalid size {!r}{}".format(
+            value, name and " of environment variable {}".format(name) or ""))
+
+    number, unit = match.groups()
+    return int(float(number) * SIZE_UNITS[unit.upper()])
+
+
+#: Never access the network. Boost metadata must then come from cache
+OFFLINE = flag('CAREFREE_BOOST_OFFLINE')
+
+#: Seconds after which the persisted release index gets revalidated
+INDEX_TTL = number('CAREFREE_BOOST_INDEX_TTL', 24 * 60 * 60)
+
+#: Number of parallel ``b2`` jobs. Determined from available CPUs and memory
+#: if not defined
+JOBS = number('CAREFREE_BOOST_JOBS', type=int)
+
+#: Memory reserved per parallel ``b2`` job for limiting the number of jobs
+MEMORY_PER_JOB = size('CAREFREE_BOOST_MEMORY_PER_JOB', parse_size('1G'))
+
+#: Number of concurrent connections for downloading source archives
+DOWNLOAD_CONNECTIONS = number('CAREFREE_BOOST_DOWNLOAD_CONNECTIONS', 4,
+                              type=int)
+
+#: Only resolve Boost headers for the lazy :mod:`Boost` module attributes
+HEADER_ONLY = flag('CAREFREE_BOOST_HEADER_ONLY')
+
+#: How to install header-only Boost to :const:`Boost.CAREFREE_BOOST_HOME`:
+#: ``'copy'`` or ``'hardlink'``. Symlinks to cached source trees are not
+#: supported there, as those get evicted
+HEADERS_LINK = os.environ.get('CAREFREE_BOOST_HEADERS_LINK') or 'hardlink'
+
+#: Seconds to wait for other processes building the same Boost. Forever if
+#: not defined
+LOCK_TIMEOUT = number('CAREFREE_BOOST_LOCK_TIMEOUT')
+
+#: Compiler cache launcher for building Boost: ``'auto'`` to use ``ccache`` or
+#: ``sccache`` if found, ``'off'``, or an explicit name or path
+COMPILER_CACHE = os.environ.get('CAREFREE_BOOST_COMPILER_CACHE') or 'auto'
+
+#: Artifact store with prebuilt Boost prefixes: a local directory path or an
+#: HTTP(S) URL. Not used if not defined
+ARTIFACTS = os.environ.get('CAREFREE_BOOST_ARTIFACTS') or None
+
+#: Export prefixes built from source to the :const:`.ARTIFACTS` store
+ARTIFACTS_PUSH = flag('CAREFREE_BOOST_ARTIFACTS_PUSH')
+
+#: Deduplicate files of new installations via hardlinks to the object store
+#: in ``CAREFREE_BOOST_HOME/.objects/``. Off by default, because prefixes
+#: then share files, which must not be modified in place. Existing prefixes
+#: can be deduplicated explicitly with ``python -m Boost dedupe``
+DEDUPE = flag('CAREFREE_BOOST_DEDUPE')
+
+#: Maximum total size of Boost source archives, source trees and installed
+#: prefixes. Least recently used ones get evicted. Unlimited if not defined
+CACHE_BUDGET = size('CAREFREE_BOOST_CACHE_BUDGET')
+
+#: File for appending all progress events of :mod:`Boost.Events` as JSON lines
+EVENTS_FILE = os.environ.get('CAREFREE_BOOST_EVENTS_FILE') or None
+
+#: Seconds to wait for connecting to and receiving data from HTTP servers
+HTTP_TIMEOUT = number('CAREFREE_BOOST_HTTP_TIMEOUT', 30)
+
+#: Number of retries of failed HTTP requests
+HTTP_RETRIES = number('CAREFREE_BOOST_HTTP_RETRIES', 3, type=int)
+
+#: Factor of exponential backoff in seconds between HTTP retries
+HTTP_BACKOFF = number('CAREFREE_BOOST_HTTP_BACKOFF', 0.5)
+
+#: Proxy URL for all HTTP(S) requests. The standard ``HTTP_PROXY`` and
+#: ``HTTPS_PROXY`` env vars are used if not defined
+HTTP_PROXY = os.environ.get('CAREFREE_BOOST_HTTP_PROXY') or None
+
+#: CA bundle file or directory for verifying HTTPS servers. The standard
+#: ``REQUESTS_CA_BUNDLE`` env var or certifi's bundle is used if not defined
+CA_BUNDLE = os.environ.get('CAREFREE_BOOST_CA_BUNDLE') or None
+
+#: Whitespace-separated mirror base URLs or local directories with Boost
+#: source archives, which are probed and ranked before downloading. See
+#: :func:`Boost.Mirrors.candidates`
+MIRRORS = tuple(os.environ.get('CAREFREE_BOOST_MIRRORS', '').split())
+
+#: Maximum number of concurrent Boost builds started via the asyncio API.
+#: Every build already runs parallel ``b2`` jobs
+PARALLEL_BUILDS = number('CAREFREE_BOOST_PARALLEL_BUILDS', 1, type=int)
+
+#: Build profile of compiled Boost libraries, if not given explicitly. A name
+#: like ``'release-static-lto'``. See :func:`Boost.Profile.profiles`
+PROFILE = os.environ.get('CAREFREE_BOOST_PROFILE') or None
+
+#: Extra compiler flags for building Boost, added to the :const:`.PROFILE`
+CXXFLAGS = os.environ.get('CAREFREE_BOOST_CXXFLAGS') or None
+
+#: Extra linker flags for building Boost, added to the :const:`.PROFILE`
+LINKFLAGS = os.environ.get('CAREFREE_BOOST_LINKFLAGS') or None
+
+#: Whitespace-separated discovery providers, which are asked in order for
+#: existing Boost installations before building: ``'root'``, ``'cmake'`` and
+#: ``'system'``. Empty by default for only using own installations. See
+#: :const:`Boost.Discovery.PROVIDERS`
+DISCOVERY = tuple(os.environ.get('CAREFREE_BOOST_DISCOVERY', '').split())
+
+#: Boost installation or source tree with built libs for the ``'root'``
+#: discovery provider. The standard ``BOOST_ROOT`` env var if not defined
+BOOST_ROOT = (os.environ.get('CAREFREE_BOOST_ROOT')
+              or os.environ.get('BOOST_ROOT') or None)
+
+#: Prefixes searched by the ``'cmake'`` discovery provider for
+#: ``BoostConfig.cmake``, besides :const:`.SYSTEM_PREFIXES`. The standard
+#: ``CMAKE_PREFIX_PATH`` env var if not defined
+CMAKE_PREFIX_PATH = tuple(path for path in (
+    os.environ.get('CAREFREE_BOOST_CMAKE_PREFIX_PATH')
+    or os.environ.get('CMAKE_PREFIX_PATH', '')).split(os.pathsep) if path)
+
+#: Whitespace-separated prefixes searched by the ``'system'`` discovery
+#: provider for ``include/boost/`` and compiled libs
+SYSTEM_PREFIXES = tuple(os.environ.get(
+    'CAREFREE_BOOST_SYSTEM_PREFIXES',
+    '' if os.name == 'nt' else '/usr/local /usr').split())
+
+#: Boost version for the lazy :mod:`Boost` module attributes. Exact like
+#: ``'1.66.0'`` or a PEP 440 specifier like ``'>=1.70,<1.80'``, which prefers
+#: already installed versions. The latest release if not defined
+VERSION = os.environ.get('CAREFREE_BOOST_VERSION') or None
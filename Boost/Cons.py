@@ -1,51 +1,82 @@
-# C++Boost as a Python package
-#
-# Copyright (C) 2017 Stefan Zimmermann <user@zimmermann.co>
-#
-# This is free software: you can redistribute it and/or modify
-# it under the terms of the GNU Lesser General Public License as published by
-# the Free Software Foundation, either version 3 of the License, or
-# (at your option) any later version.
-#
-# This is distributed in the hope that it will be useful,
-# but WITHOUT ANY WARRANTY; without even the implied warranty of
-# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
-# GNU Lesser General Public License for more details.
-#
-# You should have received a copy of the GNU Lesser General Public License
-# along with this.  If not, see <http://www.gnu.org/licenses/>.
-
-import zcons
-
-import Boost
-from Boost import TOOLSET
-
-
-class Environment(zcons.Environment):
-    """
-    SCons environment with pre-configured Boost.
-    """
-
-    def __init__(self, *args, **kwargs):
-        """
-        Add any `args` and `kwargs` for basic SCons ``Environment``.
-
-        ``tools=`` are always extended with leading ``'default'`` and
-        trailing :const:`Boost.TOOLSET`
-        """
-        kwargs['tools'] = ['default'] + list(kwargs.get('tools', ())) + [
-            TOOLSET]
-        super(Environment, self).__init__(*args, **kwargs)
-        self.Prepend(
-            CPPPATH=Boost.INCLUDE,
-            LIBPATH=Boost.LIB,
-        )
-        if TOOLSET == 'msvc':  # pragma: no cover
-            self.Append(
-                # correct auto linkage
-                CPPDEFINES=['_DLL', 'BOOST_ALL_DYN_LINK'],
-                # support exceptions
-                CXXFLAGS=['/EHsc'],
-                # avoid warning LNK4098
-                LINKFLAGS=['/NODEFAULTLIB:libcmt'],
-            )
+# C++Boost as a Python package
+#
+# Copyright (C) 2017 Stefan Zimmermann <user@zimmermann.co>
+#
+# This is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this.  If not, see <http://www.gnu.org/licenses/>.
+
+import zcons
+
+import Boost
+from Boost import TOOLSET
+from Boost.Profile import parse_profile
+
+
+#: Resolved :const:`Boost.RESOLVED` values by explicit build profile, which
+#: are memoized like the lazy :mod:`Boost` module attributes
+_resolved = {}
+
+
+class Environment(zcons.Environment):
+    """
+    SCons environment with pre-configured Boost.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """
+        Add any `args` and `kwargs` for basic SCons ``Environment``.
+
+        ``tools=`` are always extended with leading ``'default'`` and
+        trailing :const:`Boost.TOOLSET`
+
+        ``BOOST_PROFILE=`` selects a build profile like
+        ``'release-static-lto'``. See :func:`Boost.Profile.parse_profile`.
+        Defaults to :const:`Boost.Config.PROFILE`, as used for the lazily
+        resolved :const:`Boost.INCLUDE` and :const:`Boost.LIB`. The flags
+        of the profile are added, since code using LTO-built or CPU-tuned
+        Boost libraries needs them too
+        """
+        profile = kwargs.pop('BOOST_PROFILE', None)
+        if profile is None:
+            include, lib = Boost.INCLUDE, Boost.LIB
+            profile = parse_profile(profile)
+        else:
+            profile = parse_profile(profile)
+            if profile not in _resolved:
+                _resolved[profile] = Boost._resolved(profile)
+            include, lib = (_resolved[profile]['INCLUDE'],
+                            _resolved[profile]['LIB'])
+
+        kwargs['tools'] = ['default'] + list(kwargs.get('tools', ())) + [
+            TOOLSET]
+        super(Environment, self).__init__(*args, **kwargs)
+        self['BOOST_PROFILE'] = profile.name
+        self.Prepend(
+            CPPPATH=include,
+            LIBPATH=lib,
+        )
+        self.Append(
+            CXXFLAGS=list(profile.cxxflags),
+            LINKFLAGS=list(profile.linkflags),
+        )
+        if TOOLSET == 'msvc':  # pragma: no cover
+            self.Append(
+                # correct auto linkage
+                CPPDEFINES=['_DLL'] + (
+                    ['BOOST_ALL_DYN_LINK'] if profile.link == 'shared'
+                    else []),
+                # support exceptions
+                CXXFLAGS=['/EHsc'],
+                # avoid warning LNK4098
+                LINKFLAGS=['/NODEFAULTLIB:libcmt'],
+            )
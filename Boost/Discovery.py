@@ -0,0 +1,358 @@
+# C++Boost as a Python package
+#
+# Copyright (C) 2017 Stefan Zimmermann <user@zimmermann.co>
+#
+# This is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Discovery of existing Boost installations outside of this package.
+
+Providers of :const:`.PROVIDERS` yield candidate header and library
+directories, like from ``BOOST_ROOT``, CMake package configurations, or the
+system prefixes. Each candidate is examined by reading ``boost/version.hpp``
+and the names of the compiled libraries. Results are cached per process,
+until the examined files or directories are modified
+"""
+
+from collections import OrderedDict
+import re
+import sys
+import sysconfig
+import threading
+
+from path import Path
+
+from . import Config, Events
+from .Prefix import Prefix
+from .Source import version_matches
+
+__all__ = ('Installation', 'PROVIDERS', 'installations', 'discover')
+
+
+BOOST_VERSION_REGEX = re.compile(
+    r'^\s*#\s*define\s+BOOST_VERSION\s+(\d+)', re.MULTILINE)
+
+LIBFILE_REGEX = re.compile(
+    r'^(lib)?boost_(?P<name>[a-z0-9_]+?)(?P<tags>-[^.]*)?'
+    r'\.(so|a|dylib|lib)(?P<version>(\.[0-9]+)*)$')
+
+#: Names of compiled libraries differing from the ``b2`` component name
+LIBRARY_COMPONENTS = {
+    'log_setup': 'log',
+    'prg_exec_monitor': 'test',
+    'test_exec_monitor': 'test',
+    'unit_test_framework': 'test',
+    'wserialization': 'serialization',
+}
+
+
+def read_version(include):
+    """
+    Get Boost version string from ``boost/version.hpp`` in `include` dir.
+
+    :return: ``None`` if there is no valid version header
+    """
+    try:
+        text = (Path(include) / 'boost' / 'version.hpp').text()
+    except (IOError, OSError, UnicodeDecodeError):
+        return None
+
+    match = BOOST_VERSION_REGEX.search(text)
+    if not match:
+        return None
+
+    number = int(match.group(1))
+    return '{}.{}.{}'.format(
+        number // 100000, number // 100 % 1000, number % 100)
+
+
+def component(libfile, version):
+    """
+    Get ``b2`` component name of compiled library file `libfile`.
+
+    :return:
+       ``None`` if not a Boost library of given `version`. Also for
+       Python bindings of other Python versions
+    """
+    match = LIBFILE_REGEX.match(libfile)
+    if not match:
+        return None
+
+    major, minor, _ = version.split('.')
+    suffix = match.group('version')
+    numbers = suffix.lstrip('.').split('.')[:2] if suffix else []
+    if numbers != [major, minor][:len(numbers)]:
+        return None
+
+    tags = re.search(r'-(\d+)_(\d+)', match.group('tags') or '')
+    if tags and tags.groups() != (major, minor):
+        return None
+
+    name = match.group('name')
+    python = re.match(r'^(mpi_python|python|numpy)(\d*)$', name)
+    if python:
+        if python.group(2) not in ('', '{}{}'.format(*sys.version_info)):
+            return None
+
+        return 'mpi' if python.group(1) == 'mpi_python' else 'python'
+
+    if name.startswith(('math_', 'stacktrace_')):
+        return name.split('_', 1)[0]
+
+    return LIBRARY_COMPONENTS.get(name, name)
+
+
+class Installation(Prefix):
+    """
+    An existing Boost installation, found by a discovery provider.
+
+    Not managed by this package, so it is never written to, deduplicated or
+    evicted. The :attr:`.info` is determined from the examined files. The
+    prefix path itself is the parent of the :attr:`.include` directory
+    """
+
+    @classmethod
+    def examine(cls, include, lib, provider):
+        """
+        Examine Boost headers in `include` dir and libraries in `lib` dirs.
+
+        :return: ``None`` if there is no valid ``boost/version.hpp``
+        """
+        include = Path(include).realpath()
+        version = read_version(include)
+        if version is None:
+            return None
+
+        lib = [Path(path).realpath() for path in lib if Path(path).isdir()]
+        components = sorted({
+            name for name in (
+                component(libfile.basename(), version)
+                for path in lib for libfile in path.files())
+            if name is not None})
+        installation = cls(include.dirname())
+        installation._info = {
+            'version': version,
+            'toolset': None,
+            'components': components or None,
+            'header_only': not components,
+            'include': str(include),
+            'lib': [str(path) for path in lib],
+            'provider': provider,
+        }
+        return installation
+
+    @property
+    def info(self):
+        """
+        ``dict`` of installation details, as determined by :meth:`.examine`.
+        """
+        return dict(self._info)
+
+    def write_info(self, **info):
+        raise RuntimeError("Can't write info of discovered Boost installation "
+                           "{!r}".format(self))
+
+    def provides(self, components, header_only=False):
+        """
+        Check if this installation contains requested library `components`.
+
+        The complete set of libraries of a foreign installation is unknown.
+        So ``None`` `components`, meaning all libraries, are never provided
+        """
+        return super(Installation, self).provides(
+            components, header_only=header_only)
+
+    @property
+    def provider(self):
+        """
+        Name of the discovery provider, which found this installation.
+        """
+        return self._info['provider']
+
+    @property
+    def include(self):
+        """
+        Absolute path of directory with the ``boost/`` header tree.
+        """
+        return Path(self._info['include'])
+
+    @property
+    def lib(self):
+        """
+        ``list`` of absolute paths of directories with compiled libraries.
+        """
+        return [Path(path) for path in self._info['lib']]
+
+
+def _lib_dirs(prefix):
+    prefix = Path(prefix)
+    dirs = [prefix / 'lib64', prefix / 'lib']
+    multiarch = sysconfig.get_config_var('MULTIARCH')
+    if multiarch:
+        dirs.insert(0, prefix / 'lib' / multiarch)
+    return dirs
+
+
+def boost_root():
+    """
+    Find Boost at :const:`Boost.Config.BOOST_ROOT`.
+
+    An installation prefix with ``include/boost/``, or a source tree with
+    libraries built to ``stage/lib/``
+    """
+    if not Config.BOOST_ROOT:
+        return
+
+    root = Path(Config.BOOST_ROOT)
+    include = root / 'include'
+    if not (include / 'boost').isdir():
+        include = root
+    yield include, [root / 'stage' / 'lib'] + _lib_dirs(root) + sorted(
+        root.dirs('lib*-msvc-*') if root.isdir() else ())
+
+
+def cmake():
+    """
+    Find Boost via ``Boost-<version>/BoostConfig.cmake`` package configs.
+
+    Searched in ``lib/cmake/`` dirs of :const:`Boost.Config.CMAKE_PREFIX_PATH`
+    and :const:`Boost.Config.SYSTEM_PREFIXES`
+    """
+    for prefix in Config.CMAKE_PREFIX_PATH + Config.SYSTEM_PREFIXES:
+        for lib in _lib_dirs(prefix):
+            cmakedir = lib / 'cmake'
+            if not cmakedir.isdir():
+                continue
+
+            for config in sorted(cmakedir.glob('Boost-*/BoostConfig.cmake'),
+                                 reverse=True):
+                version = config.dirname().basename().split('-', 1)[1]
+                yield _cmake_include(cmakedir, version, prefix), [lib]
+
+
+def _cmake_include(cmakedir, version, prefix):
+    """
+    Get include dir from ``boost_headers`` config in `cmakedir`.
+
+    Falls back to ``include/`` of `prefix`
+    """
+    headers = cmakedir / 'boost_headers-{}'.format(version) / (
+        'boost_headers-config.cmake')
+    try:
+        match = re.search(r'_BOOST_INCLUDEDIR\s+"\$\{_BOOST_CMAKEDIR\}/'
+                          r'([^"]*)"', headers.text())
+    except (IOError, OSError, UnicodeDecodeError):
+        match = None
+    if match:
+        return (cmakedir / match.group(1)).normpath()
+
+    return Path(prefix) / 'include'
+
+
+def system():
+    """
+    Find Boost in :const:`Boost.Config.SYSTEM_PREFIXES`.
+
+    Like installed by distribution packages
+    """
+    for prefix in Config.SYSTEM_PREFIXES:
+        yield Path(prefix) / 'include', _lib_dirs(prefix)
+
+
+#: Discovery providers by name, as used in :const:`Boost.Config.DISCOVERY`.
+#: Functions yielding pairs of include dir and ``list`` of lib dirs
+PROVIDERS = OrderedDict([
+    ('root', boost_root),
+    ('cmake', cmake),
+    ('system', system),
+])
+
+_lock = threading.Lock()
+
+_cache = {}
+
+
+def _stamp(include, lib):
+    stamp = []
+    for path in [Path(include) / 'boost' / 'version.hpp'] + list(lib):
+        try:
+            stamp.append(path.stat().st_mtime)
+        except OSError:
+            stamp.append(None)
+    return tuple(stamp)
+
+
+def installations(providers=None):
+    """
+    Get all Boost installations found by discovery `providers`.
+
+    :param providers:
+       Sequence of names from :const:`.PROVIDERS`. Defaults to
+       :const:`Boost.Config.DISCOVERY`
+    :return:
+       ``list`` of :class:`.Installation` objects in order of providers.
+       Installations found by several providers are only listed once
+    """
+    if providers is None:
+        providers = Config.DISCOVERY
+    found = OrderedDict()
+    for name in providers:
+        try:
+            provider = PROVIDERS[name]
+        except KeyError:
+            raise ValueError("Unknown Boost discovery provider {!r}. "
+                             "Available: {}".format(
+                                 name, ", ".join(PROVIDERS)))
+
+        for include, lib in provider():
+            if not (Path(include) / 'boost').isdir():
+                continue
+
+            key = (name, str(include), tuple(map(str, lib)))
+            stamp = _stamp(include, lib)
+            with _lock:
+                cached = _cache.get(key)
+            if cached is not None and cached[0] == stamp:
+                installation = cached[1]
+            else:
+                installation = Installation.examine(include, lib, name)
+                with _lock:
+                    _cache[key] = stamp, installation
+            if installation is not None:
+                found.setdefault(installation.include, installation)
+    return list(found.values())
+
+
+def discover(version=None, components=None, header_only=False,
+             providers=None):
+    """
+    Find an existing Boost installation satisfying a request.
+
+    See :func:`Boost.resolve` for the arguments. `version` can also be a
+    PEP 440 specifier or ``None`` for any version. See
+    :func:`.installations` for `providers`
+
+    :return: The first matching :class:`.Installation` or ``None``
+    """
+    for installation in installations(providers):
+        if version_matches(installation.version, version) \
+                and installation.provides(components, header_only=header_only):
+            Events.emit('discover', "Using {} Boost {} from {!r}".format(
+                installation.provider, installation.version,
+                installation.include), provider=installation.provider,
+                version=str(installation.version),
+                include=str(installation.include))
+            return installation
+
+    return None
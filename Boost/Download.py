@@ -0,0 +1,325 @@
+# C++Boost as a Python package
+#
+# Copyright (C) 2017 Stefan Zimmermann <user@zimmermann.co>
+#
+# This is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Resumable, multi-connection HTTP downloads with :class:`Boost.Download.Download`.
+"""
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import hashlib
+import json
+import os
+import threading
+
+from path import Path
+import requests
+
+from . import Config, Events, HTTP
+from .Mirrors import local
+
+__all__ = ('Download', )
+
+
+#: Size of byte ranges, which are fetched and persisted as a whole
+CHUNK_SIZE = 4 * 1024 ** 2
+
+#: Number of attempts for fetching a single byte range
+ATTEMPTS = 3
+
+
+def sha256sum(path):
+    """
+    Get SHA256 hex digest of file at `path`.
+    """
+    hash = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for data in iter(lambda: file.read(CHUNK_SIZE), b''):
+            hash.update(data)
+    return hash.hexdigest()
+
+
+class Download(object):
+    """
+    Download of a single file via HTTP ``Range`` requests.
+
+    Byte ranges are fetched concurrently over the shared session and written
+    to a ``.part`` file. Completed ranges are recorded in a ``.part.json``
+    state file, so an interrupted download resumes where it stopped. The
+    final file only appears after successful SHA256 verification.
+
+    Failing sources are switched to alternative URLs or local paths of the
+    same file, also in the middle of the download
+    """
+
+    def __init__(self, url, path, sha256=None, connections=None,
+                 chunk_size=CHUNK_SIZE):
+        """
+        Prepare download from `url` to `path`.
+
+        :param url:
+           The source URL, or a sequence of alternative URLs and local file
+           paths in order of preference, like from
+           :func:`Boost.Mirrors.rank`
+        :param sha256:
+           Expected hex digest. Verification is skipped if ``None``
+        :param connections:
+           Number of concurrent connections. Defaults to
+           :const:`Boost.Config.DOWNLOAD_CONNECTIONS`
+        """
+        if isinstance(url, (list, tuple)):
+            self.urls = [str(item) for item in url]
+        else:
+            self.urls = [str(url)]
+        self.url = self.urls[0]
+        self.path = Path(path).realpath()
+        self.sha256 = sha256
+        self.connections = connections or Config.DOWNLOAD_CONNECTIONS
+        self.chunk_size = chunk_size
+
+    @property
+    def partial(self):
+        """
+        Absolute path of ``.part`` file for incomplete download.
+        """
+        return self.path + '.part'
+
+    @property
+    def state_file(self):
+        """
+        Absolute path of ``.part.json`` file with download progress.
+        """
+        return self.path + '.part.json'
+
+    def session(self):
+        """
+        Get ``requests.Session`` for all requests of this download.
+
+        The shared, pooled :func:`Boost.HTTP.session`
+        """
+        return HTTP.session()
+
+    def run(self):
+        """
+        Download, verify, and move to final :attr:`.path`.
+
+        :return: The final :attr:`.path`
+        """
+        with Events.phase('download', url=self.url,
+                          path=str(self.path)) as results:
+            session = self.session()
+            urls, size, ranges = self._locate(session)
+            if ranges:
+                results['bytes'] = self._fetch_ranges(session, urls, size)
+            else:
+                results['bytes'] = self._fetch_whole(session, urls)
+
+            sha256 = sha256sum(self.partial)
+            if self.sha256 and sha256 != self.sha256:
+                self.partial.remove_p()
+                self.state_file.remove_p()
+                raise RuntimeError(
+                    "SHA256 mismatch of {!r} from {!r}: expected {}, got {}"
+                    .format(self.path, urls[0], self.sha256, sha256))
+
+            os.replace(self.partial, self.path)
+            self.state_file.remove_p()
+        return self.path
+
+    def _locate(self, session):
+        """
+        Find the first available of :attr:`.urls`.
+
+        :return:
+           ``list`` of the available URL, as redirected, followed by the
+           remaining alternatives, the file size, and whether it can be
+           fetched in byte ranges
+        """
+        for index, url in enumerate(self.urls):
+            rest = self.urls[index + 1:]
+            if local(url):
+                if os.path.isfile(url):
+                    return [url] + rest, os.path.getsize(url), True
+
+            else:
+                try:
+                    response = session.head(url, allow_redirects=True)
+                except requests.RequestException:
+                    response = None
+                if response is not None and response.ok:
+                    size = int(response.headers.get('Content-Length') or 0)
+                    return [response.url] + rest, size, bool(
+                        size and response.headers.get('Accept-Ranges', '')
+                        .strip().lower() == 'bytes')
+
+                if response is not None and not rest:
+                    # maybe only HEAD is not supported
+                    return [url], 0, False
+
+            if rest:
+                self._failover(url, rest[0])
+        raise RuntimeError("{!r} not available from {}".format(
+            self.path.basename(), ", ".join(map(repr, self.urls))))
+
+    def _failover(self, url, alternative):
+        Events.emit('download.failover', "Failed to download {!r} from {!r}. "
+                    "Switching to {!r}".format(
+                        self.path.basename(), url, alternative),
+                    url=url, alternative=alternative, path=str(self.path))
+
+    def _fetch_whole(self, session, urls):
+        for index, url in enumerate(urls):
+            try:
+                return self._fetch_whole_from(session, url)
+
+            except (requests.RequestException, IOError):
+                if index == len(urls) - 1:
+                    raise
+
+                self._failover(url, urls[index + 1])
+
+    def _fetch_whole_from(self, session, url):
+        Events.emit('download.whole', "Downloading {!r} to {!r}".format(
+            url, self.path), url=url, path=str(self.path))
+        self.state_file.remove_p()
+        if local(url):
+            Path(url).copy(self.partial)
+            return self.partial.size
+
+        response = session.get(url, stream=True)
+        response.raise_for_status()
+        size = 0
+        with self.partial.open('wb') as file:
+            for data in response.iter_content(self.chunk_size):
+                file.write(data)
+                size += len(data)
+        return size
+
+    def _load_state(self, size):
+        try:
+            with self.state_file.open() as file:
+                state = json.load(file)
+        except (IOError, OSError, ValueError):
+            state = {}
+        # with known hash, ranges can be resumed from any source
+        if (state.get('size'), state.get('sha256')) == (size, self.sha256) \
+                and (self.sha256 or state.get('url') in self.urls) \
+                and self.partial.isfile() and self.partial.size == size:
+            return state
+
+        with self.partial.open('wb') as file:
+            file.truncate(size)
+        state = {'url': self.url, 'size': size, 'sha256': self.sha256,
+                 'done': []}
+        self._save_state(state)
+        return state
+
+    def _save_state(self, state):
+        temp = self.state_file + '.tmp'
+        with temp.open('w') as file:
+            json.dump(state, file)
+        os.replace(temp, self.state_file)
+
+    def _fetch_ranges(self, session, urls, size):
+        state = self._load_state(size)
+        done = set(state['done'])
+        chunks = [(start, min(start + self.chunk_size, size) - 1)
+                  for start in range(0, size, self.chunk_size)
+                  if start not in done]
+        left = sum(end - start + 1 for start, end in chunks)
+        Events.emit(
+            'download.ranges',
+            "{} {!r} to {!r} ({} of {} bytes left, {} connections)".format(
+                "Resuming download of" if done else "Downloading",
+                urls[0], self.path, left, size, self.connections),
+            url=urls[0], path=str(self.path), size=size, left=left,
+            connections=self.connections)
+
+        lock = threading.Lock()
+        failed = set()
+
+        def fetch(start, end):
+            error = None
+            for url in urls:
+                if url in failed:
+                    continue
+
+                for attempt in range(1, ATTEMPTS + 1):
+                    try:
+                        self._fetch_range(session, url, start, end, size)
+                    except (requests.RequestException, IOError) as exc:
+                        error = exc
+                    else:
+                        with lock:
+                            state['done'].append(start)
+                            self._save_state(state)
+                        return
+
+                with lock:
+                    if url not in failed:
+                        failed.add(url)
+                        alternatives = [alternative for alternative in urls
+                                        if alternative not in failed]
+                        if alternatives:
+                            self._failover(url, alternatives[0])
+            raise error or IOError("No source left for {!r}".format(
+                self.path.basename()))
+
+        executor = ThreadPoolExecutor(max_workers=self.connections)
+        futures = [executor.submit(fetch, *chunk) for chunk in chunks]
+        try:
+            for future in as_completed(futures):
+                future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=True)
+        return left
+
+    def _fetch_range(self, session, url, start, end, size):
+        if local(url):
+            with open(url, 'rb') as source:
+                source.seek(start)
+                data = source.read(end - start + 1)
+            if len(data) != end - start + 1:
+                raise IOError("Incomplete range {}-{} from {!r}"
+                              .format(start, end, url))
+
+            with self.partial.open('r+b') as file:
+                file.seek(start)
+                file.write(data)
+            return
+
+        response = session.get(url, stream=True, headers={
+            'Range': 'bytes={}-{}'.format(start, end)})
+        response.raise_for_status()
+        if response.status_code != 206:
+            raise IOError("Server ignored Range request for {!r}"
+                          .format(url))
+
+        total = response.headers.get('Content-Range', '').rsplit('/', 1)[-1]
+        if total not in (str(size), '*'):
+            raise IOError("Different file size at {!r}".format(url))
+
+        written = 0
+        with self.partial.open('r+b') as file:
+            file.seek(start)
+            for data in response.iter_content(64 * 1024):
+                file.write(data)
+                written += len(data)
+        if written != end - start + 1:
+            raise IOError("Incomplete range {}-{} from {!r}"
+                          .format(start, end, url))
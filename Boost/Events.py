@@ -0,0 +1,147 @@
+# C++Boost as a Python package
+#
+# Copyright (C) 2017 Stefan Zimmermann <user@zimmermann.co>
+#
+# This is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Structured progress events of Boost provisioning.
+
+All progress reports are ``dict`` events, which get passed to all
+:data:`Boost.Events.subscribers`. Events have an ``'event'`` kind, a
+``'time'`` stamp, an optional human-readable ``'message'`` and further
+kind-specific data. Printing messages is just the default
+:func:`Boost.Events.printer` subscriber
+"""
+
+from contextlib import contextmanager
+import json
+import logging
+import threading
+import time
+
+from . import Config
+
+__all__ = ('emit', 'phase', 'subscribe', 'unsubscribe', 'printer',
+           'LoggingSubscriber', 'JSONLinesSubscriber')
+
+
+def printer(event):
+    """
+    Print the ``'message'`` of `event`, if any.
+    """
+    if event.get('message') is not None:
+        print(event['message'])
+
+
+class LoggingSubscriber(object):
+    """
+    Forward events to a ``logging`` logger.
+
+    The whole event is available as ``event`` attribute of log records
+    """
+
+    def __init__(self, logger='Boost', level=logging.INFO):
+        """
+        Use `logger` instance or name and log with `level`.
+        """
+        if not isinstance(logger, logging.Logger):
+            logger = logging.getLogger(logger)
+        self.logger = logger
+        self.level = level
+
+    def __call__(self, event):
+        self.logger.log(
+            self.level, event.get('message') or event['event'],
+            extra={'event': event})
+
+
+class JSONLinesSubscriber(object):
+    """
+    Append events as JSON lines to a file.
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._lock = threading.Lock()
+
+    def __call__(self, event):
+        line = json.dumps(event, sort_keys=True, default=str)
+        with self._lock, open(self.path, 'a') as file:
+            file.write(line + '\n')
+
+
+#: Callables getting all emitted events
+subscribers = [printer]
+
+if Config.EVENTS_FILE:
+    subscribers.append(JSONLinesSubscriber(Config.EVENTS_FILE))
+
+
+def subscribe(subscriber):
+    """
+    Add callable `subscriber` for getting all events.
+
+    :return: The `subscriber`, for use as decorator
+    """
+    subscribers.append(subscriber)
+    return subscriber
+
+
+def unsubscribe(subscriber):
+    """
+    Remove `subscriber`, like the default :func:`.printer`.
+    """
+    subscribers.remove(subscriber)
+
+
+def emit(event, message=None, **data):
+    """
+    Send `event` of given kind to all :data:`.subscribers`.
+
+    :param message: Human-readable description
+    :param data: Further event details
+    :return: The event ``dict``
+    """
+    data.update(event=event, time=time.time(), message=message)
+    for subscriber in list(subscribers):
+        subscriber(data)
+    return data
+
+
+@contextmanager
+def phase(name, message=None, **data):
+    """
+    Context manager emitting ``'phase.start'`` and ``'phase.end'`` events.
+
+    Yields a ``dict`` for collecting results, which get added to the
+    ``'phase.end'`` event, together with the phase ``'duration'`` in seconds
+    and whether it ended with an ``'error'``. Results with transferred
+    ``'bytes'`` also get a ``'throughput'`` in bytes per second
+    """
+    emit('phase.start', message, phase=name, **data)
+    results = {}
+    start = time.time()
+    error = None
+    try:
+        yield results
+    except BaseException as exc:
+        error = repr(exc)
+        raise
+    finally:
+        duration = time.time() - start
+        data.update(results)
+        if data.get('bytes') is not None and duration > 0:
+            data['throughput'] = data['bytes'] / duration
+        emit('phase.end', phase=name, duration=duration, error=error, **data)
@@ -0,0 +1,179 @@
+# C++Boost as a Python package
+#
+# Copyright (C) 2017 Stefan Zimmermann <user@zimmermann.co>
+#
+# This is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Lightweight, streaming extraction of links from HTML pages.
+
+Doesn't build any document tree. Only ``<a>`` elements and table cells are
+tracked, which is all needed from boost.org release pages
+"""
+
+from collections import OrderedDict, namedtuple
+import re
+
+from six import string_types
+from six.moves.html_parser import HTMLParser
+
+__all__ = ('Link', 'LinkParser', 'links', 'archives')
+
+
+#: File name extensions of Boost source archives
+ARCHIVE_EXTENSIONS = ('.tar.bz2', '.tar.gz', '.7z', '.zip')
+
+SHA256_REGEX = re.compile(r'^[0-9a-f]{64}$')
+
+
+class Link(namedtuple('Link', 'text href cells cell')):
+    """
+    An ``<a>`` element with stripped `text` and `href` attribute.
+
+    If the link is located in a table row, `cells` is the ``list`` of
+    stripped texts of all cells in that row, which gets completed while
+    parsing the rest of the row, and `cell` is the index of the link's
+    cell. Otherwise both are ``None``
+    """
+
+    __slots__ = ()
+
+    @property
+    def row(self):
+        """
+        Texts of row cells following the link's cell.
+
+        Empty if the link is not in a table row
+        """
+        if self.cells is None:
+            return []
+
+        return self.cells[self.cell + 1:]
+
+
+class LinkParser(HTMLParser):
+    """
+    HTML parser collecting :class:`.Link` elements in :attr:`.links`.
+
+    Fed data is parsed incrementally. Unclosed ``<a>`` and table cell
+    elements are implicitly closed by following ones, like browsers do
+    """
+
+    def __init__(self):
+        HTMLParser.__init__(self, convert_charrefs=True)
+        #: Completed links, which can be consumed while feeding
+        self.links = []
+        self._anchor = None
+        self._cells = None
+        self._cell = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'a':
+            self._close_anchor()
+            self._anchor = (dict(attrs).get('href'), [])
+        elif tag == 'tr':
+            self._close_row()
+            self._cells = []
+        elif tag in ('td', 'th'):
+            self._close_cell()
+            if self._cells is None:  # row without <tr>
+                self._cells = []
+            self._cell = []
+
+    def handle_endtag(self, tag):
+        if tag == 'a':
+            self._close_anchor()
+        elif tag in ('td', 'th'):
+            self._close_cell()
+        elif tag in ('tr', 'table', 'tbody', 'thead', 'tfoot'):
+            self._close_row()
+
+    def handle_data(self, data):
+        if self._anchor is not None:
+            self._anchor[1].append(data)
+        if self._cell is not None:
+            self._cell.append(data)
+
+    def _close_anchor(self):
+        if self._anchor is None:
+            return
+
+        href, text = self._anchor
+        self._anchor = None
+        if self._cells is None or self._cell is None:
+            self.links.append(Link(''.join(text).strip(), href, None, None))
+        else:
+            self.links.append(Link(''.join(text).strip(), href, self._cells,
+                                   len(self._cells)))
+
+    def _close_cell(self):
+        if self._cell is not None:
+            self._close_anchor()
+            self._cells.append(''.join(self._cell).strip())
+            self._cell = None
+
+    def _close_row(self):
+        self._close_cell()
+        self._cells = None
+
+    def close(self):
+        HTMLParser.close(self)
+        self._close_anchor()
+        self._close_row()
+
+
+def links(chunks):
+    """
+    Iterate :class:`.Link` elements of HTML page.
+
+    :param chunks:
+       Iterable of HTML text chunks, like from
+       ``response.iter_content(decode_unicode=True)``, or a single string.
+       Links are yielded as soon as their elements are parsed
+    """
+    if isinstance(chunks, string_types):
+        chunks = [chunks]
+    parser = LinkParser()
+    for chunk in chunks:
+        parser.feed(chunk)
+        for link in parser.links:
+            yield link
+        del parser.links[:]
+    parser.close()
+    for link in parser.links:
+        yield link
+
+
+def archives(links):
+    """
+    Get all Boost source archive links and their published SHA256 hashes.
+
+    Release pages list hashes in table cells next to archive links
+
+    :param links: Iterable of :class:`.Link` elements
+    :return:
+       ``OrderedDict`` of archive file names and ``dict`` values with
+       ``'url'`` and ``'sha256'``, which is ``None`` if not published. In
+       order of appearance, where the first link per file name wins
+    """
+    result = OrderedDict()
+    # rows of streamed links are only complete after parsing everything
+    for link in list(links):
+        if not link.href or not link.text.endswith(ARCHIVE_EXTENSIONS):
+            continue
+
+        sha256 = next((text for text in link.row
+                       if SHA256_REGEX.match(text)), None)
+        result.setdefault(link.text, {'url': link.href, 'sha256': sha256})
+    return result
@@ -0,0 +1,182 @@
+# C++Boost as a Python package
+#
+# Copyright (C) 2017 Stefan Zimmermann <user@zimmermann.co>
+#
+# This is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Shared HTTP session for all network access of the Boost package.
+
+Pools connections, retries temporary failures with exponential backoff,
+applies timeouts, and sends conditional requests for persisted pages. All
+settings are taken from ``HTTP_*`` and :const:`Boost.Config.CA_BUNDLE`
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+from path import Path
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from . import Config, Events
+
+__all__ = ('Session', 'session', 'iter_text')
+
+
+#: HTTP status codes of temporary server failures, which get retried
+RETRY_STATUS = (429, 500, 502, 503, 504)
+
+
+class Session(requests.Session):
+    """
+    ``requests.Session`` applying :mod:`Boost.Config` HTTP settings.
+
+    Every request gets :const:`Boost.Config.HTTP_TIMEOUT` and, if defined,
+    :const:`Boost.Config.HTTP_PROXY` and :const:`Boost.Config.CA_BUNDLE`,
+    which then take precedence over the standard environment variables
+    """
+
+    def __init__(self, retries=None, backoff=None, connections=None):
+        """
+        Set up connection pool and retries.
+
+        :param retries:
+           Defaults to :const:`Boost.Config.HTTP_RETRIES`
+        :param backoff:
+           Defaults to :const:`Boost.Config.HTTP_BACKOFF`
+        :param connections:
+           Maximum pooled connections per host. Defaults to
+           :const:`Boost.Config.DOWNLOAD_CONNECTIONS`, but at least 10
+        """
+        super(Session, self).__init__()
+        adapter = HTTPAdapter(
+            pool_maxsize=max(10, connections or Config.DOWNLOAD_CONNECTIONS),
+            max_retries=Retry(
+                total=Config.HTTP_RETRIES if retries is None else retries,
+                backoff_factor=(Config.HTTP_BACKOFF if backoff is None
+                                else backoff),
+                status_forcelist=RETRY_STATUS, raise_on_status=False))
+        self.mount('http://', adapter)
+        self.mount('https://', adapter)
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault('timeout', Config.HTTP_TIMEOUT)
+        if Config.HTTP_PROXY:
+            kwargs.setdefault('proxies', {
+                'http': Config.HTTP_PROXY, 'https': Config.HTTP_PROXY})
+        if Config.CA_BUNDLE:
+            kwargs.setdefault('verify', Config.CA_BUNDLE)
+        return super(Session, self).request(method, url, **kwargs)
+
+
+_lock = threading.Lock()
+
+_session = None
+
+_session_key = None
+
+
+def session():
+    """
+    Get the shared :class:`.Session`.
+
+    Gets re-created if retry or pool settings in :mod:`Boost.Config` were
+    changed since last time
+    """
+    global _session, _session_key
+
+    key = (Config.HTTP_RETRIES, Config.HTTP_BACKOFF,
+           Config.DOWNLOAD_CONNECTIONS)
+    with _lock:
+        if _session is None or key != _session_key:
+            _session, _session_key = Session(), key
+        return _session
+
+
+def _cache_file(cache, url):
+    return Path(cache) / hashlib.sha256(url.encode()).hexdigest()[:32] \
+        + '.json'
+
+
+def _load(path):
+    try:
+        with path.open() as file:
+            entry = json.load(file)
+    except (IOError, OSError, ValueError):
+        return None
+
+    return entry if isinstance(entry, dict) else None
+
+
+def iter_text(url, cache=None, chunk_size=64 * 1024):
+    """
+    Stream decoded text chunks of page at `url` from :func:`.session`.
+
+    :param cache:
+       Directory for persisting pages served with ``ETag`` or
+       ``Last-Modified`` headers. Requests for persisted pages are then
+       conditional, and a ``304 Not Modified`` answer yields the persisted
+       text
+    """
+    url = str(url)
+    path = entry = None
+    headers = {}
+    if cache is not None:
+        path = _cache_file(cache, url)
+        entry = _load(path)
+        if entry and entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry and entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+
+    response = session().get(url, headers=headers, stream=True)
+    with contextlib.closing(response):
+        if headers and response.status_code == 304:
+            Events.emit('http.not_modified', "Using unchanged {!r}"
+                        .format(url), url=url)
+            yield entry['text']
+            return
+
+        response.raise_for_status()
+        # requests can't decode without known encoding
+        response.encoding = response.encoding or 'utf-8'
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        chunks = []
+        for chunk in response.iter_content(chunk_size, decode_unicode=True):
+            if path is not None:
+                chunks.append(chunk)
+            yield chunk
+
+    if path is not None and (etag or last_modified):
+        path.dirname().makedirs_p()
+        # unique per writer, as threads of one process may persist the
+        # same page concurrently
+        fd, temp = tempfile.mkstemp(
+            dir=path.dirname(), prefix='.' + path.basename(), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as file:
+                json.dump({'url': url, 'etag': etag,
+                           'last_modified': last_modified,
+                           'text': ''.join(chunks)}, file)
+            os.replace(temp, path)
+        except BaseException:
+            Path(temp).remove_p()
+            raise
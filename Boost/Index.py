@@ -0,0 +1,209 @@
+# C++Boost as a Python package
+#
+# Copyright (C) 2017 Stefan Zimmermann <user@zimmermann.co>
+#
+# This is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Persistent on-disk index of Boost releases with :class:`Boost.Index.Index`.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+
+from furl import furl as URL
+from packaging.version import Version
+from path import Path
+from six import string_types
+
+from . import Config, Events
+
+__all__ = ('Index', )
+
+
+class Index(object):
+    """
+    JSON file cache of Boost release pages and archive download info.
+
+    Release page URLs are revalidated in the background after :attr:`.ttl`
+    seconds, while the stale ones are still served. Download info of
+    specific releases never changes and is therefore kept forever
+    """
+
+    def __init__(self, path, ttl=None, offline=None):
+        """
+        Use JSON index file at `path`.
+
+        :param ttl:
+           Seconds until revalidation. Defaults to
+           :const:`Boost.Config.INDEX_TTL`
+        :param offline:
+           Never fetch anything. Defaults to :const:`Boost.Config.OFFLINE`
+        """
+        self.path = Path(path)
+        self.ttl = Config.INDEX_TTL if ttl is None else ttl
+        self.offline = Config.OFFLINE if offline is None else offline
+        self._lock = threading.Lock()
+        self._revalidation = None
+
+    def load(self):
+        """
+        Read the index file.
+
+        :return: ``dict`` with index data. Empty if there is no valid file
+        """
+        try:
+            with self.path.open() as file:
+                data = json.load(file)
+        except (IOError, OSError, ValueError):
+            return {}
+
+        return data if isinstance(data, dict) else {}
+
+    def save(self, data):
+        """
+        Atomically replace the index file with given `data` ``dict``.
+        """
+        # unique per writer, as other threads may save concurrently
+        fd, temp = tempfile.mkstemp(
+            dir=self.path.dirname().makedirs_p(),
+            prefix='.' + self.path.basename(), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as file:
+                json.dump(data, file, separators=(',', ':'), sort_keys=True)
+            os.replace(temp, self.path)
+        except BaseException:
+            Path(temp).remove_p()
+            raise
+
+    def update(self, **items):
+        """
+        Merge `items` into index file, which is re-read before saving.
+
+        Only safe against concurrent updates from the same process
+        """
+        with self._lock:
+            data = self.load()
+            data.update(items)
+            self.save(data)
+
+    def expired(self, data):
+        """
+        Check if release URLs in index `data` are older than :attr:`.ttl`.
+        """
+        return time.time() - data.get('timestamp', 0) > self.ttl
+
+    def release_urls(self, fetch):
+        """
+        Get ``dict`` of Boost release versions and release page URLs.
+
+        :param fetch:
+           Function returning a fresh ``dict`` of versions and URLs.
+           Only called if there is no index yet. Expired indexes are
+           served as they are while `fetch` runs in a background thread
+        """
+        data = self.load()
+        releases = data.get('releases')
+        if releases is None:
+            if self.offline:
+                raise RuntimeError("No Boost release index in {!r} and "
+                                   "offline mode is enabled"
+                                   .format(self.path))
+
+            releases = self.fetch_release_urls(fetch)
+
+        elif not self.offline and self.expired(data):
+            self.revalidate(fetch)
+
+        return {Version(version): URL(url)
+                for version, url in releases.items()}
+
+    def fetch_release_urls(self, fetch):
+        """
+        Call `fetch` and store resulting release URLs in index.
+
+        :return: ``dict`` of version and URL strings, as stored
+        """
+        releases = {str(version): str(url)
+                    for version, url in fetch().items()}
+        self.update(releases=releases, timestamp=time.time())
+        return releases
+
+    def revalidate(self, fetch):
+        """
+        Refresh release URLs in a background daemon thread.
+
+        Only one revalidation runs at a time
+
+        :return: The ``threading.Thread``
+        """
+        with self._lock:
+            thread = self._revalidation
+            if thread is None or not thread.is_alive():
+                thread = self._revalidation = threading.Thread(
+                    target=self._revalidate, args=(fetch, ))
+                thread.daemon = True
+                thread.start()
+        return thread
+
+    def _revalidate(self, fetch):
+        try:
+            self.fetch_release_urls(fetch)
+        except Exception as exc:
+            # keep serving the stale index
+            Events.emit('index.error', "Failed to revalidate Boost release "
+                        "index {!r}: {}".format(self.path, exc),
+                        path=str(self.path), error=repr(exc))
+
+    def download(self, version, fetch):
+        """
+        Get archive download info for Boost release `version`.
+
+        :param fetch:
+           Function returning the info ``dict``. Only called if not indexed
+           yet
+        :return:
+           ``dict`` with ``'url'`` of archive and its ``'sha256'`` hash,
+           which is ``None`` if unknown. Nested ``dict`` items from `fetch`,
+           like info about other archives, are stored as they are
+        """
+        info = self.load().get('downloads', {}).get(str(version))
+        if isinstance(info, string_types):  # only URL
+            info = {'url': info}
+        if info is None:
+            if self.offline:
+                raise RuntimeError("No download info for Boost {} in {!r} "
+                                   "and offline mode is enabled"
+                                   .format(version, self.path))
+
+            info = {key: value if isinstance(value, dict)
+                    else value and str(value)
+                    for key, value in fetch().items()}
+            with self._lock:
+                data = self.load()
+                data.setdefault('downloads', {})[str(version)] = info
+                self.save(data)
+        info.setdefault('sha256', None)
+        return info
+
+    def download_url(self, version, fetch):
+        """
+        Get archive download URL for Boost release `version`.
+
+        :param fetch: See :meth:`.download`
+        """
+        return URL(self.download(version, fetch)['url'])
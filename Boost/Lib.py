@@ -1,64 +1,137 @@
-# C++Boost as a Python package
-#
-# Copyright (C) 2017 Stefan Zimmermann <user@zimmermann.co>
-#
-# This is free software: you can redistribute it and/or modify
-# it under the terms of the GNU Lesser General Public License as published by
-# the Free Software Foundation, either version 3 of the License, or
-# (at your option) any later version.
-#
-# This is distributed in the hope that it will be useful,
-# but WITHOUT ANY WARRANTY; without even the implied warranty of
-# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
-# GNU Lesser General Public License for more details.
-#
-# You should have received a copy of the GNU Lesser General Public License
-# along with this.  If not, see <http://www.gnu.org/licenses/>.
-
-"""
-Pythonic access to installed Boost libraries.
-"""
-
-import re
-
-from path import Path
-
-__all__ = ('Lib', )
-
-
-LIBFILE_REGEX_TEMPLATE = r'^(lib)?(?P<fullname>boost_{}[^_a-z].*)$'
-
-
-class Lib(list):
-    """
-    A query interface for Boost library paths.
-    """
-
-    def __init__(self, paths):
-        """
-        Create with sequence of directory `paths` strings.
-        """
-        super(Lib, self).__init__(Path(p) for p in paths)
-
-    def __getitem__(self, name):
-        """
-        Get full Boost library name for short `name`.
-
-        ``'system'`` will return ``'boost_system...'``
-        (with platform-specific suffix)
-
-        Also supports index numbers for accessing library paths
-        """
-        try:
-            return super(Lib, self).__getitem__(name)
-
-        except TypeError:
-            for path in self:
-                for libfile in path.files():
-                    match = re.match(LIBFILE_REGEX_TEMPLATE.format(name),
-                                     libfile.basename().splitext()[0])
-                    if match:
-                        return match.group('fullname')
-
-            raise LookupError("No C++Boost {!r} library in {!r}"
-                              .format(name, self))
+# C++Boost as a Python package
+#
+# Copyright (C) 2017 Stefan Zimmermann <user@zimmermann.co>
+#
+# This is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Pythonic access to installed Boost libraries.
+"""
+
+import re
+
+from path import Path
+
+__all__ = ('Lib', )
+
+
+LIBFILE_REGEX_TEMPLATE = r'^(lib)?(?P<fullname>boost_{}[^_a-z].*)$'
+
+LIBFILE_REGEX = re.compile(r'^(lib)?(?P<fullname>boost_(?P<name>.+))$')
+
+
+def _mtime(path):
+    """
+    Get modification time of directory `path` or ``None`` if not existing.
+    """
+    try:
+        return path.stat().st_mtime
+    except OSError:
+        return None
+
+
+class Lib(list):
+    """
+    A query interface for Boost library paths.
+    """
+
+    def __init__(self, paths, header_only=False):
+        """
+        Create with sequence of directory `paths` strings.
+
+        A `header_only` instance doesn't have any paths and reports that on
+        library lookups
+        """
+        super(Lib, self).__init__(Path(p) for p in paths)
+        self.header_only = header_only
+        self._index = None
+        self._index_key = None
+
+    @property
+    def index(self):
+        """
+        ``dict`` of all short Boost library names and their full names.
+
+        Matches :const:`.LIBFILE_REGEX_TEMPLATE` for every possible short
+        name. On ambiguity, the first library file found in the first path
+        wins. The index is built on first access and then only rebuilt if
+        paths are changed or if the modification time of a path changes
+        """
+        key = tuple((path, _mtime(path)) for path in self)
+        if key != self._index_key:
+            self._index = self._build_index(
+                path for path, mtime in key if mtime is not None)
+            self._index_key = key
+        return self._index
+
+    @staticmethod
+    def _build_index(paths):
+        index = {}
+        for path in paths:
+            for libfile in path.files():
+                match = LIBFILE_REGEX.match(libfile.basename().splitext()[0])
+                if not match:
+                    continue
+
+                fullname, name = match.group('fullname', 'name')
+                # every prefix followed by a [^_a-z] char is a valid short
+                # name (see LIBFILE_REGEX_TEMPLATE)
+                for pos, char in enumerate(name):
+                    if pos and char != '_' and not 'a' <= char <= 'z':
+                        index.setdefault(name[:pos], fullname)
+        return index
+
+    def __getitem__(self, name):
+        """
+        Get full Boost library name for short `name`.
+
+        ``'system'`` will return ``'boost_system...'``
+        (with platform-specific suffix)
+
+        Also supports index numbers for accessing library paths
+        """
+        try:
+            return super(Lib, self).__getitem__(name)
+
+        except TypeError:
+            return self.resolve_many([name])[0]
+
+    def resolve_many(self, names):
+        """
+        Get full Boost library names for all short `names`.
+
+        Answers all lookups from the same :attr:`.index`
+
+        :return: ``list`` of full names in order of `names`
+        """
+        names = list(names)
+        if self.header_only and names:
+            raise LookupError(
+                "No C++Boost {} library in header-only installation. "
+                "There are no compiled libraries".format(
+                    ", ".join(repr(name) for name in names)))
+
+        index = self.index
+        missing = [name for name in names if name not in index]
+        if missing:
+            # the index might be outdated on file systems with coarse
+            # modification time resolution
+            self._index_key = None
+            index = self.index
+            missing = [name for name in names if name not in index]
+        if missing:
+            raise LookupError("No C++Boost {} library in {!r}".format(
+                ", ".join(repr(name) for name in missing), self))
+
+        return [index[name] for name in names]
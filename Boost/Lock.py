@@ -0,0 +1,172 @@
+# C++Boost as a Python package
+#
+# Copyright (C) 2017 Stefan Zimmermann <user@zimmermann.co>
+#
+# This is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Cross-process file locks with :class:`Boost.Lock.Lock`.
+"""
+
+import os
+import time
+
+from path import Path
+
+from . import Config, Events
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+    import msvcrt
+
+__all__ = ('Lock', )
+
+
+class Lock(object):
+    """
+    Advisory lock on a file, shared between processes.
+
+    Uses ``flock()`` on POSIX systems and ``msvcrt.locking()`` on Windows,
+    where `shared` locks are not supported and therefore never block
+    """
+
+    def __init__(self, path, shared=False, timeout=None, interval=0.1,
+                 report=30):
+        """
+        Prepare lock on file `path`, which is created if not existing.
+
+        :param shared:
+           Allow other shared locks. Only exclusive locks get blocked
+        :param timeout:
+           Seconds to wait for the lock before raising ``RuntimeError``.
+           Defaults to :const:`Boost.Config.LOCK_TIMEOUT`, where ``None``
+           means to wait forever
+        :param interval:
+           Seconds between acquisition attempts
+        :param report:
+           Seconds between progress messages while waiting
+        """
+        self.path = Path(path)
+        self.shared = shared
+        self.timeout = Config.LOCK_TIMEOUT if timeout is None else timeout
+        self.interval = interval
+        self.report = report
+        self._file = None
+
+    @property
+    def locked(self):
+        """
+        Whether this lock is currently held.
+        """
+        return self._file is not None
+
+    def _try_lock(self, file):
+        if fcntl is not None:
+            try:
+                fcntl.flock(file, (fcntl.LOCK_SH if self.shared
+                                   else fcntl.LOCK_EX) | fcntl.LOCK_NB)
+            except (IOError, OSError):
+                return False
+
+            return True
+
+        if self.shared:  # pragma: no cover
+            return True
+
+        try:  # pragma: no cover
+            file.seek(0)
+            msvcrt.locking(file.fileno(), msvcrt.LK_NBLCK, 1)
+        except (IOError, OSError):  # pragma: no cover
+            return False
+
+        return True  # pragma: no cover
+
+    def acquire(self, blocking=True):
+        """
+        Acquire the lock, waiting for other processes if `blocking`.
+
+        :return: ``False`` if not `blocking` and lock is held elsewhere
+        """
+        if self.locked:
+            raise RuntimeError("Lock {!r} is already acquired"
+                               .format(self.path))
+
+        self.path.dirname().makedirs_p()
+        file = open(self.path, 'a+')
+        start = reported = time.time()
+        while not self._try_lock(file):
+            now = time.time()
+            if not blocking:
+                file.close()
+                return False
+
+            if self.timeout is not None and now - start > self.timeout:
+                file.close()
+                raise RuntimeError(
+                    "Timeout after {:.0f} seconds waiting for lock {!r}{}"
+                    .format(now - start, self.path, self.holder))
+
+            if now - reported >= self.report:
+                Events.emit('lock.wait', "Waiting {:.0f} seconds for lock "
+                            "{!r}{}".format(now - start, self.path,
+                                            self.holder),
+                            path=str(self.path), waited=now - start)
+                reported = now
+            time.sleep(self.interval)
+
+        if not self.shared:
+            file.seek(0)
+            file.truncate()
+            file.write(str(os.getpid()))
+            file.flush()
+        self._file = file
+        return True
+
+    @property
+    def holder(self):
+        """
+        Info string about the process holding an exclusive lock.
+
+        Empty if unknown
+        """
+        try:
+            pid = self.path.text().strip()
+        except (IOError, OSError):
+            return ''
+
+        return pid and " held by process {}".format(pid)
+
+    def release(self):
+        """
+        Release the lock.
+        """
+        if not self.locked:
+            return
+
+        file, self._file = self._file, None
+        if fcntl is not None:
+            fcntl.flock(file, fcntl.LOCK_UN)
+        elif not self.shared:  # pragma: no cover
+            file.seek(0)
+            msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+        file.close()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
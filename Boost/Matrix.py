@@ -0,0 +1,129 @@
+# C++Boost as a Python package
+#
+# Copyright (C) 2017 Stefan Zimmermann <user@zimmermann.co>
+#
+# This is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Building several Boost installations at once for :func:`Boost.resolve_matrix`.
+"""
+
+from collections import namedtuple
+import threading
+
+from packaging.version import Version
+from six import string_types
+
+from . import Events, Resources
+from .Prefix import parse_components
+from .Profile import parse_profile
+
+__all__ = ('Spec', 'parse_spec', 'Scheduler')
+
+
+class Spec(namedtuple('Spec', 'version components header_only profile')):
+    """
+    Combination of Boost version, library components and build profile.
+
+    Arguments are normalized, so that equal requests give equal, hashable
+    specs. See :func:`Boost.resolve` for their meanings and
+    :func:`Boost.Profile.parse_profile`
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, version=None, components=None, header_only=False,
+                profile=None):
+        return super(Spec, cls).__new__(
+            cls, version and str(version), parse_components(components),
+            bool(header_only), parse_profile(profile))
+
+
+def parse_spec(spec):
+    """
+    Normalize `spec` to a :class:`.Spec`.
+
+    :param spec:
+       A :class:`.Spec`, a ``dict`` or sequence of its fields, or just a
+       version string or ``None`` for the latest release
+    """
+    if isinstance(spec, Spec):
+        return spec
+
+    if spec is None or isinstance(spec, string_types + (Version, )):
+        return Spec(spec)
+
+    if isinstance(spec, dict):
+        return Spec(**spec)
+
+    return Spec(*spec)
+
+
+class Scheduler(object):
+    """
+    Global budget of parallel ``b2`` jobs, shared by concurrent builds.
+
+    Works as `build` function of :func:`Boost.resolve`. Each build gets an
+    equal share of the budget for all groups of builds, which are still
+    running, and waits while not enough jobs are free. Builds starting
+    after other groups are :meth:`.done` get bigger shares
+    """
+
+    def __init__(self, jobs=None, groups=1):
+        """
+        Prepare budget of `jobs` for `groups` of concurrent builds.
+
+        :param jobs:
+           Defaults to :func:`Boost.Resources.jobs`, which takes CPUs and
+           memory into account
+        """
+        self.jobs = Resources.jobs(jobs)
+        self.groups = groups
+        self._free = self.jobs
+        self._condition = threading.Condition()
+
+    @property
+    def share(self):
+        """
+        Current number of jobs per build.
+        """
+        return max(1, self.jobs // max(1, self.groups))
+
+    def done(self):
+        """
+        Mark one group of builds as finished.
+        """
+        with self._condition:
+            self.groups -= 1
+            self._condition.notify_all()
+
+    def __call__(self, build, **kwargs):
+        """
+        Run `build` with `kwargs` and ``jobs=`` share, once jobs are free.
+        """
+        with self._condition:
+            while self._free < self.share:
+                self._condition.wait()
+            jobs = self.share
+            self._free -= jobs
+        Events.emit('schedule', "Building with {} of {} jobs".format(
+            jobs, self.jobs), jobs=jobs, budget=self.jobs)
+        kwargs['jobs'] = jobs
+        try:
+            return build(**kwargs)
+
+        finally:
+            with self._condition:
+                self._free += jobs
+                self._condition.notify_all()
@@ -0,0 +1,161 @@
+# C++Boost as a Python package
+#
+# Copyright (C) 2017 Stefan Zimmermann <user@zimmermann.co>
+#
+# This is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Boost archive mirrors, ranked by probing with :func:`Boost.Mirrors.rank`.
+
+Mirrors are HTTP(S) base URLs or local directories, configured in
+:const:`Boost.Config.MIRRORS`. The upstream archive URL scraped from the
+release page is always the last resort
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import contextlib
+import os
+import re
+import timeit
+
+from path import Path
+import requests
+
+from . import Config, Events, HTTP
+
+__all__ = ('candidates', 'probe', 'rank')
+
+
+#: Number of bytes fetched from each mirror for measuring its throughput
+PROBE_SIZE = 256 * 1024
+
+
+def local(url):
+    """
+    Check if archive `url` is a local file path.
+    """
+    return '://' not in str(url)
+
+
+def candidates(name, version, upstream, mirrors=None):
+    """
+    Get possible URLs and local paths of archive file `name`.
+
+    :param version: The Boost release version
+    :param upstream: The original archive URL
+    :param mirrors:
+       Sequence of mirror base URLs and local directories. Defaults to
+       :const:`Boost.Config.MIRRORS`. The archive `name` is appended, unless
+       they contain ``{version}`` and ``{name}`` placeholders, like
+       ``'https://mirror.example.com/boost/{version}/source/{name}'``
+    :return: ``list`` of mirror locations, followed by `upstream`
+    """
+    result = []
+    for mirror in Config.MIRRORS if mirrors is None else mirrors:
+        if '{' in mirror:
+            url = mirror.format(version=version, name=name)
+        elif local(mirror):
+            url = Path(mirror) / name
+        else:
+            url = mirror.rstrip('/') + '/' + name
+        if local(url):
+            url = Path(url).expand().abspath()
+        if str(url) not in result:
+            result.append(str(url))
+    if str(upstream) not in result:
+        result.append(str(upstream))
+    return result
+
+
+def probe(url, size=PROBE_SIZE, session=None):
+    """
+    Measure latency and throughput of archive `url`.
+
+    Fetches the first `size` bytes. Local paths have no latency and
+    unlimited throughput
+
+    :param session: Defaults to :func:`Boost.HTTP.session`
+    :return:
+       ``dict`` with ``'url'``, ``'latency'`` in seconds, ``'throughput'``
+       in bytes per second, and total archive ``'size'``, which is ``None``
+       if unknown. ``None`` if the archive is not available
+    """
+    if local(url):
+        if not os.path.isfile(url):
+            return None
+
+        return {'url': url, 'latency': 0.0, 'throughput': float('inf'),
+                'size': os.path.getsize(url)}
+
+    start = timeit.default_timer()
+    try:
+        response = (session or HTTP.session()).get(url, stream=True, headers={
+            'Range': 'bytes=0-{}'.format(size - 1)})
+        with contextlib.closing(response):
+            if response.status_code not in (200, 206):
+                return None
+
+            latency = timeit.default_timer() - start
+            received = 0
+            for data in response.iter_content(64 * 1024):
+                received += len(data)
+                if received >= size:
+                    break
+            elapsed = timeit.default_timer() - start - latency
+    except (requests.RequestException, IOError):
+        return None
+
+    if response.status_code == 206:
+        total = re.search(r'/(\d+)$', response.headers.get(
+            'Content-Range', ''))
+        total = total and int(total.group(1))
+    else:
+        total = int(response.headers.get('Content-Length') or 0) or None
+    return {'url': url, 'latency': latency,
+            'throughput': received / max(elapsed, 1e-6), 'size': total}
+
+
+def rank(urls):
+    """
+    Probe archive `urls` concurrently and sort by expected download time.
+
+    Unavailable ones are dropped. A single URL is returned without probing,
+    and all `urls` are returned unchanged if none is available, leaving
+    error reporting to the actual download
+
+    :return: ``list`` of URLs and local paths
+    """
+    urls = list(urls)
+    if len(urls) < 2:
+        return urls
+
+    # no retries, because unavailable mirrors should be dropped quickly
+    session = HTTP.Session(retries=0)
+    with ThreadPoolExecutor(max_workers=len(urls)) as executor:
+        results = [result for result in executor.map(
+            lambda url: probe(url, session=session), urls) if result]
+    session.close()
+    if not results:
+        return urls
+
+    sizes = [result['size'] for result in results if result['size']]
+    total = max(sizes) if sizes else PROBE_SIZE
+    results.sort(key=lambda result: (
+        result['latency'] + total / result['throughput']))
+    Events.emit('mirrors', "Ranked Boost archive mirrors: {}".format(
+        ", ".join(repr(result['url']) for result in results)),
+        mirrors=results, unavailable=[
+            url for url in urls
+            if url not in {result['url'] for result in results}])
+    return [result['url'] for result in results]
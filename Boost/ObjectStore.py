@@ -0,0 +1,176 @@
+# C++Boost as a Python package
+#
+# Copyright (C) 2017 Stefan Zimmermann <user@zimmermann.co>
+#
+# This is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Content-addressed deduplication of installed files with
+:class:`Boost.ObjectStore.ObjectStore`.
+"""
+
+import errno
+import os
+import stat
+
+from path import Path
+
+from .Download import sha256sum
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+__all__ = ('ObjectStore', )
+
+
+#: ``ioctl()`` request for cloning file extents on Linux (btrfs, xfs, ...)
+FICLONE = 0x40049409
+
+
+def reflink(src, dst):
+    """
+    Create `dst` as copy-on-write clone of file `src`.
+
+    :raises OSError: if not supported by OS or file system
+    """
+    if fcntl is None:  # pragma: no cover
+        raise OSError(errno.ENOTSUP, "Reflinks not supported", dst)
+
+    with open(src, 'rb') as source, open(dst, 'wb') as target:
+        try:
+            fcntl.ioctl(target.fileno(), FICLONE, source.fileno())
+        except (IOError, OSError):
+            target.close()
+            os.remove(dst)
+            raise
+    os.chmod(dst, stat.S_IMODE(os.stat(src).st_mode))
+
+
+class ObjectStore(object):
+    """
+    Store of unique file contents, named after their SHA256 hash.
+
+    Installed files get replaced by hardlinks to the stored objects, so
+    identical headers and libs of different Boost versions and toolsets
+    exist only once on disk. Falls back to reflinks, which at least share
+    disk blocks, if hardlinking is not possible
+    """
+
+    def __init__(self, path):
+        """
+        Use object store directory at `path`.
+        """
+        self.path = Path(path)
+
+    def object(self, sha256, executable=False):
+        """
+        Get absolute path of object with `sha256` hex digest.
+
+        Executables are stored separately, since hardlinks share file modes
+        """
+        return self.path / sha256[:2] / sha256[2:] + (
+            '.x' if executable else '')
+
+    @property
+    def objects(self):
+        """
+        All stored object files.
+        """
+        if not self.path.isdir():
+            return []
+
+        return [path for path in self.path.walkfiles()
+                if not path.basename().startswith('.')]
+
+    def _link(self, obj, path):
+        """
+        Atomically replace file at `path` with link to `obj`.
+
+        :return: ``'hardlink'``, ``'reflink'`` or ``None`` if impossible
+        """
+        temp = path.dirname() / '.{}.tmp-{}'.format(
+            path.basename(), os.getpid())
+        for mode, link in [('hardlink', os.link), ('reflink', reflink)]:
+            try:
+                link(obj, temp)
+            except (IOError, OSError):
+                continue
+
+            os.replace(temp, path)
+            return mode
+
+        return None
+
+    def add(self, path):
+        """
+        Deduplicate file at `path` with the stored objects.
+
+        Stores the file as new object if its content is not known yet.
+        Otherwise it gets replaced by a link to the existing object
+
+        :return:
+           ``'new'``, ``'linked'`` if already linked, ``'hardlink'`` or
+           ``'reflink'`` for replaced files, or ``None`` if impossible
+        """
+        path = Path(path)
+        obj = self.object(sha256sum(path), executable=os.access(
+            path, os.X_OK))
+        obj.dirname().makedirs_p()
+        try:
+            os.link(path, obj)
+        except OSError as exc:
+            if exc.errno != errno.EEXIST:
+                # like on other devices. Keeping the file as is
+                return None
+
+        else:
+            return 'new'
+
+        if os.path.samefile(path, obj):
+            return 'linked'
+
+        return self._link(obj, path)
+
+    def dedupe(self, prefix):
+        """
+        Deduplicate all files in `prefix` directory.
+
+        :return: ``dict`` with number of ``'files'`` and saved ``'bytes'``
+        """
+        stats = {'files': 0, 'bytes': 0}
+        for path in Path(prefix).walkfiles():
+            if path.islink():
+                continue
+
+            size = path.size
+            mode = self.add(path)
+            if mode in ('hardlink', 'reflink'):
+                stats['files'] += 1
+                stats['bytes'] += size
+        return stats
+
+    def prune(self):
+        """
+        Remove objects not linked from anywhere else anymore.
+
+        :return: Number of removed objects
+        """
+        count = 0
+        for obj in self.objects:
+            if obj.stat().st_nlink == 1:
+                obj.remove()
+                count += 1
+        return count
@@ -0,0 +1,245 @@
+# C++Boost as a Python package
+#
+# Copyright (C) 2017 Stefan Zimmermann <user@zimmermann.co>
+#
+# This is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Boost installation prefixes with :class:`Boost.Prefix.Prefix`.
+"""
+
+import json
+
+from packaging.version import Version
+from path import Path
+from six import string_types
+
+from .Profile import DEFAULT, parse_profile
+
+__all__ = ('Prefix', 'parse_components')
+
+
+#: Name of JSON file with info about installation in a prefix
+INFO_FILE = '.pyboost.json'
+
+#: Name of toolset-independent prefix directories for header-only installs
+HEADERS = 'headers'
+
+
+def parse_components(components):
+    """
+    Normalize selection of compiled Boost library `components`.
+
+    :param components:
+       Sequence of library names like ``['system', 'filesystem']`` for
+       building only those libraries. Names prefixed with ``'-'`` like
+       ``['-python']`` select all libraries except those.
+       ``None`` or empty means all libraries
+    :return: Sorted ``tuple`` of names or ``None``
+    """
+    if not components:
+        return None
+
+    if isinstance(components, string_types):
+        components = [components]
+    components = tuple(sorted(set(components)))
+    excluded = [name for name in components if name.startswith('-')]
+    if excluded and len(excluded) != len(components):
+        raise ValueError("Can't mix included and excluded ('-' prefixed) "
+                         "Boost components: {!r}".format(components))
+
+    return components
+
+
+def provides(installed, components):
+    """
+    Check if `installed` components satisfy requested `components`.
+
+    Both must be normalized by :func:`.parse_components`
+    """
+    if installed is None:
+        return True
+
+    if components is None:
+        return False
+
+    installed_excluded = {name[1:] for name in installed
+                          if name.startswith('-')}
+    excluded = {name[1:] for name in components if name.startswith('-')}
+    if not installed_excluded:
+        return not excluded and set(components) <= set(installed)
+
+    if excluded:
+        return installed_excluded <= excluded
+
+    return not installed_excluded & set(components)
+
+
+class Prefix(Path):
+    """
+    A Boost installation prefix directory.
+
+    Knows about installation details from its :const:`.INFO_FILE`
+    """
+
+    # path operations on a prefix lead to basic paths
+    _next_class = Path
+
+    @classmethod
+    def name(cls, toolset, components=None, header_only=False, profile=None):
+        """
+        Get prefix directory name for `toolset` and `components`.
+
+        :return:
+           Just the `toolset` name for complete installations. Else with
+           appended included components like ``'gcc+filesystem+system'`` or
+           excluded ones like ``'gcc-python'``. Builds with other than the
+           default `profile` get its :attr:`Boost.Profile.Profile.name`
+           appended to the `toolset` like ``'gcc@debug-static+system'``.
+           :const:`.HEADERS` for `header_only` installations
+        """
+        if header_only:
+            return HEADERS
+
+        components = parse_components(components)
+        return cls._base(toolset, profile) + ''.join(
+            name if name.startswith('-') else '+' + name
+            for name in components or ())
+
+    @staticmethod
+    def _base(toolset, profile=None):
+        profile = parse_profile(profile)
+        if profile.default:
+            return toolset
+
+        return '{}@{}'.format(toolset, profile.name)
+
+    @classmethod
+    def installed(cls, home, toolset, header_only=False, profile=None):
+        """
+        Get all existing prefixes for `toolset` in `home` directory.
+
+        Only those built with the given build `profile`, according to their
+        :attr:`.profile`. Complete installations come first. Also includes
+        toolset-independent :const:`.HEADERS` prefix if `header_only`
+        """
+        home = Path(home)
+        if not home.isdir():
+            return []
+
+        profile = parse_profile(profile)
+        base = cls._base(toolset, profile)
+        return [cls(path) for path in sorted(
+            home.dirs(), key=lambda path: (path.basename() != base, path))
+            if (path.basename() == base
+                or path.basename().startswith((base + '+', base + '-')))
+            and cls(path).profile == profile
+            or header_only and path.basename() == HEADERS]
+
+    @property
+    def info_file(self):
+        """
+        Absolute path to :const:`.INFO_FILE` of this prefix.
+        """
+        return Path(self) / INFO_FILE
+
+    @property
+    def info(self):
+        """
+        ``dict`` of installation details from :attr:`.info_file`.
+
+        Empty if there is no valid info file, like for prefixes installed by
+        older versions of this package
+        """
+        try:
+            with self.info_file.open() as file:
+                info = json.load(file)
+        except (IOError, OSError, ValueError):
+            return {}
+
+        return info if isinstance(info, dict) else {}
+
+    def write_info(self, **info):
+        """
+        Merge `info` items into :attr:`.info_file`.
+        """
+        data = self.info
+        data.update(info)
+        with self.info_file.open('w') as file:
+            json.dump(data, file, indent=2, sort_keys=True)
+
+    @property
+    def include(self):
+        """
+        Absolute path of directory with the ``boost/`` header tree.
+        """
+        return Path(self) / 'include'
+
+    @property
+    def lib(self):
+        """
+        ``list`` of absolute paths of directories with compiled libraries.
+        """
+        return [Path(self) / 'lib']
+
+    @property
+    def version(self):
+        """
+        Installed Boost ``packaging.version.Version``.
+
+        ``None`` if not recorded
+        """
+        version = self.info.get('version')
+        return Version(version) if version else None
+
+    @property
+    def components(self):
+        """
+        Installed compiled Boost library components.
+
+        :return:
+           Normalized like by :func:`.parse_components`, with ``None``
+           meaning all libraries
+        """
+        components = self.info.get('components')
+        return components and tuple(components)
+
+    @property
+    def header_only(self):
+        """
+        Whether this prefix only contains Boost headers.
+        """
+        return bool(self.info.get('header_only'))
+
+    @property
+    def profile(self):
+        """
+        :class:`Boost.Profile.Profile` of installed compiled libraries.
+
+        The :const:`Boost.Profile.DEFAULT` if not recorded
+        """
+        return parse_profile(self.info.get('profile') or DEFAULT)
+
+    def provides(self, components, header_only=False):
+        """
+        Check if this prefix contains all requested library `components`.
+
+        Any prefix provides `header_only` requests, but
+        :attr:`.header_only` prefixes only provide those
+        """
+        if header_only:
+            return True
+
+        return not self.header_only and provides(
+            self.components, parse_components(components))
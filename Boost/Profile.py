@@ -0,0 +1,204 @@
+# C++Boost as a Python package
+#
+# Copyright (C) 2017 Stefan Zimmermann <user@zimmermann.co>
+#
+# This is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Build settings of compiled Boost libraries with :class:`Boost.Profile.Profile`.
+
+Besides custom ones, there are named profiles for common needs, like
+``'release-static-lto'``. See :func:`.profiles`
+"""
+
+from collections import OrderedDict, namedtuple
+import hashlib
+import shlex
+
+from six import string_types
+
+from . import Config
+
+__all__ = ('Profile', 'DEFAULT', 'profiles', 'parse_profile')
+
+
+#: Supported ``b2`` build variants
+VARIANTS = ('release', 'debug', 'profile')
+
+#: Supported ``b2`` link modes
+LINKS = ('shared', 'static')
+
+
+def _flags(flags):
+    if not flags:
+        return ()
+
+    if isinstance(flags, string_types):
+        return tuple(shlex.split(flags))
+
+    return tuple(flags)
+
+
+class Profile(namedtuple('Profile', 'variant link cxxflags linkflags')):
+    """
+    Build variant, link mode and extra compiler and linker flags.
+
+    Passed to ``b2`` as properties. All profiles of a Boost version are
+    built in the same source tree, where ``b2`` keeps separate object
+    directories for different properties
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, variant='release', link='shared', cxxflags=(),
+                linkflags=()):
+        if variant not in VARIANTS:
+            raise ValueError("Invalid Boost build variant {!r}. Must be one "
+                             "of {!r}".format(variant, VARIANTS))
+        if link not in LINKS:
+            raise ValueError("Invalid Boost link mode {!r}. Must be one of "
+                             "{!r}".format(link, LINKS))
+
+        return super(Profile, cls).__new__(
+            cls, variant, link, _flags(cxxflags), _flags(linkflags))
+
+    @property
+    def default(self):
+        """
+        Whether this is the :const:`.DEFAULT` profile.
+        """
+        return self == DEFAULT
+
+    @property
+    def name(self):
+        """
+        Identifier like ``'release-static'``, for prefix names.
+
+        The name from :func:`.profiles` for named profiles. Else with
+        appended short hash of flags if there are any, like
+        ``'release-shared_1f2e3d4c'``
+        """
+        for name, profile in profiles().items():
+            if profile == self:
+                return name
+
+        name = '{}-{}'.format(self.variant, self.link)
+        if self.cxxflags or self.linkflags:
+            name += '_' + hashlib.sha256(repr(
+                (self.cxxflags, self.linkflags)).encode()).hexdigest()[:8]
+        return name
+
+    @property
+    def portable(self):
+        """
+        Whether builds are usable on other machines of the same platform.
+
+        Not the case with flags tuned for the building CPU, like
+        ``-march=native``
+        """
+        return not any('native' in flag
+                       for flag in self.cxxflags + self.linkflags)
+
+    def extended(self, cxxflags=(), linkflags=()):
+        """
+        Get copy of this profile with additional flags.
+        """
+        return self._replace(cxxflags=self.cxxflags + _flags(cxxflags),
+                             linkflags=self.linkflags + _flags(linkflags))
+
+    def args(self):
+        """
+        Get ``b2`` property arguments for this profile.
+        """
+        return (['variant={}'.format(self.variant),
+                 'link={}'.format(self.link)]
+                + ['cxxflags={}'.format(flag) for flag in self.cxxflags]
+                + ['linkflags={}'.format(flag) for flag in self.linkflags])
+
+    def parameters(self):
+        """
+        Get ``dict`` of settings for :func:`Boost.Artifact.parameters`.
+        """
+        return {'variant': self.variant, 'link': self.link,
+                'cxxflags': self.cxxflags, 'linkflags': self.linkflags}
+
+
+#: Release build of shared libraries without extra flags
+DEFAULT = Profile()
+
+_profiles = None
+
+
+def profiles():
+    """
+    Get ``OrderedDict`` of named profiles for :const:`Boost.TOOLSET`.
+
+    ``'release'`` (the :const:`.DEFAULT`), ``'release-static'``,
+    ``'release-static-lto'`` with link time optimization,
+    ``'release-native'`` tuned for the building CPU (not with MSVC), and
+    ``'debug'``
+    """
+    global _profiles
+    if _profiles is None:
+        from .Source import MSVC
+
+        if MSVC:  # pragma: no cover
+            lto = Profile(link='static', cxxflags='/GL', linkflags='/LTCG')
+        else:
+            # fat objects keep the static libs usable without LTO
+            lto = Profile(link='static', cxxflags='-flto -ffat-lto-objects',
+                          linkflags='-flto')
+        _profiles = OrderedDict([
+            ('release', DEFAULT),
+            ('release-static', Profile(link='static')),
+            ('release-static-lto', lto),
+        ])
+        if not MSVC:
+            _profiles['release-native'] = Profile(cxxflags='-march=native')
+        _profiles['debug'] = Profile('debug')
+    return _profiles
+
+
+def parse_profile(profile):
+    """
+    Normalize `profile` to a :class:`.Profile`.
+
+    :param profile:
+       A :class:`.Profile`, a ``dict`` of its fields, a name from
+       :func:`.profiles` or ``'<variant>-<link>'``. ``None`` means the
+       :const:`Boost.Config.PROFILE`, extended by
+       :const:`Boost.Config.CXXFLAGS` and :const:`Boost.Config.LINKFLAGS`
+    """
+    if profile is None:
+        return parse_profile(Config.PROFILE or DEFAULT).extended(
+            Config.CXXFLAGS, Config.LINKFLAGS)
+
+    if isinstance(profile, Profile):
+        return profile
+
+    if isinstance(profile, dict):
+        return Profile(**profile)
+
+    if isinstance(profile, string_types):
+        if profile in profiles():
+            return profiles()[profile]
+
+        variant, _, link = profile.partition('-')
+        if variant in VARIANTS and link in LINKS:
+            return Profile(variant, link)
+
+        raise ValueError("Unknown Boost build profile {!r}. Available: {}"
+                         .format(profile, ", ".join(profiles())))
+
+    raise TypeError("Invalid Boost build profile {!r}".format(profile))
@@ -0,0 +1,169 @@
+# C++Boost as a Python package
+#
+# Copyright (C) 2017 Stefan Zimmermann <user@zimmermann.co>
+#
+# This is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Determine host resources usable for building Boost.
+
+Takes process CPU affinity and Linux cgroup (v1 and v2) limits into account,
+so containerized builds don't oversubscribe their quota
+"""
+
+import math
+import multiprocessing
+import os
+
+from path import Path
+
+from . import Config
+
+__all__ = ('cpus', 'memory', 'jobs')
+
+
+CGROUP_ROOT = Path('/sys/fs/cgroup')
+
+
+def _read(path):
+    """
+    Get stripped content of text file at `path` or ``None`` on failure.
+    """
+    try:
+        with open(path) as file:
+            return file.read().strip()
+    except (IOError, OSError):
+        return None
+
+
+def _cgroup_dirs(controller):
+    """
+    Get candidate cgroup directories of current process for `controller`.
+
+    Yields the process' own cgroup directories first, followed by the
+    controller root, which is the process' cgroup in most containers
+    """
+    own = []
+    for line in (_read('/proc/self/cgroup') or '').splitlines():
+        _, controllers, relpath = line.split(':', 2)
+        relpath = relpath.lstrip('/')
+        if not controllers:  # cgroup v2
+            own.append(CGROUP_ROOT / relpath)
+        elif controller in controllers.split(','):
+            own.append(CGROUP_ROOT / controllers / relpath)
+    for path in own + [CGROUP_ROOT, CGROUP_ROOT / controller]:
+        if path.isdir():
+            yield path
+
+
+def _cgroup_cpus():
+    """
+    Get CPU quota of current cgroup as (fractional) number of CPUs.
+
+    :return: ``None`` if there is no quota
+    """
+    for path in _cgroup_dirs('cpu'):
+        # cgroup v2
+        cpu_max = _read(path / 'cpu.max')
+        if cpu_max:
+            quota, period = (cpu_max.split() + ['100000'])[:2]
+            if quota != 'max':
+                return float(quota) / float(period)
+
+            return None
+
+        # cgroup v1
+        quota = _read(path / 'cpu.cfs_quota_us')
+        period = _read(path / 'cpu.cfs_period_us')
+        if quota and period:
+            if int(quota) > 0:
+                return float(quota) / float(period)
+
+            return None
+
+    return None
+
+
+def cpus():
+    """
+    Get number of CPUs usable by the current process.
+
+    Respects the CPU affinity mask and cgroup CPU quota
+    """
+    try:
+        count = len(os.sched_getaffinity(0))
+    except AttributeError:  # pragma: no cover
+        count = multiprocessing.cpu_count()
+    quota = _cgroup_cpus()
+    if quota is not None:
+        count = min(count, int(math.ceil(quota)))
+    return max(1, count)
+
+
+def memory():
+    """
+    Get number of bytes of memory currently available to the process.
+
+    Respects the cgroup memory limit
+
+    :return: ``None`` if not determinable
+    """
+    available = None
+    for line in (_read('/proc/meminfo') or '').splitlines():
+        if line.startswith('MemAvailable:'):
+            available = int(line.split()[1]) * 1024
+            break
+
+    for path in _cgroup_dirs('memory'):
+        # cgroup v2 / v1
+        for limit_file, usage_file in [
+                ('memory.max', 'memory.current'),
+                ('memory.limit_in_bytes', 'memory.usage_in_bytes'),
+        ]:
+            limit = _read(path / limit_file)
+            if limit is None:
+                continue
+
+            # v1 reports unlimited as huge number
+            if limit != 'max' and int(limit) < 2 ** 60:
+                free = int(limit) - int(_read(path / usage_file) or 0)
+                available = max(0, free if available is None
+                                else min(available, free))
+            return available
+
+    return available
+
+
+def jobs(jobs=None):
+    """
+    Determine number of parallel ``b2`` jobs.
+
+    :param jobs:
+       Explicit number of jobs, which is returned as is. Falls back to
+       :const:`Boost.Config.JOBS`. If that is not defined either, the
+       number of usable :func:`.cpus` is taken, limited by available
+       :func:`.memory` divided by :const:`Boost.Config.MEMORY_PER_JOB`
+    """
+    if jobs:
+        return int(jobs)
+
+    if Config.JOBS:
+        return Config.JOBS
+
+    count = cpus()
+    if Config.MEMORY_PER_JOB:
+        available = memory()
+        if available is not None:
+            count = min(count, available // Config.MEMORY_PER_JOB)
+    return max(1, int(count))
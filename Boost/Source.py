@@ -1,268 +1,1016 @@
-# C++Boost as a Python package
-#
-# Copyright (C) 2017 Stefan Zimmermann <user@zimmermann.co>
-#
-# This is free software: you can redistribute it and/or modify
-# it under the terms of the GNU Lesser General Public License as published by
-# the Free Software Foundation, either version 3 of the License, or
-# (at your option) any later version.
-#
-# This is distributed in the hope that it will be useful,
-# but WITHOUT ANY WARRANTY; without even the implied warranty of
-# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
-# GNU Lesser General Public License for more details.
-#
-# You should have received a copy of the GNU Lesser General Public License
-# along with this.  If not, see <http://www.gnu.org/licenses/>.
-
-"""
-Download and build Boost source releases with :class:`Boost.Source`.
-"""
-
-import platform
-import re
-import shutil
-import sysconfig
-import tarfile
-
-from bs4 import BeautifulSoup
-from furl import furl as URL
-from moretools import cached
-from packaging.version import Version
-from path import Path
-from six import with_metaclass
-import requests
-import zetup
-
-__all__ = ('Source', )
-
-
-BITS = int(platform.architecture()[0].split('bit')[0])
-assert BITS in (32, 64)
-
-
-def _toolset():
-    """
-    Determine compiler toolset for Boost.
-    """
-    supported = {
-        'GCC': 'gcc',
-        'MSC': 'msvc',
-    }
-    compiler = platform.python_compiler()
-    for key, name in  supported.items():
-        if compiler.startswith(key):
-            return name
-
-    raise RuntimeError("Could not determine compiler toolset for Boost from "
-                       "platform.python_compiler() {!r}. Supported: {!r}"
-                       .format(compiler, supported))
-
-
-TOOLSET = _toolset()
-
-MSVC = TOOLSET == 'msvc'
-
-
-BOOST_URL = URL('http://www.boost.org')
-
-MIN_BOOST_VERSION = Version('1.42.0')
-
-
-class Meta(zetup.meta):
-    """
-    Metaclass for :class:`Boost.Source`.
-
-    Provides class properties for retrieving info about available Boost
-    releases
-    """
-
-    @property
-    @cached
-    def RELEASE_URLS(cls):
-        """
-        ``dict`` of available Boost release versions and release page URLs.
-
-        All (old) releases without download link are excluded
-        """
-        history_url = URL(str(BOOST_URL) + '/users/history')
-        response = requests.get(history_url)
-        html = BeautifulSoup(response.text, 'html5lib')
-        ilinks = iter(html.find_all('a'))
-        for link in ilinks:
-            if re.match(r'^Version\s+[0-9.]+$', link.text.strip()):
-                release_link = link
-                break
-        else:
-            raise RuntimeError("no Boost release links found in {}"
-                               .format(history_url))
-
-        result = {}
-        while release_link:
-            next_release_link = download_link = None
-            for link in ilinks:
-                if re.match(r'^Version\s+[0-9.]+$', link.text.strip()):
-                    next_release_link = link
-                    break
-                if re.match(r'^Download$', link.text.strip()):
-                    download_link = link
-            if download_link:
-                version = Version(release_link.text.split()[1])
-                if version >= MIN_BOOST_VERSION:
-                    url = URL(str(BOOST_URL) + release_link.get('href'))
-                    result[Version(release_link.text.split()[1])] = url
-            release_link = next_release_link
-        return result
-
-    @property
-    def VERSIONS(cls):
-        """
-        ``list`` of available Boost release versions in ascending order.
-        """
-        return sorted(cls.RELEASE_URLS)
-
-    @property
-    def LATEST_VERSION(cls):
-        """
-        Latest available Boost release version.
-        """
-        return max(cls.RELEASE_URLS)
-
-    @property
-    def LATEST(cls):
-        """
-        :class:`Boost.Source` instance for latest Boost release version.
-
-        Gets current directory as root path
-        """
-        return cls(cls.LATEST_VERSION)
-
-
-class Source(with_metaclass(Meta, zetup.object)):
-    """
-    Handler for downloading and building a Boost source release.
-    """
-
-    def __init__(self, version=None, rootpath='.'):
-        """
-        Define absolute Boost source :attr:`.path` for given `version`.
-
-        :param version:
-           ``'major.minor.micro'``. Defaults to latest available release
-        :param rootpath:
-           Directory used for downloading and extracting source archive.
-           Defaults to current working directory
-
-        Source path means directory of extracted Boost source archive under
-        `rootpath`, with naming scheme::
-
-           boost_major_minor_micro/
-        """
-        self.version = Version(str(version or type(self).LATEST_VERSION))
-        rootpath = Path(rootpath).realpath()
-        self.path = rootpath / 'boost_' + self.boost_lib_version
-
-    @property
-    def boost_lib_version(self):
-        """
-        Version string in ``BOOST_LIB_VERSION`` style.
-
-        :return: ``'major_minor_micro'``
-        """
-        return str(self.version).replace('.', '_')
-
-    @property
-    def archive(self):
-        """
-        Absolute path to ``.tar.bz2`` source archive.
-
-        The destination path of :meth:`.download`
-        """
-        return self.path + '.tar.bz2'
-
-    @property
-    def download_url(self):
-        """
-        Full URL to ``.tar.bz2`` archive.
-        """
-        response = requests.get(type(self).RELEASE_URLS[self.version])
-        html = BeautifulSoup(response.text, 'html5lib')
-        for link in html.find_all('a'):
-            if link.text.strip().endswith('.tar.bz2'):
-                return URL(link.get('href'))
-
-    def download(self):
-        """
-        Download ``.tar.bz2`` archive to parent directory of :attr:`.path`.
-
-        :return: Absolute path of downloaded archive
-        """
-        print("Downloading {!r} to {!r}"
-              .format(self.download_url, self.path.dirname()))
-        response = requests.get(self.download_url, stream=True)
-        with self.archive.open('wb') as file:
-            shutil.copyfileobj(response.raw, file)
-        return self.archive
-
-    def extract(self):
-        """
-        Extract downloaded ``.tar.bz2`` archive.
-
-        :return: Absolute path of extracted source directory
-        """
-        print("Extracting {!r}".format(self.archive))
-        with self.path.dirname(), tarfile.open(self.archive) as tar:
-            tar.extractall()
-        return self.path
-
-    def bootstrap(self):
-        """
-        Run ``./bootstrap`` script in extracted Boost source release.
-
-        Auto-selects ``./bootstrap.bat`` for VisualC++ builds and
-        ``./bootstrap.sh`` for GCC
-        """
-        script = MSVC and ['bootstrap.bat'] or ['bash', 'bootstrap.sh']
-        with self.path as cwd:
-            print("Running {!r} in {!r}".format(script, cwd))
-            if zetup.call(script):
-                raise RuntimeError("Failed to run {!r} in {!r}"
-                                   .format(script, cwd))
-
-    def b2(self, args=None):
-        """
-        Run ``./b2`` binary in extracted Boost source release.
-
-        Auto-adds ``toolset=gcc`` or ``=msvc``, ``address-model=32`` or
-        ``=64``, ``include=`` with Python include path, and ``link=shared``
-        to (optionally) given `args` sequence
-        """
-        if MSVC:  # pragma: no cover
-            _b2 = Path(__file__).realpath().dirname() / 'call_b2.cmd'
-        else:  # pragma: no cover
-            _b2 = Path('.') / 'b2'
-        command = [str(_b2), 'toolset={}'.format(TOOLSET),
-                   'address-model={}'.format(BITS),
-                   'include={}'.format(sysconfig.get_path('include')),
-                   'link=shared']
-        if args is not None:
-            command += args
-        with self.path as cwd:
-            print("Running {!r} in {!r}".format(command, cwd))
-            if zetup.call(command):
-                raise RuntimeError("Failed to run {!r} in {!r}"
-                                   .format(command, cwd))
-
-    def build(self):
-        """
-        Build extracted Boost source release.
-        """
-        self.bootstrap()
-        self.b2()
-
-    def install(self, prefix=None):
-        """
-        Install Boost headers and built libs to current or `prefix` directory.
-        """
-        prefix = Path(prefix or '.').realpath()
-        self.b2(['install', '--prefix={}'.format(prefix)])
+# C++Boost as a Python package
+#
+# Copyright (C) 2017 Stefan Zimmermann <user@zimmermann.co>
+#
+# This is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Download and build Boost source releases with :class:`Boost.Source`.
+"""
+
+import bz2
+import contextlib
+import hashlib
+import json
+import os
+import platform
+import re
+import shutil
+import subprocess
+import sys
+import sysconfig
+import tarfile
+import tempfile
+import time
+
+from furl import furl as URL
+from moretools import cached
+from packaging.specifiers import InvalidSpecifier, SpecifierSet
+from packaging.version import InvalidVersion, Version
+from path import Path
+from six import with_metaclass
+import requests
+import zetup
+
+import Boost
+
+from . import Async, CompilerCache, Config, Events, HTML, HTTP, Mirrors
+from .Download import Download, sha256sum
+from .Index import Index
+from .Prefix import Prefix, parse_components, provides
+from .Profile import parse_profile
+from . import Resources
+
+__all__ = ('Source', 'parse_version', 'version_matches')
+
+
+BITS = int(platform.architecture()[0].split('bit')[0])
+assert BITS in (32, 64)
+
+
+def _toolset():
+    """
+    Determine compiler toolset for Boost.
+    """
+    supported = {
+        'GCC': 'gcc',
+        'MSC': 'msvc',
+    }
+    compiler = platform.python_compiler()
+    for key, name in  supported.items():
+        if compiler.startswith(key):
+            return name
+
+    raise RuntimeError("Could not determine compiler toolset for Boost from "
+                       "platform.python_compiler() {!r}. Supported: {!r}"
+                       .format(compiler, supported))
+
+
+TOOLSET = _toolset()
+
+MSVC = TOOLSET == 'msvc'
+
+
+BOOST_URL = URL('http://www.boost.org')
+
+MIN_BOOST_VERSION = Version('1.42.0')
+
+#: Name of JSON file recording completed build phases in source trees
+STATE_FILE = '.pyboost-state.json'
+
+#: Name of generated ``b2`` config file in source trees, setting up the
+#: compiler cache
+USER_CONFIG = 'pyboost-user-config.jam'
+
+#: Locations of ``b2`` engine sources in different Boost releases
+ENGINE_DIRS = ('tools/build/src/engine', 'tools/build/engine',
+               'tools/build/v2/engine/src', 'tools/build/v2/engine',
+               'tools/jam/src')
+
+#: Extensions of ``b2`` engine source files, which identify an engine build
+ENGINE_SOURCES = ('.c', '.cpp', '.h', '.hpp', '.y', '.yy')
+
+#: ``project-config.jam`` as written by the ``./bootstrap`` scripts
+PROJECT_CONFIG = """\
+# Boost.Build Configuration
+# Automatically generated by pyboost
+
+import option ;
+import feature ;
+
+if ! {toolset} in [ feature.values <toolset> ]
+{{
+    using {toolset} ;
+}}
+
+project : default-build <toolset>{toolset} ;
+
+import python ;
+if ! [ python.configured ]
+{{
+    using python : {python_version} : "{python}" ;
+}}
+
+option.set keep-going : false ;
+"""
+
+
+def _links(url):
+    """
+    Stream :class:`Boost.HTML.Link` elements of HTML page at `url`.
+
+    The page is parsed while downloading, without building a document tree.
+    It is persisted in ``http/`` of :const:`Boost.CAREFREE_BOOST_CACHE` for
+    conditional re-requests
+    """
+    return HTML.links(HTTP.iter_text(
+        url, cache=Boost.CAREFREE_BOOST_CACHE / 'http'))
+
+
+def _release_urls():
+    """
+    Scrape available Boost release versions and release page URLs.
+
+    All (old) releases without download link are excluded
+
+    :return: ``dict`` of versions and URLs
+    """
+    history_url = URL(str(BOOST_URL) + '/users/history')
+    ilinks = _links(history_url)
+    for link in ilinks:
+        if re.match(r'^Version\s+[0-9.]+$', link.text):
+            release_link = link
+            break
+    else:
+        raise RuntimeError("no Boost release links found in {}"
+                           .format(history_url))
+
+    result = {}
+    while release_link:
+        next_release_link = download_link = None
+        for link in ilinks:
+            if re.match(r'^Version\s+[0-9.]+$', link.text):
+                next_release_link = link
+                break
+            if link.text == 'Download':
+                download_link = link
+        if download_link:
+            version = Version(release_link.text.split()[1])
+            if version >= MIN_BOOST_VERSION:
+                result[version] = URL(str(BOOST_URL) + release_link.href)
+        release_link = next_release_link
+    return result
+
+
+#: Number of bytes read at once from download streams
+_CHUNK_SIZE = 1024 ** 2
+
+
+def parse_version(version):
+    """
+    Normalize requested Boost `version`.
+
+    :param version:
+       An exact version like ``'1.66.0'``, a PEP 440 specifier like
+       ``'>=1.70,<1.80'``, or ``None`` for any version
+    :return:
+       A ``packaging.version.Version``, a
+       ``packaging.specifiers.SpecifierSet``, or ``None``
+    """
+    if version is None or isinstance(version, (Version, SpecifierSet)):
+        return version
+
+    try:
+        return Version(str(version))
+    except InvalidVersion:
+        pass
+    try:
+        return SpecifierSet(str(version))
+    except InvalidSpecifier:
+        raise ValueError("Invalid Boost version or specifier {!r}"
+                         .format(version))
+
+
+def version_matches(version, requested):
+    """
+    Check if Boost `version` satisfies `requested` version or specifier.
+
+    See :func:`.parse_version` for `requested`
+    """
+    requested = parse_version(requested)
+    if requested is None:
+        return True
+
+    if isinstance(requested, SpecifierSet):
+        return Version(str(version)) in requested
+
+    return Version(str(version)) == requested
+
+
+class _HashingReader(object):
+    """
+    File-like wrapper of readable `stream`, hashing and counting all data
+    read.
+
+    Optionally writes the data to `tee` file, too
+    """
+
+    def __init__(self, stream, tee=None):
+        self.stream = stream
+        self.tee = tee
+        self.hash = hashlib.sha256()
+        self.size = 0
+
+    def read(self, size=-1):
+        data = self.stream.read(size)
+        self.hash.update(data)
+        self.size += len(data)
+        if self.tee is not None:
+            self.tee.write(data)
+        return data
+
+
+def _hardlink_or_copy(src, dst):
+    """
+    Hardlink file `src` to `dst` or copy if linking is not possible.
+    """
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def _extractall(tar, path):
+    """
+    Extract all members of opened `tar` archive into `path`.
+
+    Uses the ``'data'`` extraction filter where available. Otherwise
+    refuses absolute and ``..`` member names and links pointing outside of
+    `path`
+    """
+    if hasattr(tarfile, 'data_filter'):
+        tar.extractall(path, filter='data')
+        return
+
+    root = os.path.abspath(path)
+
+    def outside(name):
+        target = os.path.normpath(os.path.join(root, name))
+        return target != root and not target.startswith(root + os.sep)
+
+    def members():
+        for member in tar:
+            if member.issym():
+                link = os.path.join(os.path.dirname(member.name),
+                                    member.linkname)
+            else:
+                link = member.linkname if member.islnk() else None
+            if outside(member.name) or link is not None and outside(link):
+                raise tarfile.TarError(
+                    "Refusing to extract {!r} outside of {!r}"
+                    .format(member.name, root))
+            yield member
+
+    tar.extractall(root, members=members())
+
+
+def _call(command, env=None, output=None, cwd=None):
+    """
+    Run `command` and pass its output lines through to ``sys.stdout``.
+
+    :param output: Optional callback for each output line
+    :param cwd:
+       Working directory of `command`. The process' own one is never
+       changed, which would affect other threads
+    :return: Exit code
+    """
+    process = subprocess.Popen(
+        command, env=env, cwd=cwd, stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT)
+    with process.stdout:
+        for line in iter(process.stdout.readline, b''):
+            line = line.decode('utf-8', 'replace')
+            sys.stdout.write(line)
+            sys.stdout.flush()
+            if output is not None:
+                output(line)
+    return process.wait()
+
+
+class _LibraryTimer(object):
+    """
+    Measure build durations of Boost libraries from ``b2`` output lines.
+
+    ``b2`` reports actions like ``gcc.compile.c++ bin.v2/libs/system/...``
+    after completing them. A library's duration spans from the report
+    preceding its first action to the report of its last one, which is
+    approximate when building with parallel jobs
+    """
+
+    ACTION = re.compile(
+        r'^[\w.+-]+\s+.*\bbin\.v2[/\\]libs[/\\]([^/\\]+)[/\\]')
+
+    def __init__(self):
+        self.previous = time.time()
+        self.libraries = {}
+
+    def __call__(self, line):
+        match = self.ACTION.match(line)
+        if match is None:
+            return
+
+        now = time.time()
+        start, _, actions = self.libraries.get(
+            match.group(1), (self.previous, None, 0))
+        self.libraries[match.group(1)] = (start, now, actions + 1)
+        self.previous = now
+
+    def emit(self):
+        """
+        Emit ``'library'`` events with ``'duration'`` and ``'actions'``.
+        """
+        for name, (start, end, actions) in sorted(self.libraries.items()):
+            Events.emit('library', library=name, duration=end - start,
+                        actions=actions)
+
+
+class _NoFile(object):
+    """
+    Null context manager as replacement for a file, which is not written.
+    """
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+class Meta(zetup.meta):
+    """
+    Metaclass for :class:`Boost.Source`.
+
+    Provides class properties for retrieving info about available Boost
+    releases
+    """
+
+    @property
+    @cached
+    def INDEX(cls):
+        """
+        Persistent :class:`Boost.Index.Index` of Boost releases.
+
+        Stored as ``releases.json`` in :const:`Boost.CAREFREE_BOOST_CACHE`
+        """
+        return Index(Boost.CAREFREE_BOOST_CACHE / 'releases.json')
+
+    @property
+    @cached
+    def RELEASE_URLS(cls):
+        """
+        ``dict`` of available Boost release versions and release page URLs.
+
+        All (old) releases without download link are excluded. Taken from
+        :attr:`.INDEX`, which only gets (re-)fetched from boost.org if it
+        doesn't exist yet or is expired
+        """
+        return cls.INDEX.release_urls(fetch=_release_urls)
+
+    @property
+    def VERSIONS(cls):
+        """
+        ``list`` of available Boost release versions in ascending order.
+        """
+        return sorted(cls.RELEASE_URLS)
+
+    @property
+    def LATEST_VERSION(cls):
+        """
+        Latest available Boost release version.
+        """
+        return max(cls.RELEASE_URLS)
+
+    def latest_version(cls, specifier=None):
+        """
+        Get latest available Boost release version matching `specifier`.
+
+        See :func:`Boost.Source.version_matches`
+        """
+        versions = [version for version in cls.RELEASE_URLS
+                    if version_matches(version, specifier)]
+        if not versions:
+            raise RuntimeError("No Boost release matches {!r}. Available: {}"
+                               .format(str(specifier), ", ".join(
+                                   map(str, sorted(cls.RELEASE_URLS)))))
+
+        return max(versions)
+
+    @property
+    def LATEST(cls):
+        """
+        :class:`Boost.Source` instance for latest Boost release version.
+
+        Gets current directory as root path
+        """
+        return cls(cls.LATEST_VERSION)
+
+
+class Source(with_metaclass(Meta, zetup.object)):
+    """
+    Handler for downloading and building a Boost source release.
+    """
+
+    def __init__(self, version=None, rootpath='.'):
+        """
+        Define absolute Boost source :attr:`.path` for given `version`.
+
+        :param version:
+           ``'major.minor.micro'``. Or a PEP 440 specifier like
+           ``'>=1.70,<1.80'`` for the latest matching release. Defaults to
+           latest available release
+        :param rootpath:
+           Directory used for downloading and extracting source archive.
+           Defaults to current working directory
+
+        Source path means directory of extracted Boost source archive under
+        `rootpath`, with naming scheme::
+
+           boost_major_minor_micro/
+        """
+        version = parse_version(version)
+        if not isinstance(version, Version):
+            version = type(self).latest_version(version)
+        self.version = version
+        rootpath = Path(rootpath).realpath()
+        self.path = rootpath / 'boost_' + self.boost_lib_version
+
+    @property
+    def boost_lib_version(self):
+        """
+        Version string in ``BOOST_LIB_VERSION`` style.
+
+        :return: ``'major_minor_micro'``
+        """
+        return str(self.version).replace('.', '_')
+
+    @property
+    def archive(self):
+        """
+        Absolute path to ``.tar.bz2`` source archive.
+
+        The destination path of :meth:`.download`
+        """
+        return self.path + '.tar.bz2'
+
+    @property
+    def download_url(self):
+        """
+        Full URL to ``.tar.bz2`` archive.
+
+        Cached in :attr:`Boost.Source.INDEX`
+        """
+        return URL(self._download_info['url'])
+
+    @property
+    def sha256(self):
+        """
+        SHA256 hash of ``.tar.bz2`` archive, as published on release page.
+
+        ``None`` for (old) releases without published hashes. Cached in
+        :attr:`Boost.Source.INDEX`
+        """
+        return self._download_info['sha256']
+
+    @property
+    def archives(self):
+        """
+        ``dict`` of all source archives published for this release.
+
+        With file names like ``'boost_1_66_0.7z'`` as keys and ``dict``
+        values with ``'url'`` and ``'sha256'``, which is ``None`` if not
+        published. Scraped together with :attr:`.download_url` and cached in
+        :attr:`Boost.Source.INDEX`. Empty if indexed by older versions of
+        this package
+        """
+        return self._download_info.get('archives') or {}
+
+    @property
+    def _download_info(self):
+        return type(self).INDEX.download(
+            self.version, fetch=self._scrape_download_info)
+
+    def _scrape_download_info(self):
+        release_url = type(self).RELEASE_URLS[self.version]
+        archives = HTML.archives(_links(release_url))
+        for name, info in archives.items():
+            if name.endswith('.tar.bz2'):
+                return dict(info, url=URL(info['url']), archives=archives)
+
+        raise RuntimeError("no .tar.bz2 link found in {}"
+                           .format(release_url))
+
+    def download(self, extract=False, keep=True, connections=None):
+        """
+        Download ``.tar.bz2`` archive to parent directory of :attr:`.path`.
+
+        By default, the archive is fetched in byte ranges over concurrent
+        `connections` and verified against :attr:`.sha256`. Interrupted
+        downloads are resumed. See :class:`Boost.Download.Download`.
+
+        Configured :const:`Boost.Config.MIRRORS` are probed first and used
+        in order of :func:`Boost.Mirrors.rank`, switching to the next one if
+        a mirror fails
+
+        :param extract:
+           Stream the download directly into the extraction, so that both
+           overlap. The archive is then only written (as a side effect)
+           if `keep` is ``True``. The downloaded data is verified against
+           :attr:`.sha256` on the fly
+        :return:
+           Absolute path of downloaded archive, or of extracted source
+           directory if `extract` is ``True``
+        """
+        urls = Mirrors.rank(Mirrors.candidates(
+            self.archive.basename(), self.version, self.download_url))
+        if not extract:
+            return Download(urls, self.archive, sha256=self.sha256,
+                            connections=connections).run()
+
+        for index, url in enumerate(urls):
+            try:
+                return self._download_extract(url, keep)
+
+            except (requests.RequestException, IOError, tarfile.TarError,
+                    RuntimeError) as exc:
+                if index == len(urls) - 1:
+                    raise
+
+                Events.emit('download.failover', "Failed to download {!r} "
+                            "from {!r}: {}. Switching to {!r}".format(
+                                self.archive.basename(), url, exc,
+                                urls[index + 1]),
+                            url=url, alternative=urls[index + 1],
+                            path=str(self.archive), error=repr(exc))
+
+    async def adownload(self, extract=False, keep=True, connections=None):
+        """
+        Asynchronous :meth:`.download` in :func:`Boost.Async.io_executor`.
+        """
+        return await Async.io(self.download, extract=extract, keep=keep,
+                              connections=connections)
+
+    def _download_extract(self, url, keep):
+        partial = self.archive + '.part'
+        try:
+            with Events.phase(
+                    'download', "Downloading and extracting {!r} to {!r}"
+                    .format(url, self.path.dirname()),
+                    url=url, path=str(self.path),
+                    extract=True) as results:
+                if Mirrors.local(url):
+                    raw = open(url, 'rb')
+                else:
+                    response = HTTP.session().get(url, stream=True)
+                    response.raise_for_status()
+                    raw = response.raw
+                with contextlib.closing(raw), (
+                        partial.open('wb') if keep else _NoFile()) as file:
+                    stream = _HashingReader(raw, tee=file)
+                    # tarfile's own 'r|bz2' stream buffers quadratically
+                    with bz2.BZ2File(stream) as data, \
+                            tarfile.open(fileobj=data, mode='r|') as tar:
+                        _extractall(tar, self.path.dirname())
+                        results['files'] = len(tar.members)
+                    # make sure that all data is hashed and written
+                    while stream.read(_CHUNK_SIZE):
+                        pass
+                results['bytes'] = stream.size
+                self._verify(stream.hash, url)
+        except BaseException:
+            partial.remove_p()
+            self.path.rmtree_p()
+            raise
+
+        if keep:
+            os.replace(partial, self.archive)
+        self.update_state(extracted=True)
+        return self.path
+
+    def verify_archive(self):
+        """
+        Check existing :attr:`.archive` against :attr:`.sha256`.
+
+        Always ``True`` if no SHA256 hash is published for this release
+        """
+        return not self.sha256 or sha256sum(self.archive) == self.sha256
+
+    def _verify(self, hash, url):
+        """
+        Check `hash` object of archive from `url` against :attr:`.sha256`.
+
+        Skipped if no SHA256 hash is published for this release
+        """
+        if self.sha256 and hash.hexdigest() != self.sha256:
+            raise RuntimeError("SHA256 mismatch of {!r} from {!r}: "
+                               "expected {}, got {}".format(
+                                   self.archive, url, self.sha256,
+                                   hash.hexdigest()))
+
+    def extract(self):
+        """
+        Extract downloaded ``.tar.bz2`` archive.
+
+        :return: Absolute path of extracted source directory
+        """
+        with Events.phase('extract', "Extracting {!r}".format(self.archive),
+                          archive=str(self.archive)) as results, \
+                tarfile.open(self.archive) as tar:
+            _extractall(tar, self.path.dirname())
+            results['files'] = len(tar.members)
+        self.update_state(extracted=True)
+        return self.path
+
+    async def aextract(self):
+        """
+        Asynchronous :meth:`.extract` in :func:`Boost.Async.io_executor`.
+        """
+        return await Async.io(self.extract)
+
+    @property
+    def state_file(self):
+        """
+        Absolute path of JSON file recording completed build phases.
+
+        Located in extracted source :attr:`.path`, so it is gone together
+        with the source tree
+        """
+        return self.path / STATE_FILE
+
+    @property
+    def state(self):
+        """
+        ``dict`` of completed build phases from :attr:`.state_file`.
+        """
+        try:
+            with self.state_file.open() as file:
+                state = json.load(file)
+        except (IOError, OSError, ValueError):
+            return {}
+
+        return state if isinstance(state, dict) else {}
+
+    def update_state(self, **items):
+        """
+        Merge `items` into :attr:`.state_file`.
+        """
+        state = self.state
+        state.update(items)
+        with self.state_file.open('w') as file:
+            json.dump(state, file, indent=2, sort_keys=True)
+
+    @property
+    def extracted(self):
+        """
+        Whether :attr:`.path` contains a completely extracted archive.
+        """
+        return bool(self.state.get('extracted')) and all(
+            (self.path / name).isfile() for name in (
+                'bootstrap.bat', 'bootstrap.sh', 'boost/version.hpp'))
+
+    @property
+    def bootstrapped(self):
+        """
+        Whether :meth:`.bootstrap` completed and the ``b2`` binary exists.
+        """
+        return bool(self.state.get('bootstrapped')) and any(
+            (self.path / name).isfile() for name in ('b2', 'b2.exe'))
+
+    @staticmethod
+    def _built_key(profile=None):
+        profile = parse_profile(profile)
+        return 'built' if profile.default else 'built@' + profile.name
+
+    def built(self, components=None, profile=None):
+        """
+        Whether :meth:`.build` completed for (a superset of) `components`.
+
+        With the given build `profile`
+        """
+        components = parse_components(components)
+        return any(provides(built and tuple(built), components)
+                   for built in self.state.get(self._built_key(profile), ()))
+
+    @property
+    def engine_path(self):
+        """
+        Absolute path of ``b2`` engine sources in extracted :attr:`.path`.
+
+        ``None`` if not found. See :const:`.ENGINE_DIRS`
+        """
+        for name in ENGINE_DIRS:
+            path = self.path / name
+            if path.isdir():
+                return path
+
+        return None
+
+    @property
+    def engine_version(self):
+        """
+        ``b2`` engine version string like ``'2015.07'`` or ``None``.
+
+        Taken from the engine's ``patchlevel.h``
+        """
+        path = self.engine_path
+        try:
+            text = path and (path / 'patchlevel.h').text()
+        except (IOError, OSError):
+            return None
+
+        if not text:
+            return None
+
+        numbers = [re.search(r'#\s*define\s+VERSION_{}\s+(\d+)'.format(key),
+                             text) for key in ('MAJOR', 'MINOR', 'PATCH')]
+        return '.'.join(m.group(1) for m in numbers if m) or None
+
+    @property
+    def engine_key(self):
+        """
+        Key identifying the ``b2`` engine build of this release.
+
+        Combines :attr:`.engine_version` with a hash of the engine sources,
+        because engine versions didn't change with every release. ``None``
+        if there are no engine sources
+        """
+        path = self.engine_path
+        if path is None:
+            return None
+
+        hash = hashlib.sha256()
+        for relpath in sorted(path.relpathto(p) for p in path.walkfiles()):
+            dirs = relpath.splitall()[1:-1]
+            # skip build directories of ./bootstrap
+            if dirs and dirs[0].startswith(('bin.', 'bootstrap')) \
+                    or relpath.ext not in ENGINE_SOURCES:
+                continue
+
+            hash.update(relpath.replace('\\', '/').encode('utf-8') + b'\0')
+            hash.update((path / relpath).bytes() + b'\0')
+        return '{}-{}'.format(self.engine_version or 'unknown',
+                              hash.hexdigest()[:16])
+
+    @property
+    def engine_cache(self):
+        """
+        Absolute path of cached ``b2`` binary for this release.
+
+        Located in ``CAREFREE_BOOST_CACHE/b2/<engine key>/<toolset>/``.
+        ``None`` if there is no :attr:`.engine_key`
+        """
+        key = self.engine_key
+        if key is None:
+            return None
+
+        return (Boost.CAREFREE_BOOST_CACHE / 'b2' / key / TOOLSET
+                / ('b2.exe' if MSVC else 'b2'))
+
+    def write_project_config(self):
+        """
+        Write ``project-config.jam`` like the ``./bootstrap`` scripts.
+
+        Configures the :const:`.TOOLSET` and the running Python interpreter
+        """
+        path = self.path / 'project-config.jam'
+        path.write_text(PROJECT_CONFIG.format(
+            toolset=TOOLSET, python_version=sysconfig.get_python_version(),
+            python=Path(sys.executable).replace('\\', '/')))
+        return path
+
+    def bootstrap(self, cache=True):
+        """
+        Run ``./bootstrap`` script in extracted Boost source release.
+
+        Auto-selects ``./bootstrap.bat`` for VisualC++ builds and
+        ``./bootstrap.sh`` for GCC
+
+        :param cache:
+           Reuse ``b2`` binary from :attr:`.engine_cache` and only
+           :meth:`.write_project_config` instead of compiling the engine.
+           Freshly compiled ``b2`` binaries get stored there
+        """
+        cached = cache and self.engine_cache
+        if cached and cached.isfile():
+            with Events.phase(
+                    'bootstrap', "Using cached b2 engine {!r} in {!r}"
+                    .format(cached, self.path),
+                    path=str(self.path), cached=True):
+                shutil.copy2(cached, self.path / cached.basename())
+                self.write_project_config()
+            self.update_state(bootstrapped=True)
+            return
+
+        script = MSVC and ['bootstrap.bat'] or ['bash', 'bootstrap.sh']
+        with Events.phase(
+                'bootstrap', "Running {!r} in {!r}".format(script, self.path),
+                path=str(self.path), cached=False):
+            if _call(script, cwd=self.path):
+                raise RuntimeError("Failed to run {!r} in {!r}"
+                                   .format(script, self.path))
+        if cached:
+            built = self.path / cached.basename()
+            if built.isfile():
+                Events.emit('engine.cache', "Caching b2 engine {!r}".format(
+                    cached), path=str(cached))
+                # unique per writer, as other threads may cache the same
+                # engine concurrently
+                fd, temp = tempfile.mkstemp(
+                    dir=cached.dirname().makedirs_p(),
+                    prefix='.' + cached.basename(), suffix='.tmp')
+                os.close(fd)
+                try:
+                    shutil.copy2(built, temp)
+                    os.replace(temp, cached)
+                except BaseException:
+                    Path(temp).remove_p()
+                    raise
+        self.update_state(bootstrapped=True)
+
+    def b2(self, args=None, jobs=None, compiler_cache=None, profile=None):
+        """
+        Run ``./b2`` binary in extracted Boost source release.
+
+        Auto-adds ``toolset=gcc`` or ``=msvc``, ``address-model=32`` or
+        ``=64``, ``include=`` with Python include path, the properties of
+        build `profile`, and ``-j`` with number of parallel `jobs` to
+        (optionally) given `args` sequence
+
+        :param profile:
+           A :class:`Boost.Profile.Profile`. Defaults to
+           :const:`Boost.Profile.DEFAULT` with ``variant=release`` and
+           ``link=shared``
+        :param jobs:
+           Defaults to number of usable CPUs, as determined by
+           :func:`Boost.Resources.jobs`
+        :param compiler_cache:
+           Compile through ``ccache`` or ``sccache`` via a generated
+           ``user-config.jam`` and report cache statistics afterwards.
+           See :func:`Boost.CompilerCache.find`
+        """
+        if MSVC:  # pragma: no cover
+            _b2 = Path(__file__).realpath().dirname() / 'call_b2.cmd'
+        else:  # pragma: no cover
+            _b2 = self.path / 'b2'
+        command = [str(_b2), 'toolset={}'.format(TOOLSET),
+                   'address-model={}'.format(BITS),
+                   'include={}'.format(sysconfig.get_path('include'))]
+        command += parse_profile(profile).args()
+        command.append('-j{}'.format(Resources.jobs(jobs)))
+        env = None
+        launcher = CompilerCache.find(compiler_cache)
+        if launcher is not None:
+            command.append('--user-config={}'.format(CompilerCache.user_config(
+                launcher, self.path / USER_CONFIG, TOOLSET)))
+            env = CompilerCache.environ(launcher, self.path)
+            before = CompilerCache.stats(launcher)
+        if args is not None:
+            command += args
+        timer = _LibraryTimer()
+        with Events.phase(
+                'b2', "Running {!r} in {!r}".format(command, self.path),
+                path=str(self.path), args=list(args or ())):
+            try:
+                if _call(command, env=env, output=timer, cwd=self.path):
+                    raise RuntimeError("Failed to run {!r} in {!r}"
+                                       .format(command, self.path))
+            finally:
+                timer.emit()
+
+        if launcher is not None:
+            CompilerCache.report(
+                launcher, before, CompilerCache.stats(launcher))
+
+    @staticmethod
+    def components_args(components=None):
+        """
+        Get ``b2`` options for building selected library `components`.
+
+        :param components:
+           See :func:`Boost.Prefix.parse_components`
+        :return: ``list`` of ``--with-*`` or ``--without-*`` options
+        """
+        return [
+            '--without-' + name[1:] if name.startswith('-')
+            else '--with-' + name
+            for name in parse_components(components) or ()]
+
+    def build(self, components=None, jobs=None, compiler_cache=None,
+              profile=None):
+        """
+        Build extracted Boost source release with parallel `jobs`.
+
+        Only builds selected library `components` if given. See
+        :func:`Boost.Prefix.parse_components`. Skips :meth:`.bootstrap` if
+        already :attr:`.bootstrapped`. ``b2`` itself only rebuilds what is
+        missing or outdated in the existing ``bin.v2/`` tree. See
+        :meth:`.b2` for `compiler_cache` and build `profile`
+        """
+        profile = parse_profile(profile)
+        with Events.phase('build', path=str(self.path),
+                          components=parse_components(components),
+                          profile=profile.name):
+            if not self.bootstrapped:
+                self.bootstrap()
+            self.b2(self.components_args(components), jobs=jobs,
+                    compiler_cache=compiler_cache, profile=profile)
+        key = self._built_key(profile)
+        built = self.state.get(key, [])
+        components = parse_components(components)
+        if components not in [b and tuple(b) for b in built]:
+            self.update_state(**{key: built + [components]})
+
+    async def abuild(self, components=None, jobs=None, compiler_cache=None,
+                     profile=None):
+        """
+        Asynchronous :meth:`.build` in bounded
+        :func:`Boost.Async.build_executor`.
+        """
+        return await Async.build(self.build, components=components,
+                                 jobs=jobs, compiler_cache=compiler_cache,
+                                 profile=profile)
+
+    def install(self, prefix=None, components=None, jobs=None,
+                header_only=False, link=None, profile=None):
+        """
+        Install Boost headers and built libs to current or `prefix` directory.
+
+        Builds anything not built yet with parallel `jobs` and build
+        `profile`. Only installs selected library `components` if given.
+        Installation details are recorded in the
+        :attr:`Boost.Prefix.Prefix.info_file`
+
+        :param header_only:
+           Skip ``b2`` and just install the headers.
+           See :meth:`.install_headers`, which gets the `link` mode
+        """
+        if header_only:
+            return self.install_headers(prefix, link=link)
+
+        prefix = Prefix(Path(prefix or '.').realpath())
+        with Events.phase('install', prefix=str(prefix),
+                          components=parse_components(components)):
+            self.b2(['install', '--prefix={}'.format(prefix)]
+                    + self.components_args(components), jobs=jobs,
+                    profile=profile)
+        prefix.write_info(version=str(self.version), toolset=TOOLSET,
+                          components=parse_components(components),
+                          profile=dict(parse_profile(profile)._asdict()))
+
+    def install_headers(self, prefix=None, link=None):
+        """
+        Install only ``boost/`` header tree to ``include/`` of `prefix`.
+
+        Doesn't need :meth:`.bootstrap` or :meth:`.b2`. Marks the prefix
+        as :attr:`Boost.Prefix.Prefix.header_only`
+
+        :param link:
+           ``'copy'`` the header files, ``'hardlink'`` them (falling back
+           to copying if not possible) or ``'symlink'`` the whole tree,
+           which dangles once the source tree is removed. Defaults to
+           :const:`Boost.Config.HEADERS_LINK`
+        """
+        link = link or Config.HEADERS_LINK
+        if link not in ('copy', 'hardlink', 'symlink'):
+            raise ValueError("Invalid header installation link mode {!r}"
+                             .format(link))
+
+        prefix = Prefix(Path(prefix or '.').realpath())
+        target = (prefix / 'include').makedirs_p() / 'boost'
+        if target.islink() or target.isfile():
+            target.remove()
+        elif target.isdir():
+            target.rmtree()
+
+        with Events.phase(
+                'install', "Installing headers from {!r} to {!r} ({})"
+                .format(self.path / 'boost', target, link),
+                prefix=str(prefix), header_only=True, link=link):
+            if link == 'symlink':
+                (self.path / 'boost').symlink(target)
+            else:
+                shutil.copytree(self.path / 'boost', target, copy_function=(
+                    _hardlink_or_copy if link == 'hardlink'
+                    else shutil.copy2))
+        prefix.write_info(version=str(self.version), toolset=None,
+                          components=None, header_only=True)
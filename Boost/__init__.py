@@ -1,83 +1,500 @@
-# C++Boost as a Python package
-#
-# Copyright (C) 2017 Stefan Zimmermann <user@zimmermann.co>
-#
-# This is free software: you can redistribute it and/or modify
-# it under the terms of the GNU Lesser General Public License as published by
-# the Free Software Foundation, either version 3 of the License, or
-# (at your option) any later version.
-#
-# This is distributed in the hope that it will be useful,
-# but WITHOUT ANY WARRANTY; without even the implied warranty of
-# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
-# GNU Lesser General Public License for more details.
-#
-# You should have received a copy of the GNU Lesser General Public License
-# along with this.  If not, see <http://www.gnu.org/licenses/>.
-
-"""
-C++Boost as a Python package.
-"""
-
-from path import Path
-
-from .Lib import Lib
-from .Source import Source, TOOLSET
-
-# __version__ module is created by setuptools_scm during setup
-from .__version__ import version as __version__
-
-__all__ = ('Source', )
-
-
-CAREFREE_HOME = (Path('~').expanduser() / '.carefree').makedirs_p()
-
-CAREFREE_BOOST_HOME = (CAREFREE_HOME / 'boost').makedirs_p()
-
-CAREFREE_BOOST_CACHE = (CAREFREE_BOOST_HOME / '.cache').makedirs_p()
-
-
-def resolve(version=None):
-    """
-    Search installed Boost and install if not found.
-
-    `version` defaults to latest available release
-
-    :return:
-        The prefix path of the Boost installation
-    """
-    source = Source(version, rootpath=CAREFREE_BOOST_CACHE)
-    prefix = CAREFREE_BOOST_HOME / source.boost_lib_version / TOOLSET
-    if prefix.exists():
-        return prefix, source
-
-    if source.path.exists():
-        print("Removing {!r}".format(source.path))
-        source.path.rmtree()
-    if source.archive.exists():
-        print("Using cached {!r}".format(source.archive))
-    else:
-        source.download()
-    source.extract()
-    source.build()
-    source.install(prefix=prefix.makedirs_p())
-    return prefix, source
-
-
-PREFIX, SOURCE = resolve()
-
-
-INCLUDE = [PREFIX / 'include']
-assert INCLUDE[0].isdir(), (
-    "Corrupted Boost installation! Missing directory {!r}. Please remove {!r}"
-    .format(INCLUDE[0], PREFIX))
-
-_boost_include = INCLUDE[0] / 'boost-' + SOURCE.boost_lib_version
-if _boost_include.isdir():
-    INCLUDE.append(_boost_include)
-
-
-LIB = Lib([PREFIX / 'lib'])
-assert LIB[0].isdir(), (
-    "Corrupted Boost installation! Missing directory {!r}. Please remove {!r}"
-    .format(LIB[0], PREFIX))
+# C++Boost as a Python package
+#
+# Copyright (C) 2017 Stefan Zimmermann <user@zimmermann.co>
+#
+# This is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+C++Boost as a Python package.
+"""
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import os
+
+from packaging.specifiers import SpecifierSet
+from path import Path
+
+from . import Artifact, Async, Config, Discovery, Events, Matrix
+from .Cache import Cache
+from .Lib import Lib
+from .ObjectStore import ObjectStore
+from .Prefix import Prefix, parse_components
+from .Profile import parse_profile
+from .Source import Source, TOOLSET, parse_version
+
+# __version__ module is created by setuptools_scm during setup
+from .__version__ import version as __version__
+
+__all__ = ('Source', )
+
+
+CAREFREE_HOME = (Path('~').expanduser() / '.carefree').makedirs_p()
+
+CAREFREE_BOOST_HOME = (CAREFREE_HOME / 'boost').makedirs_p()
+
+CAREFREE_BOOST_CACHE = (CAREFREE_BOOST_HOME / '.cache').makedirs_p()
+
+
+def resolve(version=None, components=None, jobs=None, header_only=False,
+            build=None, profile=None):
+    """
+    Search installed Boost and install if not found.
+
+    `version` defaults to latest available release. It can also be a PEP
+    440 specifier like ``'>=1.70,<1.80'``, which prefers already installed
+    versions. See :func:`.select_version`. Building uses parallel `jobs`,
+    defaulting to :func:`Boost.Resources.jobs`
+
+    Safe for concurrent use by multiple processes. Only one of them builds
+    a specific Boost version, while holding the lock file from
+    :func:`.lock`. The others wait and then use the result. Installations
+    are built in a temporary prefix and then published atomically by
+    renaming, so readers never see half-installed prefixes. Before that,
+    their files get deduplicated via :func:`.objects` if
+    :const:`Boost.Config.DEDUPE` is set
+
+    Sources and prefixes are recorded as used, and the least recently used
+    ones exceeding :const:`Boost.Config.CACHE_BUDGET` get evicted via
+    :func:`.collect`. Returned prefixes are protected from eviction by other
+    processes as long as this process runs
+
+    Compiled installations are first looked up in the
+    :func:`Boost.Artifact.store`. Prefixes built from source get exported
+    there if :const:`Boost.Config.ARTIFACTS_PUSH` is set
+
+    Before all that, existing installations outside of
+    :const:`.CAREFREE_BOOST_HOME` are searched via
+    :func:`Boost.Discovery.discover`, if :const:`Boost.Config.DISCOVERY` is
+    set and the default `profile` is requested. Only for requests of a
+    specific `version` and either explicit `components` or `header_only`,
+    because the complete set of libraries of foreign installations is
+    unknown. Discovered installations are returned as
+    :class:`Boost.Discovery.Installation`
+
+    :param components:
+       Only require and build these compiled libraries. See
+       :func:`Boost.Prefix.parse_components`. Any existing installation
+       providing at least these components is used. Otherwise the
+       components get installed to a separate prefix, named after them
+    :param header_only:
+       Only require Boost headers. If there is no installation yet, just
+       the header tree is installed, without bootstrapping and building
+    :param build:
+       Optional function ``build(func, **kwargs)`` for running
+       :meth:`Boost.Source.build` with `kwargs`, like in an executor
+    :param profile:
+       Build variant, link mode and flags of compiled libraries, like
+       ``'release-static-lto'``. See :func:`Boost.Profile.parse_profile`.
+       Only installations with the same profile are used. Other than the
+       default one get installed to separate prefixes. See
+       :meth:`Boost.Prefix.Prefix.name`
+    :return:
+        The prefix path of the Boost installation
+    """
+    profile = parse_profile(profile)
+    version = select_version(
+        version, components=components, header_only=header_only,
+        profile=profile)
+    # without version, the latest release is requested, not any host Boost
+    if profile.default and Config.DISCOVERY and version is not None:
+        installation = Discovery.discover(
+            version, components=components, header_only=header_only)
+        if installation is not None:
+            return installation, Source(
+                installation.version, rootpath=CAREFREE_BOOST_CACHE)
+
+    source = Source(version, rootpath=CAREFREE_BOOST_CACHE)
+    home = CAREFREE_BOOST_HOME / source.boost_lib_version
+
+    def installed():
+        for prefix in Prefix.installed(
+                home, TOOLSET, header_only=header_only, profile=profile):
+            # might get evicted by another process before holding it
+            if prefix.provides(components, header_only=header_only) \
+                    and cache().hold(prefix):
+                Events.emit('cache', cache='prefix', hit=True,
+                            prefix=str(prefix))
+                return prefix
+
+    with Events.phase('resolve', version=str(source.version),
+                      components=parse_components(components),
+                      header_only=header_only,
+                      profile=profile.name) as results:
+        prefix = installed()
+        if prefix is None:
+            with lock(source):
+                # maybe installed by another process in the meantime
+                prefix = installed()
+                if prefix is None:
+                    Events.emit('cache', cache='prefix', hit=False)
+                    prefix = install(
+                        source, home, components=components, jobs=jobs,
+                        header_only=header_only, build=build,
+                        profile=profile)
+        results['prefix'] = str(prefix)
+        cache().touch([prefix])
+        collect()
+    return prefix, source
+
+
+async def aresolve(version=None, components=None, jobs=None,
+                   header_only=False, profile=None):
+    """
+    Asynchronous :func:`.resolve` for provisioning several Boost versions.
+
+    Runs in the :func:`Boost.Async.io_executor`, so that metadata lookups,
+    downloads and extraction of different versions overlap, while builds go
+    through the bounded :func:`Boost.Async.build_executor`::
+
+       results = await asyncio.gather(*(
+           Boost.aresolve(version) for version in ['1.65.1', '1.66.0']))
+    """
+    return await Async.io(
+        resolve, version, components=components, jobs=jobs,
+        header_only=header_only, build=Async.build_blocking,
+        profile=profile)
+
+
+def select_version(version=None, components=None, header_only=False,
+                   profile=None):
+    """
+    Select exact Boost version to :func:`.resolve` for a request.
+
+    Exact versions are returned as is. For PEP 440 specifiers, the version
+    of a :func:`Boost.Discovery.discover`-ed installation is preferred, if
+    the default `profile` is requested, then the latest version with an
+    installed prefix in :const:`.CAREFREE_BOOST_HOME` providing
+    `components`, and only then the latest matching release. So new Boost
+    releases don't lead to rebuilding, as long as an installed version
+    satisfies the specifier
+
+    :return:
+       A ``packaging.version.Version``, or ``None`` for the latest release
+       if `version` is ``None``
+    """
+    version = parse_version(version)
+    if not isinstance(version, SpecifierSet):
+        return version
+
+    profile = parse_profile(profile)
+    if profile.default and Config.DISCOVERY:
+        installation = Discovery.discover(
+            version, components=components, header_only=header_only)
+        if installation is not None:
+            return installation.version
+
+    versions = [
+        prefix.version for home in sorted(CAREFREE_BOOST_HOME.dirs())
+        if not home.basename().startswith('.')
+        for prefix in Prefix.installed(
+            home, TOOLSET, header_only=header_only, profile=profile)
+        if prefix.version is not None and prefix.version in version
+        and prefix.provides(components, header_only=header_only)]
+    if versions:
+        return max(versions)
+
+    return Source.latest_version(version)
+
+
+def resolve_matrix(specs, jobs=None):
+    """
+    Run :func:`.resolve` for several combinations of Boost installations.
+
+    Requests of the same version are resolved one after another, so they
+    share one download, extracted source tree and bootstrapped ``b2``.
+    Different versions are resolved concurrently. Their builds share a
+    global budget of `jobs` via :class:`Boost.Matrix.Scheduler`, which
+    splits ``-j`` evenly among the versions still building::
+
+       prefixes = Boost.resolve_matrix([
+           '1.65.1',
+           {'version': '1.66.0', 'components': ['system']},
+           {'version': '1.66.0', 'profile': {'link': 'static'}},
+       ])
+
+    :param specs:
+       Sequence of anything accepted by :func:`Boost.Matrix.parse_spec`
+    :param jobs:
+       Budget of parallel ``b2`` jobs. Defaults to
+       :func:`Boost.Resources.jobs`, limited by CPUs and available memory
+    :return:
+       ``dict`` of :class:`Boost.Matrix.Spec` and resolved prefix path
+    """
+    specs = list(OrderedDict.fromkeys(map(Matrix.parse_spec, specs)))
+    groups = OrderedDict()
+    for spec in specs:
+        version = select_version(
+            spec.version, components=spec.components,
+            header_only=spec.header_only, profile=spec.profile)
+        version = Source(version, rootpath=CAREFREE_BOOST_CACHE).version
+        groups.setdefault(version, []).append(spec)
+    scheduler = Matrix.Scheduler(jobs, groups=len(groups))
+
+    def resolve_group(version, specs):
+        try:
+            return [(spec, resolve(
+                version, components=spec.components, jobs=scheduler.share,
+                header_only=spec.header_only, build=scheduler,
+                profile=spec.profile)[0]) for spec in specs]
+
+        finally:
+            scheduler.done()
+
+    with Events.phase('matrix', specs=len(specs), versions=len(groups),
+                      jobs=scheduler.jobs):
+        with ThreadPoolExecutor(max_workers=max(1, len(groups))) as executor:
+            futures = [executor.submit(resolve_group, version, group)
+                       for version, group in groups.items()]
+        prefixes = OrderedDict()
+        errors = []
+        for version, future in zip(groups, futures):
+            try:
+                prefixes.update(future.result())
+            except Exception as exc:
+                errors.append("{}: {}".format(version, exc))
+        if errors:
+            raise RuntimeError("Failed to resolve Boost {}".format(
+                "; ".join(errors)))
+
+    return prefixes
+
+
+def install(source, home, components=None, jobs=None, header_only=False,
+            build=None, profile=None):
+    """
+    Install Boost from `source` to a new prefix in `home` directory.
+
+    Must be called while holding the :func:`.lock` of `source`. See
+    :func:`.resolve` for all steps and arguments
+
+    :return: The published prefix path, protected from eviction
+    """
+    profile = parse_profile(profile)
+    prefix = Prefix(home / Prefix.name(
+        TOOLSET, components, header_only=header_only, profile=profile))
+    # symlinks into the source tree would dangle after evicting it
+    if header_only and Config.HEADERS_LINK not in ('copy', 'hardlink'):
+        raise ValueError(
+            "Invalid header installation link mode {!r} for {!r}. Only "
+            "'copy' or 'hardlink'".format(Config.HEADERS_LINK, prefix))
+
+    # leftovers of crashed processes, but not of running ones
+    cache().clean()
+    temp = Prefix(home / '.{}.tmp-{}'.format(prefix.basename(), os.getpid()))
+
+    # CPU-specific builds are not shared
+    store = None if header_only or not profile.portable \
+        else Artifact.store()
+    if store is not None:
+        parameters = Artifact.parameters(
+            source.version, components, **profile.parameters())
+    try:
+        if store is None or not fetch(store, parameters, temp):
+            prepare(source)
+            if header_only:
+                source.install(prefix=temp.makedirs_p(), header_only=True,
+                               link=Config.HEADERS_LINK)
+            else:
+                if not source.built(components, profile=profile):
+                    if build is None:
+                        source.build(components=components, jobs=jobs,
+                                     profile=profile)
+                    else:
+                        build(source.build, components=components,
+                              jobs=jobs, profile=profile)
+                source.install(prefix=temp.makedirs_p(),
+                               components=components, jobs=jobs,
+                               profile=profile)
+                if store is not None and store.push:
+                    store.publish(parameters, temp)
+            cache().touch([source.archive, source.path], changed=True)
+    except BaseException:
+        temp.rmtree_p()
+        raise
+
+    if Config.DEDUPE:
+        with Events.phase('dedupe', "Deduplicating {!r}".format(temp),
+                          prefix=str(prefix)) as results:
+            results.update(objects().dedupe(temp))
+    Events.emit('publish', "Publishing {!r}".format(prefix),
+                prefix=str(prefix))
+    os.rename(temp, prefix)
+    cache().hold(prefix)
+    return prefix
+
+
+def fetch(store, parameters, prefix):
+    """
+    Import prebuilt Boost artifact from `store` into `prefix` directory.
+
+    Any failure is reported and just leads to building from source
+
+    :return: ``False`` if no usable artifact was found
+    """
+    try:
+        return store.fetch(parameters, prefix)
+    except Exception as exc:
+        Events.emit('artifact.error', "Failed to fetch Boost artifact from "
+                    "{!r}: {}".format(store.location, exc),
+                    location=store.location, error=repr(exc))
+        prefix.rmtree_p()
+        return False
+
+
+def prepare(source):
+    """
+    Make sure that `source` is downloaded and completely extracted.
+
+    Keeps an already :attr:`Boost.Source.extracted` source tree, including
+    its state of completed build phases and ``b2``'s ``bin.v2/`` tree of
+    built objects, so that builds can continue where they stopped.
+    Incompletely extracted trees are removed. Interrupted downloads are
+    resumed, only fetching the missing byte ranges
+    """
+    if source.extracted:
+        Events.emit('source', "Using extracted {!r}".format(source.path),
+                    path=str(source.path), extracted=True)
+        return
+
+    if source.path.exists():
+        Events.emit('remove', "Removing incomplete {!r}".format(
+            source.path), path=str(source.path))
+        source.path.rmtree()
+    if source.archive.exists() and not source.verify_archive():
+        Events.emit('remove', "Removing corrupted {!r}".format(
+            source.archive), path=str(source.archive))
+        source.archive.remove()
+    if source.archive.exists():
+        Events.emit('source', "Using cached {!r}".format(source.archive),
+                    path=str(source.archive), extracted=False)
+    else:
+        # ranged and resumable after interruptions, unlike streaming the
+        # download into the extraction
+        source.download()
+    source.extract()
+
+
+def lock(source):
+    """
+    Get cross-process :class:`Boost.Lock.Lock` for building `source`.
+
+    Lock files are specific to Boost version and :const:`Boost.TOOLSET`
+    and are stored in ``.locks/`` of :const:`.CAREFREE_BOOST_HOME`
+    """
+    return cache().build_lock(source.boost_lib_version)
+
+
+def cache():
+    """
+    Get :class:`Boost.Cache.Cache` of :const:`.CAREFREE_BOOST_HOME`.
+    """
+    return Cache(CAREFREE_BOOST_HOME, CAREFREE_BOOST_CACHE)
+
+
+def collect(budget=None):
+    """
+    Evict least recently used sources and prefixes exceeding `budget`.
+
+    See :meth:`Boost.Cache.Cache.collect`. Also prunes objects of evicted
+    prefixes from :func:`.objects`
+
+    :return: ``list`` of evicted paths
+    """
+    evicted = cache().collect(budget)
+    if any(isinstance(path, Prefix) for path in evicted):
+        count = objects().prune()
+        Events.emit('prune', "Removed {} unused objects".format(count),
+                    count=count)
+    return evicted
+
+
+def objects():
+    """
+    Get :class:`Boost.ObjectStore.ObjectStore` for deduplicating prefixes.
+
+    Located in ``.objects/`` of :const:`.CAREFREE_BOOST_HOME`, so that
+    hardlinks to it don't cross file systems
+    """
+    return ObjectStore(CAREFREE_BOOST_HOME / '.objects')
+
+
+def prefixes():
+    """
+    Get all installation prefixes in :const:`.CAREFREE_BOOST_HOME`.
+
+    Of all Boost versions and toolsets
+    """
+    return [Prefix(path)
+            for home in sorted(CAREFREE_BOOST_HOME.dirs())
+            if not home.basename().startswith('.')
+            for path in sorted(home.dirs())
+            if not path.basename().startswith('.')]
+
+
+#: Names of module attributes, which are lazily determined via :func:`.resolve`
+#: on first access and then memoized in the module namespace
+RESOLVED = ('PREFIX', 'SOURCE', 'INCLUDE', 'LIB')
+
+
+def _resolved(profile=None):
+    """
+    Run :func:`.resolve` with defaults and determine all :const:`.RESOLVED`.
+
+    The version comes from :const:`Boost.Config.VERSION`. Optionally with a
+    different build `profile` than :const:`Boost.Config.PROFILE`
+
+    :return: ``dict`` of attribute names and values
+    """
+    prefix, source = resolve(Config.VERSION, header_only=Config.HEADER_ONLY,
+                             profile=profile)
+
+    include = [prefix.include]
+    assert include[0].isdir(), (
+        "Corrupted Boost installation! Missing directory {!r}. "
+        "Please remove {!r}".format(include[0], prefix))
+
+    boost_include = include[0] / 'boost-' + source.boost_lib_version
+    if boost_include.isdir():
+        include.append(boost_include)
+
+    if prefix.header_only:
+        lib = Lib([], header_only=True)
+    else:
+        lib = Lib(prefix.lib)
+        assert lib[0].isdir(), (
+            "Corrupted Boost installation! Missing directory {!r}. "
+            "Please remove {!r}".format(lib[0], prefix))
+
+    return {
+        'PREFIX': prefix,
+        'SOURCE': source,
+        'INCLUDE': include,
+        'LIB': lib,
+    }
+
+
+def __getattr__(name):
+    """
+    Resolve Boost installation on first access of any :const:`.RESOLVED`.
+
+    Keeps ``import Boost`` cheap. The resolved values are memoized as module
+    globals, so further access doesn't go through this hook again
+    """
+    if name in RESOLVED:
+        globals().update(_resolved())
+        return globals()[name]
+
+    raise AttributeError("module {!r} has no attribute {!r}"
+                         .format(__name__, name))
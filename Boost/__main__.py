@@ -0,0 +1,93 @@
+# C++Boost as a Python package
+#
+# Copyright (C) 2017 Stefan Zimmermann <user@zimmermann.co>
+#
+# This is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Maintenance commands for Boost installations.
+
+Run ``python -m Boost --help`` for usage
+"""
+
+import argparse
+import sys
+
+from path import Path
+
+import Boost
+from Boost import Config
+
+
+def dedupe(args):
+    """
+    Deduplicate installed prefixes and prune unused objects.
+    """
+    store = Boost.objects()
+    total = {'files': 0, 'bytes': 0}
+    for prefix in args.prefixes or Boost.prefixes():
+        stats = store.dedupe(prefix)
+        print("Deduplicated {files} files ({bytes} bytes) in {prefix!r}"
+              .format(prefix=Path(prefix), **stats))
+        for key in total:
+            total[key] += stats[key]
+    print("Removed {} unused objects from {!r}"
+          .format(store.prune(), store.path))
+    print("Deduplicated {files} files ({bytes} bytes) in total"
+          .format(**total))
+    return 0
+
+
+def gc(args):
+    """
+    Evict least recently used sources and prefixes exceeding a budget.
+    """
+    budget = args.budget and Config.parse_size(args.budget)
+    evicted = Boost.collect(budget)
+    print("Evicted {} sources and prefixes".format(len(evicted)))
+    return 0
+
+
+def parser():
+    """
+    Create ``argparse.ArgumentParser`` for all commands.
+    """
+    parser = argparse.ArgumentParser(
+        prog='python -m Boost', description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest='command', metavar='COMMAND')
+    commands.required = True
+
+    command = commands.add_parser('dedupe', help=dedupe.__doc__.strip())
+    command.add_argument(
+        'prefixes', nargs='*', metavar='PREFIX', help=(
+            "Installation prefixes. Defaults to all in {}"
+            .format(Boost.CAREFREE_BOOST_HOME)))
+    command.set_defaults(run=dedupe)
+
+    command = commands.add_parser('gc', help=gc.__doc__.strip())
+    command.add_argument(
+        '--budget', metavar='SIZE', help=(
+            "Maximum total size like '20G'. Defaults to "
+            "CAREFREE_BOOST_CACHE_BUDGET"))
+    command.set_defaults(run=gc)
+    return parser
+
+
+def main(argv=None):
+    args = parser().parse_args(argv)
+    return args.run(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
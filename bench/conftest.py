@@ -0,0 +1,194 @@
+"""
+Offline benchmark suite of the Boost package.
+
+Run with ``py.test bench``. Measured timings are compared against
+``baselines.json``, and runs fail if any benchmark gets slower than its
+baseline times ``--bench-tolerance``. Baselines are stored relative to the
+:func:`.calibrate` timing of the measuring machine, so they carry over to
+faster or slower ones. Run with ``--bench-update`` to store new baselines,
+like after intended changes
+"""
+
+import json
+import os
+import timeit
+
+from path import Path
+import pytest
+
+
+BENCH = Path(__file__).realpath().dirname()
+
+FIXTURES = BENCH / 'fixtures'
+
+BASELINES = BENCH / 'baselines.json'
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('bench')
+    group.addoption(
+        '--bench-update', action='store_true',
+        help="Store measured timings as new baselines")
+    group.addoption(
+        '--bench-tolerance', type=float,
+        default=float(os.environ.get('BENCH_TOLERANCE') or 3),
+        help="Factor of baseline timings, which fails benchmarks if "
+        "exceeded (default: $BENCH_TOLERANCE or 3)")
+
+
+def calibrate(repeat=5):
+    """
+    Time a fixed pure Python workload as unit of machine speed.
+
+    :return: Best time of `repeat` rounds in seconds
+    """
+    timings = []
+    for _ in range(repeat):
+        start = timeit.default_timer()
+        sorted(str(number) for number in range(100000))
+        timings.append(timeit.default_timer() - start)
+    return min(timings)
+
+
+def pytest_configure(config):
+    try:
+        config.bench_baselines = json.loads(BASELINES.text())
+    except (IOError, OSError):
+        config.bench_baselines = {}
+    config.bench_results = {}
+    config.bench_unit = calibrate()
+
+
+def pytest_sessionfinish(session):
+    config = session.config
+    if config.getoption('--bench-update') and config.bench_results:
+        baselines = dict(config.bench_baselines)
+        baselines.update((name, round(seconds / config.bench_unit, 4))
+                         for name, seconds in config.bench_results.items())
+        BASELINES.write_text(json.dumps(
+            baselines, indent=2, sort_keys=True) + '\n')
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    if not config.bench_results:
+        return
+
+    terminalreporter.section('benchmarks')
+    for name, seconds in sorted(config.bench_results.items()):
+        baseline = config.bench_baselines.get(name)
+        terminalreporter.write_line('{:<40} {:>12.6f}s {}'.format(
+            name, seconds, baseline and '({:.2f}x baseline)'.format(
+                seconds / config.bench_unit / baseline) or '(no baseline)'))
+
+
+class Benchmark(object):
+    """
+    Timer of a single benchmark, comparing against its baseline.
+    """
+
+    def __init__(self, name, config):
+        self.name = name
+        self.config = config
+
+    def __call__(self, func, number=1, repeat=5, setup=None):
+        """
+        Time `func` and check the best of `repeat` rounds.
+
+        :param number: Calls of `func` per round
+        :param setup: Optional function called before each round
+        :return: Best time per `func` call in seconds
+        """
+        timings = []
+        for _ in range(repeat):
+            if setup is not None:
+                setup()
+            start = timeit.default_timer()
+            for _ in range(number):
+                func()
+            timings.append((timeit.default_timer() - start) / number)
+        return self.check(min(timings))
+
+    def check(self, seconds):
+        """
+        Record `seconds` and fail if exceeding the tolerated baseline.
+        """
+        self.config.bench_results[self.name] = seconds
+        baseline = self.config.bench_baselines.get(self.name)
+        tolerance = self.config.getoption('--bench-tolerance')
+        if not self.config.getoption('--bench-update') and baseline \
+                and seconds > baseline * self.config.bench_unit * tolerance:
+            pytest.fail("Benchmark {} regressed: {:.6f}s > {:.6f}s baseline "
+                        "* {} tolerance".format(
+                            self.name, seconds,
+                            baseline * self.config.bench_unit, tolerance))
+        return seconds
+
+
+@pytest.fixture
+def benchmark(request):
+    """
+    :class:`.Benchmark` named after the requesting test.
+    """
+    name = request.node.name
+    if name.startswith('test_'):
+        name = name[len('test_'):]
+    return Benchmark(name, request.config)
+
+
+@pytest.fixture
+def http_root(http_root):
+    """
+    Root of :func:`.http_server` with copy of recorded boost.org pages.
+    """
+    (FIXTURES / 'users').copytree(http_root / 'users')
+    return http_root
+
+
+@pytest.fixture
+def boost_archive_headers():
+    return 2000
+
+
+@pytest.fixture
+def boost_archive_payload():
+    return 8 * 1024 ** 2
+
+
+#: Boost libraries in synthetic lib directories
+LIBRARIES = (
+    'atomic', 'chrono', 'container', 'context', 'contract', 'coroutine',
+    'date_time', 'exception', 'fiber', 'filesystem', 'graph',
+    'graph_parallel', 'iostreams', 'locale', 'log', 'log_setup',
+    'math_c99', 'math_c99f', 'math_c99l', 'math_tr1', 'math_tr1f',
+    'math_tr1l', 'mpi', 'numpy', 'numpy3', 'prg_exec_monitor',
+    'program_options', 'python', 'python3', 'random', 'regex',
+    'serialization', 'signals', 'stacktrace_addr2line',
+    'stacktrace_backtrace', 'stacktrace_basic', 'stacktrace_noop', 'system',
+    'test_exec_monitor', 'thread', 'timer', 'type_erasure',
+    'unit_test_framework', 'wave', 'wserialization')
+
+
+@pytest.fixture(scope='session')
+def lib_path(tmpdir_factory):
+    """
+    Synthetic Boost lib directory with thousands of library files.
+    """
+    path = Path(str(tmpdir_factory.mktemp('lib')))
+    for version in ('1_64', '1_65_1', '1_66'):
+        for name in LIBRARIES:
+            for variant in ('', '-mt', '-mt-d', '-mt-s', '-mt-sd', '-gd',
+                            '-x64', '-mt-x64', '-mt-gd-x64'):
+                for ext in ('.so', '.so.{}'.format(version), '.a'):
+                    (path / 'libboost_{}{}-{}{}'.format(
+                        name, variant, version, ext)).touch()
+    for index in range(500):
+        (path / 'libother{}.so'.format(index)).touch()
+    return path
+
+
+@pytest.fixture(scope='session')
+def lib_names():
+    """
+    Short names of all Boost libraries in :func:`.lib_path`.
+    """
+    return LIBRARIES
@@ -0,0 +1,124 @@
+import os
+import subprocess
+import sys
+
+from furl import furl
+from packaging.version import Version
+from path import Path
+import pytest
+
+import Boost
+from Boost.Download import Download
+from Boost.Index import Index
+from Boost.Lib import Lib
+from Boost.Source import MIN_BOOST_VERSION, _release_urls
+
+
+IMPORT_SCRIPT = """\
+import timeit
+start = timeit.default_timer()
+import Boost
+print(timeit.default_timer() - start)
+"""
+
+
+@pytest.fixture(autouse=True)
+def quiet(mocker):
+    """
+    Keep progress events of benchmarked code from the terminal.
+    """
+    mocker.patch.object(Boost.Events, 'subscribers', [])
+
+
+@pytest.fixture
+def boost_url(mocker, http_server):
+    mocker.patch('Boost.Source.BOOST_URL', furl(str(http_server)))
+    return http_server
+
+
+def test_import(benchmark, tmpdir):
+    env = dict(os.environ, HOME=str(tmpdir))
+    env['PYTHONPATH'] = os.pathsep.join(
+        [str(Path(Boost.__file__).dirname().dirname())]
+        + [p for p in [os.environ.get('PYTHONPATH')] if p])
+    timings = [float(subprocess.check_output(
+        [sys.executable, '-c', IMPORT_SCRIPT], env=env).split()[-1])
+        for _ in range(5)]
+    benchmark.check(min(timings))
+
+
+def test_release_urls(benchmark, boost_url):
+    result = []
+    benchmark(lambda: result.append(_release_urls()))
+    assert min(result[0]) == MIN_BOOST_VERSION
+    assert result[0][Version('1.66.0')] == furl(
+        str(boost_url) + '/users/history/version_1_66_0.html')
+
+
+def test_release_urls_from_index(benchmark, tmpdir, boost_url):
+    path = Path(str(tmpdir)) / 'releases.json'
+    Index(path, offline=False).release_urls(_release_urls)
+    result = []
+    benchmark(lambda: result.append(Index(path).release_urls(None)),
+              number=10)
+    assert min(result[0]) == MIN_BOOST_VERSION
+
+
+def test_scrape_download_info(benchmark, mocker, boost_url):
+    mocker.patch.object(
+        type(Boost.Source), 'RELEASE_URLS', new_callable=mocker.PropertyMock,
+        return_value={Version('1.66.0'): furl(
+            str(boost_url) + '/users/history/version_1_66_0.html')})
+    source = Boost.Source('1.66.0', rootpath='.')
+    result = []
+    benchmark(lambda: result.append(source._scrape_download_info()))
+    assert str(result[0]['url']).endswith('/boost_1_66_0.tar.bz2')
+    assert len(result[0]['sha256']) == 64
+
+
+def test_lib_index(benchmark, lib_path):
+    benchmark(lambda: Lib([lib_path]).index)
+
+
+def test_lib_lookup(benchmark, lib_path, lib_names):
+    lib = Lib([lib_path])
+    assert lib['system'].startswith('boost_system-')
+
+    def lookup():
+        for name in lib_names:
+            lib[name]
+
+    benchmark(lookup, number=100)
+
+
+def test_download(benchmark, tmpdir, http_server, boost_archive,
+                  boost_archive_sha256):
+    path = Path(str(tmpdir)) / boost_archive.name
+    sha256 = boost_archive_sha256
+    url = str(http_server) + '/' + boost_archive.name
+    benchmark(lambda: Download(url, path, sha256=sha256,
+                               chunk_size=1024 ** 2).run(),
+              setup=path.remove_p)
+
+
+def test_download_extract(benchmark, boost_archive_source):
+    benchmark(lambda: boost_archive_source.download(extract=True),
+              setup=boost_archive_source.path.rmtree_p, repeat=3)
+    assert boost_archive_source.extracted
+
+
+def test_extract(benchmark, boost_archive_source):
+    boost_archive_source.download()
+    benchmark(boost_archive_source.extract,
+              setup=boost_archive_source.path.rmtree_p, repeat=3)
+    assert boost_archive_source.extracted
+
+
+def test_cons_environment(benchmark, mocker, tmpdir):
+    pytest.importorskip('zcons')
+    from Boost.Cons import Environment
+
+    # bypass lazy resolving of installation in module __getattr__
+    mocker.patch.dict(Boost.__dict__, {
+        'INCLUDE': [str(tmpdir)], 'LIB': Lib([str(tmpdir)])})
+    benchmark(Environment)
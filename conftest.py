@@ -0,0 +1,198 @@
+"""
+Fixtures shared by the ``test`` and ``bench`` suites of the Boost package.
+
+The suites adapt them by overriding fixtures like :func:`.http_root` or
+:func:`.boost_archive_headers` in their own ``conftest.py``
+"""
+
+from functools import partial
+import hashlib
+import re
+import tarfile
+import threading
+
+from furl import furl
+from path import Path
+from six.moves.BaseHTTPServer import HTTPServer
+from six.moves.SimpleHTTPServer import SimpleHTTPRequestHandler
+from six.moves.socketserver import ThreadingMixIn
+import pytest
+
+import Boost
+
+
+class HTTPRequestHandler(SimpleHTTPRequestHandler):
+    """
+    Quiet file server handler for local stand-in HTTP servers.
+
+    Supports single ``Range`` requests and uploads via ``PUT``, and logs all
+    requests to ``server.log``. Fails requests for byte range starts listed in
+    ``server.failing_ranges``
+    """
+
+    def log_message(self, *args):
+        pass
+
+    def end_headers(self):
+        if self.server.ranges:
+            self.send_header('Accept-Ranges', 'bytes')
+        SimpleHTTPRequestHandler.end_headers(self)
+
+    def do_HEAD(self):
+        self.server.log.append((self.command, self.path, None))
+        SimpleHTTPRequestHandler.do_HEAD(self)
+
+    def do_GET(self):
+        range_header = self.headers.get('Range')
+        self.server.log.append((self.command, self.path, range_header))
+        if not range_header or not self.server.ranges:
+            return SimpleHTTPRequestHandler.do_GET(self)
+
+        start, end = re.match(r'^bytes=(\d+)-(\d*)$', range_header).groups()
+        start = int(start)
+        if start in self.server.failing_ranges:
+            return self.send_error(503)
+
+        data = Path(self.translate_path(self.path)).bytes()
+        end = min(int(end or len(data) - 1), len(data) - 1)
+        self.send_response(206)
+        self.send_header('Content-Range', 'bytes {}-{}/{}'.format(
+            start, end, len(data)))
+        self.send_header('Content-Length', str(end - start + 1))
+        self.end_headers()
+        self.wfile.write(data[start:end + 1])
+
+    def do_PUT(self):
+        self.server.log.append((self.command, self.path, None))
+        path = Path(self.translate_path(self.path))
+        path.dirname().makedirs_p()
+        path.write_bytes(self.rfile.read(int(self.headers['Content-Length'])))
+        self.send_response(201)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+
+class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+    def __init__(self, *args, **kwargs):
+        HTTPServer.__init__(self, *args, **kwargs)
+        self.ranges = True
+        self.failing_ranges = set()
+        self.log = []
+
+
+@pytest.fixture
+def http_root(tmpdir):
+    return Path(str(tmpdir.mkdir('http')))
+
+
+@pytest.fixture
+def http_server(http_root):
+    """
+    Local stand-in HTTP server for files in `http_root`.
+
+    :return: Base URL of server
+    """
+    server = ThreadingHTTPServer(
+        ('127.0.0.1', 0), partial(HTTPRequestHandler, directory=http_root))
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    url = furl('http://127.0.0.1:{}'.format(server.server_port))
+    url.server = server
+    yield url
+    server.shutdown()
+    server.server_close()
+
+
+FAKE_BOOTSTRAP = """\
+cat > b2 << 'EOF'
+#!/bin/sh
+echo "$@" >> b2.log
+for arg in "$@"; do
+    case "$arg" in
+        --prefix=*)
+            prefix="${arg#--prefix=}"
+            mkdir -p "$prefix/include" "$prefix/lib"
+            cp -R boost "$prefix/include/"
+            touch "$prefix/lib/libboost_system.so.1.66.0"
+            ;;
+    esac
+done
+EOF
+chmod +x b2
+"""
+
+
+@pytest.fixture
+def boost_archive_headers():
+    """
+    Number of additional small headers in :func:`.boost_archive`.
+    """
+    return 0
+
+
+@pytest.fixture
+def boost_archive_payload():
+    """
+    Size in bytes of incompressible payload in :func:`.boost_archive`.
+    """
+    return 2 ** 20
+
+
+@pytest.fixture
+def boost_archive(tmpdir, http_root, boost_archive_headers,
+                  boost_archive_payload):
+    """
+    Synthetic ``boost_1_66_0.tar.bz2`` source archive in `http_root`.
+    """
+    source = Path(str(tmpdir.mkdir('boost_1_66_0')))
+    (source / 'boost').makedirs()
+    for index in range(boost_archive_headers):
+        header = source / 'boost' / 'lib{}'.format(index // 100) \
+            / 'header{}.hpp'.format(index)
+        header.dirname().makedirs_p()
+        header.write_text('#define BOOST_HEADER_{} {}\n'.format(
+            index, '0' * 1000))
+    (source / 'boost' / 'version.hpp').write_text(
+        '#define BOOST_VERSION 106600\n'
+        '#define BOOST_LIB_VERSION "1_66"\n')
+    engine = (source / 'tools' / 'build' / 'src' / 'engine').makedirs()
+    (engine / 'patchlevel.h').write_text(
+        '#define VERSION_MAJOR 2015\n'
+        '#define VERSION_MINOR 07\n')
+    (engine / 'jam.c').write_text('int main() { return 0; }\n')
+    (source / 'bootstrap.bat').write_text('echo bootstrap\n')
+    # creates a fake b2, which logs its arguments and installs headers and a
+    # dummy library on install
+    (source / 'bootstrap.sh').write_text(FAKE_BOOTSTRAP)
+    (source / 'payload.bin').write_bytes(
+        b''.join(hashlib.sha256(str(i).encode()).digest()
+                 for i in range(boost_archive_payload // 32)))
+
+    archive = http_root / 'boost_1_66_0.tar.bz2'
+    with tarfile.open(archive, 'w:bz2') as tar:
+        tar.add(source, arcname='boost_1_66_0')
+    return archive
+
+
+@pytest.fixture
+def boost_archive_sha256(boost_archive):
+    """
+    SHA256 hex digest of :func:`.boost_archive`.
+    """
+    return hashlib.sha256(boost_archive.bytes()).hexdigest()
+
+
+@pytest.fixture
+def boost_archive_source(tmpdir, mocker, http_server, boost_archive,
+                         boost_archive_sha256):
+    """
+    :class:`Boost.Source` for synthetic `boost_archive` from `http_server`.
+    """
+    mocker.patch.object(
+        Boost.Source, '_download_info', new_callable=mocker.PropertyMock,
+        return_value={'url': str(http_server) + '/' + boost_archive.name,
+                      'sha256': boost_archive_sha256})
+    return Boost.Source('1.66.0', rootpath=str(tmpdir.mkdir('cache')))
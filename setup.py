@@ -16,6 +16,9 @@ setup(
 
     license='LGPLv3',
 
+    # module __getattr__ (PEP 562) and asyncio.get_running_loop()
+    python_requires='>=3.7',
+
     setup_requires=open(os.path.join(ROOT, 'requirements.setup.txt')).read(),
     install_requires=open(os.path.join(ROOT, 'requirements.txt')).read(),
 
@@ -34,13 +37,13 @@ setup(
         ' :: GNU Library or Lesser General Public License (LGPL)',
         'Operating System :: OS Independent',
         'Programming Language :: Python',
-        'Programming Language :: Python :: 2',
-        'Programming Language :: Python :: 2.7',
         'Programming Language :: Python :: 3',
-        'Programming Language :: Python :: 3.3',
-        'Programming Language :: Python :: 3.4',
-        'Programming Language :: Python :: 3.5',
-        'Programming Language :: Python :: 3.6',
+        'Programming Language :: Python :: 3 :: Only',
+        'Programming Language :: Python :: 3.7',
+        'Programming Language :: Python :: 3.8',
+        'Programming Language :: Python :: 3.9',
+        'Programming Language :: Python :: 3.10',
+        'Programming Language :: Python :: 3.11',
         'Topic :: Software Development',
         'Topic :: Utilities',
     ],
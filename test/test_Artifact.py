@@ -0,0 +1,121 @@
+import json
+
+from path import Path
+import pytest
+
+import Boost
+from Boost import Artifact, Config
+from Boost.Artifact import Store
+from Boost.Prefix import Prefix
+
+
+@pytest.fixture
+def prefix(tmpdir):
+    prefix = Prefix(Path(str(tmpdir)) / 'prefix')
+    (prefix / 'include' / 'boost').makedirs()
+    (prefix / 'include' / 'boost' / 'version.hpp').write_text(
+        '#define BOOST_VERSION 106600\n')
+    (prefix / 'lib').makedirs()
+    (prefix / 'lib' / 'libboost_system.so.1.66.0').write_bytes(b'\0' * 1024)
+    Path('libboost_system.so.1.66.0').symlink(
+        prefix / 'lib' / 'libboost_system.so')
+    prefix.write_info(version='1.66.0', toolset='gcc',
+                      components=['system'])
+    return prefix
+
+
+def assert_same_prefix(prefix, other):
+    assert sorted(prefix.relpathto(path) for path in prefix.walk()) == \
+        sorted(other.relpathto(path) for path in other.walk())
+    assert (other / 'lib' / 'libboost_system.so').islink()
+    assert (other / 'lib' / 'libboost_system.so').bytes() == b'\0' * 1024
+    assert Prefix(other).components == ('system', )
+
+
+def test_key():
+    parameters = Artifact.parameters('1.66.0', ['system'])
+    assert parameters['components'] == ('system', )
+    assert Artifact.key(parameters) == Artifact.key(
+        Artifact.parameters('1.66.0', ['system']))
+    assert Artifact.key(parameters) != Artifact.key(
+        Artifact.parameters('1.66.0', ['filesystem']))
+    assert Artifact.key(parameters) != Artifact.key(
+        Artifact.parameters('1.66.0', ['system'], variant='debug'))
+
+
+def test_store(monkeypatch):
+    monkeypatch.setattr(Config, 'ARTIFACTS', None)
+    assert Artifact.store() is None
+    monkeypatch.setattr(Config, 'ARTIFACTS', 'http://localhost/artifacts')
+    monkeypatch.setattr(Config, 'ARTIFACTS_PUSH', True)
+    store = Artifact.store()
+    assert store.remote
+    assert store.push
+
+
+def test_local_store(prefix, tmpdir):
+    store = Store(Path(str(tmpdir)) / 'artifacts')
+    assert not store.remote
+    parameters = Artifact.parameters('1.66.0', ['system'])
+    target = Path(str(tmpdir)) / 'target'
+    assert not store.fetch(parameters, target)
+
+    sha256 = store.publish(parameters, prefix)
+    manifest = json.loads(
+        (Path(store.location) / Artifact.key(parameters) + '.json').text())
+    assert manifest['sha256'] == sha256
+    assert (Path(store.location) / sha256 + '.tar.gz').isfile()
+    assert store.fetch(parameters, target)
+    assert_same_prefix(prefix, target)
+
+
+def test_http_store(prefix, tmpdir, http_server, http_root):
+    store = Store(str(http_server) + '/artifacts')
+    assert store.remote
+    parameters = Artifact.parameters('1.66.0', ['system'])
+    target = Path(str(tmpdir)) / 'target'
+    assert not store.fetch(parameters, target)
+
+    sha256 = store.publish(parameters, prefix)
+    assert (http_root / 'artifacts' / sha256 + '.tar.gz').isfile()
+    assert store.fetch(parameters, target)
+    assert_same_prefix(prefix, target)
+
+
+def test_corrupted_artifact(prefix, tmpdir):
+    store = Store(Path(str(tmpdir)) / 'artifacts')
+    parameters = Artifact.parameters('1.66.0', ['system'])
+    sha256 = store.publish(parameters, prefix)
+    (Path(store.location) / sha256 + '.tar.gz').write_bytes(b'corrupted')
+    with pytest.raises(RuntimeError) as exc:
+        store.fetch(parameters, Path(str(tmpdir)) / 'target')
+    exc.match(r'SHA256 mismatch')
+
+
+def test_resolve_with_artifacts(boost_archive_source, carefree_boost_home,
+                                tmpdir, mocker):
+    mocker.patch('sysconfig.get_path', return_value='/include')
+    mocker.patch.object(Config, 'ARTIFACTS',
+                        str(Path(str(tmpdir)) / 'artifacts'))
+    mocker.patch.object(Config, 'ARTIFACTS_PUSH', True)
+    prefix, _ = Boost.resolve('1.66.0', components=['system'], jobs=1)
+    assert Path(Config.ARTIFACTS).files('*.tar.gz')
+
+    # fresh machine
+    prefix.rmtree()
+    Boost.CAREFREE_BOOST_CACHE.rmtree()
+    Boost.CAREFREE_BOOST_CACHE.makedirs()
+    download = mocker.spy(Boost.Source, 'download')
+    b2 = mocker.spy(Boost.Source, 'b2')
+    assert Boost.resolve('1.66.0', components=['system'], jobs=1)[0] == prefix
+    assert not download.called
+    assert not b2.called
+    assert (prefix / 'lib' / 'libboost_system.so.1.66.0').isfile()
+    assert prefix.components == ('system', )
+
+    # corrupted artifacts lead to building from source
+    prefix.rmtree()
+    for archive in Path(Config.ARTIFACTS).files('*.tar.gz'):
+        archive.write_bytes(b'corrupted')
+    assert Boost.resolve('1.66.0', components=['system'], jobs=1)[0] == prefix
+    assert b2.called
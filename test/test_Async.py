@@ -0,0 +1,53 @@
+import asyncio
+import threading
+
+from Boost import Async, Config
+
+
+def test_executors(mocker):
+    assert Async.io_executor() is Async.io_executor()
+    assert Async.io_executor()._max_workers == Async.IO_WORKERS
+    executor = Async.build_executor()
+    assert executor is Async.build_executor()
+    assert executor._max_workers == Config.PARALLEL_BUILDS
+
+    mocker.patch.object(Config, 'PARALLEL_BUILDS', 3)
+    assert Async.build_executor() is not executor
+    assert Async.build_executor()._max_workers == 3
+
+
+def test_io_and_build():
+    def thread(*args, **kwargs):
+        return threading.current_thread().name, args, kwargs
+
+    async def main():
+        return await asyncio.gather(
+            Async.io(thread, 1, key='io'), Async.build(thread, 2, key='build'))
+
+    (io, io_args, io_kwargs), (build, build_args, build_kwargs) = (
+        asyncio.run(main()))
+    assert io.startswith('Boost-io')
+    assert (io_args, io_kwargs) == ((1, ), {'key': 'io'})
+    assert build.startswith('Boost-build')
+    assert (build_args, build_kwargs) == ((2, ), {'key': 'build'})
+    assert Async.build_blocking(thread)[0].startswith('Boost-build')
+
+
+def test_build_bounded(mocker):
+    mocker.patch.object(Config, 'PARALLEL_BUILDS', 2)
+    lock = threading.Lock()
+    running = [0, 0]
+
+    def build():
+        with lock:
+            running[0] += 1
+            running[1] = max(running)
+        threading.Event().wait(0.05)
+        with lock:
+            running[0] -= 1
+
+    async def main():
+        await asyncio.gather(*(Async.build(build) for _ in range(6)))
+
+    asyncio.run(main())
+    assert running[1] == 2
@@ -0,0 +1,368 @@
+import asyncio
+import json
+import subprocess
+import sys
+import threading
+import time
+
+from packaging.specifiers import SpecifierSet
+from packaging.version import Version
+from path import Path
+import pytest
+
+from Boost.Download import CHUNK_SIZE
+from Boost.Prefix import Prefix
+import Boost
+
+
+def test_import_is_lazy():
+    code = ("import Boost; "
+            "assert not set(Boost.RESOLVED).intersection(vars(Boost))")
+    assert not subprocess.call([sys.executable, '-c', code])
+
+
+def test_RESOLVED():
+    prefix, source = Boost.resolve()
+    for name in Boost.RESOLVED:
+        value = getattr(Boost, name)
+        assert vars(Boost)[name] is value
+    assert Boost.PREFIX == prefix
+    assert Boost.SOURCE.version == source.version
+    assert Boost.INCLUDE[0] == prefix.include
+    assert Boost.LIB[0] == prefix.lib[0]
+
+
+def test_invalid_attribute():
+    with pytest.raises(AttributeError) as exc:
+        Boost.INVALID
+    exc.match(repr('INVALID'))
+
+
+def test_resolve_header_only(boost_archive_source, carefree_boost_home,
+                             mocker):
+    bootstrap = mocker.patch.object(Boost.Source, 'bootstrap')
+    b2 = mocker.patch.object(Boost.Source, 'b2')
+    prefix, source = Boost.resolve('1.66.0', header_only=True)
+    assert prefix == carefree_boost_home / '1_66_0' / 'headers'
+    assert isinstance(prefix, Prefix)
+    assert prefix.header_only
+    assert (prefix / 'include' / 'boost' / 'version.hpp').isfile()
+    assert not bootstrap.called
+    assert not b2.called
+
+    # already installed
+    mocker.patch.object(Boost.Source, 'download', side_effect=AssertionError)
+    assert Boost.resolve('1.66.0', header_only=True)[0] == prefix
+
+
+def test_resolve_header_only_symlink(boost_archive_source,
+                                     carefree_boost_home, mocker):
+    mocker.patch.object(Boost.Config, 'HEADERS_LINK', 'symlink')
+    with pytest.raises(ValueError) as exc:
+        Boost.resolve('1.66.0', header_only=True)
+    exc.match(r"'symlink'")
+    assert not boost_archive_source.archive.exists()
+
+
+def test_resolve_concurrently(boost_archive_source, carefree_boost_home,
+                              mocker):
+    install_headers = Boost.Source.install_headers
+
+    def slow_install_headers(self, prefix, *args, **kwargs):
+        time.sleep(0.5)
+        # never published to final prefix directly
+        assert prefix.basename().startswith('.headers.tmp-')
+        return install_headers(self, prefix, *args, **kwargs)
+
+    download = mocker.spy(Boost.Source, 'download')
+    mocker.patch.object(Boost.Source, 'install_headers',
+                        slow_install_headers)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(
+        Boost.resolve('1.66.0', header_only=True)[0])) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert download.call_count == 1
+    assert results == [carefree_boost_home / '1_66_0' / 'headers'] * 3
+    assert not carefree_boost_home.joinpath('1_66_0').dirs('.*')
+
+
+def test_resolve_removes_leftovers(boost_archive_source,
+                                   carefree_boost_home):
+    home = carefree_boost_home / '1_66_0'
+    crashed = subprocess.Popen([sys.executable, '-c', ''])
+    crashed.wait()
+    running = subprocess.Popen(
+        [sys.executable, '-c', 'import time; time.sleep(60)'])
+    try:
+        leftover = (home / '.headers.tmp-{}'.format(crashed.pid)).makedirs()
+        busy = (home / '.gcc.tmp-{}'.format(running.pid)).makedirs()
+        Boost.resolve('1.66.0', header_only=True)
+        assert not leftover.exists()
+        assert busy.isdir()
+    finally:
+        running.kill()
+        running.wait()
+
+
+def test_resolve_failure(boost_archive_source, carefree_boost_home, mocker):
+    mocker.patch.object(Boost.Source, 'install_headers',
+                        side_effect=RuntimeError('failure'))
+    with pytest.raises(RuntimeError):
+        Boost.resolve('1.66.0', header_only=True)
+    assert not carefree_boost_home.joinpath('1_66_0').dirs()
+
+
+@pytest.mark.parametrize('boost_archive_payload', [9 * 1024 ** 2])
+def test_resolve_resumes_download(boost_archive_source, carefree_boost_home,
+                                  http_server, mocker):
+    mocker.patch.object(Boost.Config, 'HTTP_BACKOFF', 0)
+    server = http_server.server
+    server.failing_ranges.add(CHUNK_SIZE)
+    with pytest.raises(Exception):
+        Boost.resolve('1.66.0', header_only=True)
+    state = Boost.CAREFREE_BOOST_CACHE / 'boost_1_66_0.tar.bz2.part.json'
+    done = json.loads(state.text())['done']
+    assert 0 in done
+    assert CHUNK_SIZE not in done
+
+    server.failing_ranges.clear()
+    del server.log[:]
+    prefix, _ = Boost.resolve('1.66.0', header_only=True)
+    assert (prefix / 'include' / 'boost' / 'version.hpp').isfile()
+    fetched = {int(entry[2].split('=')[1].split('-')[0])
+               for entry in server.log if entry[2]}
+    assert CHUNK_SIZE in fetched
+    assert not fetched & set(done)
+
+
+def test_resolve_incremental(boost_archive_source, carefree_boost_home,
+                             mocker):
+    mocker.patch('sysconfig.get_path', return_value='/include')
+    b2 = Boost.Source.b2
+    failing = [True]
+
+    def failing_b2(self, *args, **kwargs):
+        if failing[0]:
+            raise RuntimeError('b2 failure')
+
+        return b2(self, *args, **kwargs)
+
+    mocker.patch.object(Boost.Source, 'b2', failing_b2)
+    with pytest.raises(RuntimeError):
+        Boost.resolve('1.66.0', components=['system'], jobs=1)
+    source = Boost.Source('1.66.0', rootpath=Boost.CAREFREE_BOOST_CACHE)
+    assert source.extracted
+    assert source.bootstrapped
+    assert not source.built(['system'])
+
+    failing[0] = False
+    download = mocker.spy(Boost.Source, 'download')
+    extract = mocker.spy(Boost.Source, 'extract')
+    bootstrap = mocker.spy(Boost.Source, 'bootstrap')
+    prefix, _ = Boost.resolve('1.66.0', components=['system'], jobs=1)
+    assert prefix == carefree_boost_home / '1_66_0' / 'gcc+system'
+    assert prefix.components == ('system', )
+    assert (prefix / 'lib').files()
+    assert not download.called
+    assert not extract.called
+    assert not bootstrap.called
+    assert source.built(['system'])
+    log = (source.path / 'b2.log').lines(retain=False)
+    assert len(log) == 2
+    assert log[0].endswith('-j1 --with-system')
+    assert 'install' in log[1].split()
+
+
+def test_aresolve(boost_archive_source, carefree_boost_home, mocker):
+    mocker.patch('sysconfig.get_path', return_value='/include')
+    build = Boost.Source.build
+    threads = []
+
+    def recording_build(self, *args, **kwargs):
+        threads.append(threading.current_thread().name)
+        return build(self, *args, **kwargs)
+
+    mocker.patch.object(Boost.Source, 'build', recording_build)
+
+    async def main():
+        return await asyncio.gather(
+            Boost.aresolve('1.66.0', header_only=True),
+            Boost.aresolve('1.66.0', components=['system'], jobs=1))
+
+    (headers, _), (prefix, source) = asyncio.run(main())
+    assert prefix == carefree_boost_home / '1_66_0' / 'gcc+system'
+    # whichever finished first serves the headers
+    assert headers in (carefree_boost_home / '1_66_0' / 'headers', prefix)
+    assert (headers / 'include' / 'boost' / 'version.hpp').isfile()
+    assert (prefix / 'lib').files()
+    assert source.built(['system'])
+    assert len(threads) == 1
+    assert threads[0].startswith('Boost-build')
+
+
+def test_resolve_matrix(boost_archive_source, carefree_boost_home, mocker):
+    mocker.patch('sysconfig.get_path', return_value='/include')
+    download = mocker.spy(Boost.Source, 'download')
+    bootstrap = mocker.spy(Boost.Source, 'bootstrap')
+    system = {'version': '1.66.0', 'components': ['system']}
+    static = dict(system, profile={'link': 'static'})
+    prefixes = Boost.resolve_matrix(
+        [system, static, system, ('1.66.0', None, True)], jobs=3)
+    home = carefree_boost_home / '1_66_0'
+    assert prefixes == {
+        Boost.Matrix.parse_spec(system): home / 'gcc+system',
+        Boost.Matrix.parse_spec(static): home / 'gcc@release-static+system',
+        # any existing installation provides headers
+        Boost.Matrix.Spec('1.66.0', header_only=True): home / 'gcc+system',
+    }
+    assert download.call_count == 1
+    assert bootstrap.call_count == 1
+    assert prefixes[Boost.Matrix.parse_spec(static)].profile.link == 'static'
+
+    source = Boost.Source('1.66.0', rootpath=Boost.CAREFREE_BOOST_CACHE)
+    assert source.built(['system'])
+    assert source.built(['system'], profile={'link': 'static'})
+    assert not source.built(['system'], profile={'variant': 'debug'})
+    builds = [line.split() for line in (source.path / 'b2.log').lines(
+        retain=False) if 'install' not in line.split()]
+    assert len(builds) == 2
+    assert all('-j3' in args for args in builds)
+    assert 'link=shared' in builds[0]
+    assert 'link=static' in builds[1]
+
+
+def test_resolve_matrix_failure(boost_archive_source, carefree_boost_home,
+                                mocker):
+    mocker.patch.object(Boost.Source, 'install_headers',
+                        side_effect=RuntimeError('failure'))
+    with pytest.raises(RuntimeError) as exc:
+        Boost.resolve_matrix([{'version': '1.66.0', 'header_only': True}])
+    exc.match(r'1\.66\.0: failure')
+
+
+def test_resolve_profile(boost_archive_source, carefree_boost_home, mocker):
+    mocker.patch('sysconfig.get_path', return_value='/include')
+    store = mocker.patch.object(Boost.Artifact, 'store', return_value=None)
+    prefix, source = Boost.resolve(
+        '1.66.0', components=['system'], jobs=1,
+        profile='release-static-lto')
+    assert prefix == carefree_boost_home / '1_66_0' / (
+        'gcc@release-static-lto+system')
+    assert prefix.profile.name == 'release-static-lto'
+    assert store.called
+    log = (source.path / 'b2.log').lines(retain=False)
+    assert log[0].split()[-6:] == [
+        'link=static', 'cxxflags=-flto', 'cxxflags=-ffat-lto-objects',
+        'linkflags=-flto', '-j1', '--with-system']
+    assert source.built(['system'], profile='release-static-lto')
+    assert not source.built(['system'])
+
+    # CPU-specific builds don't go through artifact store
+    store.reset_mock()
+    native, _ = Boost.resolve('1.66.0', components=['system'], jobs=1,
+                              profile='release-native')
+    assert native == carefree_boost_home / '1_66_0' / (
+        'gcc@release-native+system')
+    assert not store.called
+    assert Boost.resolve('1.66.0', components=['system'],
+                         profile='release-static-lto')[0] == prefix
+
+
+def test_resolve_discovered(boost_archive_source, carefree_boost_home,
+                            tmpdir, mocker):
+    root = Path(str(tmpdir / 'root'))
+    (root / 'include').makedirs()
+    boost_archive_source.download(extract=True)
+    boost_archive_source.path.joinpath('boost').copytree(
+        root / 'include' / 'boost')
+    (root / 'lib').makedirs()
+    (root / 'lib' / 'libboost_system.so.1.66.0').write_text('')
+    mocker.patch.object(Boost.Config, 'DISCOVERY', ('root', ))
+    mocker.patch.object(Boost.Config, 'BOOST_ROOT', root)
+    download = mocker.spy(Boost.Source, 'download')
+
+    prefix, source = Boost.resolve('1.66.0', components=['system'])
+    assert isinstance(prefix, Boost.Discovery.Installation)
+    assert prefix == root
+    assert source.version == prefix.version
+    assert not download.called
+    assert not carefree_boost_home.joinpath('1_66_0').exists()
+
+    mocker.patch.object(Boost.Config, 'VERSION', '1.66.0')
+    mocker.patch.object(Boost.Config, 'HEADER_ONLY', True)
+    resolved = Boost._resolved()
+    assert resolved['PREFIX'] == root
+    assert resolved['INCLUDE'] == [root / 'include']
+
+    # only own installations for other build profiles
+    discover = mocker.spy(Boost.Discovery, 'discover')
+    prefix, _ = Boost.resolve('1.66.0', header_only=True, profile='debug')
+    assert prefix == carefree_boost_home / '1_66_0' / 'headers'
+    assert not discover.called
+
+
+def test_resolve_discovered_no_version(boost_archive_source,
+                                      carefree_boost_home, mocker):
+    mocker.patch.object(Boost.Config, 'DISCOVERY', ('system', ))
+    mocker.patch.object(type(Boost.Source), 'latest_version',
+                        return_value=Version('1.66.0'))
+    installation = mocker.Mock(version=Version('1.74.0'))
+    discover = mocker.patch.object(Boost.Discovery, 'discover',
+                                   return_value=installation)
+    # the latest release is requested, not any host Boost
+    prefix, _ = Boost.resolve(components=['system'], jobs=1)
+    assert prefix.dirname() == carefree_boost_home / '1_66_0'
+    assert not discover.called
+    Boost.resolve('1.74.0', components=['system'])
+    assert discover.call_args[0][0] == Version('1.74.0')
+    assert discover.call_args[1]['components'] == ['system']
+
+
+def test_resolve_specifier(boost_archive_source, carefree_boost_home,
+                           mocker):
+    mocker.patch.object(Boost.Config, 'DISCOVERY', ())
+    # a newer release than the installed one is available
+    mocker.patch.object(type(Boost.Source), 'latest_version',
+                        return_value=Version('1.67.0'))
+    headers, _ = Boost.resolve('1.66.0', header_only=True)
+    download = mocker.spy(Boost.Source, 'download')
+
+    prefix, source = Boost.resolve('>=1.60,<2', header_only=True)
+    assert prefix == headers
+    assert source.version == Version('1.66.0')
+    assert not download.called
+
+    # nothing installed with compiled components
+    assert Boost.select_version('>=1.60,<2', ['system']) == Version('1.67.0')
+    assert Boost.select_version('>=1.60,<2', header_only=True,
+                                profile='debug') == Version('1.66.0')
+    assert Boost.select_version('1.65.1') == Version('1.65.1')
+    assert Boost.select_version(None) is None
+
+
+def test_select_version_discovered(mocker):
+    mocker.patch.object(Boost.Config, 'DISCOVERY', ('system', ))
+    installation = mocker.Mock(version=Version('1.74.0'))
+    discover = mocker.patch.object(Boost.Discovery, 'discover',
+                                   return_value=installation)
+    assert Boost.select_version('>=1.70,<1.80', ['system']) == (
+        Version('1.74.0'))
+    assert discover.call_args[0][0] == SpecifierSet('>=1.70,<1.80')
+    discover.reset_mock()
+    mocker.patch.object(type(Boost.Source), 'latest_version',
+                        return_value=Version('1.79.0'))
+    assert Boost.select_version('>=1.70,<1.80', profile='debug') == (
+        Version('1.79.0'))
+    assert not discover.called
+
+
+def test_VERSION(mocker):
+    mocker.patch.object(Boost.Config, 'VERSION', '>=1.70')
+    resolve = mocker.patch.object(Boost, 'resolve',
+                                  side_effect=RuntimeError('resolve'))
+    with pytest.raises(RuntimeError):
+        Boost._resolved()
+    assert resolve.call_args[0] == ('>=1.70', )
@@ -0,0 +1,146 @@
+import os
+import subprocess
+import sys
+
+from path import Path
+import pytest
+
+import Boost
+from Boost import Config
+from Boost.Cache import _held, alive, size
+from Boost.__main__ import main
+
+
+@pytest.fixture
+def cache(carefree_boost_home):
+    cache = Boost.cache()
+    (cache.cache / 'boost_1_65_1.tar.bz2').write_bytes(b'\0' * 1000)
+    (cache.cache / 'boost_1_65_1').makedirs()
+    (cache.cache / 'boost_1_65_1' / 'bin.v2').write_bytes(b'\0' * 5000)
+    (cache.cache / 'releases.json').write_text('{}')
+    for version in ('1_65_1', '1_66_0'):
+        prefix = (carefree_boost_home / version / 'gcc').makedirs()
+        (prefix / 'lib').write_bytes(b'\0' * 2000)
+    return cache
+
+
+def use(cache, paths, now, mocker):
+    mocker.patch('time.time', return_value=now)
+    cache.touch(paths)
+    mocker.stopall()
+
+
+def test_size(tmpdir):
+    path = Path(str(tmpdir))
+    (path / 'file').write_bytes(b'\0' * 100)
+    os.link(path / 'file', path / 'link')
+    (path / 'sub').makedirs()
+    (path / 'sub' / 'other').write_bytes(b'\0' * 10)
+    assert size(path) == 110
+    assert size(path / 'file') == 100
+
+
+def test_entries(cache):
+    home = cache.home
+    assert [path for path, _ in cache.entries()] == [
+        cache.cache / 'boost_1_65_1',
+        cache.cache / 'boost_1_65_1.tar.bz2',
+        home / '1_65_1' / 'gcc',
+        home / '1_66_0' / 'gcc',
+    ]
+    assert cache.entries()[1][1].path == cache.build_lock('1_65_1').path
+
+
+def test_touch(cache, mocker):
+    prefix = cache.home / '1_66_0' / 'gcc'
+    use(cache, [prefix], 42, mocker)
+    assert cache.usage() == {'1_66_0/gcc': {'used': 42}}
+    cache.collect(budget=10 ** 9)
+    assert cache.usage()['1_66_0/gcc'] == {'used': 42, 'size': 2000}
+
+    source = cache.cache / 'boost_1_65_1'
+    cache.touch([source], changed=True)
+    assert 'size' not in cache.usage()['.cache/boost_1_65_1']
+    # determined by previous collect(), but outdated now
+    assert cache.collect(budget=10 ** 9) == []
+    assert cache.usage()['.cache/boost_1_65_1']['size'] == 5000
+
+
+def test_collect(cache, mocker):
+    home = cache.home
+    use(cache, [cache.cache / 'boost_1_65_1.tar.bz2'], 1, mocker)
+    use(cache, [home / '1_65_1' / 'gcc'], 2, mocker)
+    use(cache, [cache.cache / 'boost_1_65_1'], 3, mocker)
+    use(cache, [home / '1_66_0' / 'gcc'], 4, mocker)
+    assert cache.collect(budget=None) == []
+
+    mocker.patch.object(Config, 'CACHE_BUDGET', 7500)
+    assert cache.collect() == [
+        cache.cache / 'boost_1_65_1.tar.bz2', home / '1_65_1' / 'gcc']
+    assert not (home / '1_65_1' / 'gcc').exists()
+    assert not (home / '1_65_1').dirs()
+    assert (cache.cache / 'releases.json').isfile()
+    assert sorted(cache.usage()) == ['.cache/boost_1_65_1', '1_66_0/gcc']
+
+
+def test_collect_skips_held(cache, mocker):
+    home = cache.home
+    use(cache, [cache.cache / 'boost_1_65_1.tar.bz2'], 1, mocker)
+    use(cache, [home / '1_65_1' / 'gcc'], 2, mocker)
+    use(cache, [cache.cache / 'boost_1_65_1'], 3, mocker)
+    use(cache, [home / '1_66_0' / 'gcc'], 4, mocker)
+    # held by another process
+    with cache.prefix_lock(home / '1_65_1' / 'gcc', shared=True), \
+            cache.build_lock('1_65_1'):
+        assert cache.collect(budget=0) == [home / '1_66_0' / 'gcc']
+    assert (home / '1_65_1' / 'gcc').isdir()
+    assert (cache.cache / 'boost_1_65_1').isdir()
+
+
+def test_alive():
+    assert alive(os.getpid())
+    process = subprocess.Popen([sys.executable, '-c', ''])
+    process.wait()
+    assert not alive(process.pid)
+
+
+def test_collect_leftovers(cache, mocker):
+    process = subprocess.Popen([sys.executable, '-c', ''])
+    process.wait()
+    crashed = [
+        cache.cache / '.boost_1_65_1.tmp-{}'.format(process.pid),
+        cache.home / '1_66_0' / '.gcc.tmp-{}'.format(process.pid)]
+    running = [cache.home / '1_66_0' / '.gcc.tmp-{}'.format(os.getpid()),
+               cache.home / '1_66_0' / '.gcc.tmp-other']
+    for path in crashed + running:
+        (path / 'lib').makedirs()
+    assert cache.leftovers() == crashed
+    assert cache.collect(budget=None) == []
+    assert not any(path.exists() for path in crashed)
+    assert all(path.isdir() for path in running)
+    assert (cache.home / '1_66_0' / 'gcc').isdir()
+
+
+def test_hold(cache):
+    prefix = cache.home / '1_66_0' / 'gcc'
+    assert cache.hold(prefix)
+    assert prefix in _held
+    assert cache.collect(budget=0)
+    assert prefix.isdir()
+    assert not cache.hold(cache.home / '1_66_0' / 'missing')
+
+
+def test_resolve(boost_archive_source, carefree_boost_home, mocker):
+    mocker.patch('sysconfig.get_path', return_value='/include')
+    mocker.patch.object(Config, 'CACHE_BUDGET', 0)
+    prefix, source = Boost.resolve('1.66.0', components=['system'], jobs=1)
+    # only the held prefix remains
+    assert prefix.isdir()
+    assert not source.path.exists()
+    assert not source.archive.exists()
+    assert list(Boost.cache().usage()) == ['1_66_0/gcc+system']
+
+
+def test_main_gc(cache, capsys):
+    assert main(['gc', '--budget', '9K']) == 0
+    assert 'Evicted 1 sources and prefixes' in capsys.readouterr().out
@@ -0,0 +1,106 @@
+from path import Path
+import pytest
+
+from Boost import CompilerCache, Source
+
+
+FAKE_CCACHE = """\
+#!/bin/sh
+if [ "$1" = "--print-stats" ]; then
+    read hits < "$0.hits"
+    printf 'direct_cache_hit\\t%s\\n' "$hits"
+    printf 'preprocessed_cache_hit\\t1\\n'
+    printf 'cache_miss\\t3\\n'
+fi
+"""
+
+FAKE_SCCACHE = """\
+#!/bin/sh
+echo '{"stats": {"cache_hits": {"counts": {"C/C++": 5}},' \\
+     '"cache_misses": {"counts": {"C/C++": 2}}}}'
+"""
+
+
+@pytest.fixture
+def bin_path(tmpdir, monkeypatch):
+    path = Path(str(tmpdir)) / 'bin'
+    path.makedirs()
+    monkeypatch.setenv('PATH', str(path))
+    return path
+
+
+def fake(bin_path, name, script):
+    path = bin_path / name
+    path.write_text(script)
+    path.chmod(0o755)
+    return path.realpath()
+
+
+def test_find(bin_path):
+    assert CompilerCache.find('auto') is None
+    assert CompilerCache.find('off') is None
+    with pytest.raises(RuntimeError) as exc:
+        CompilerCache.find('ccache')
+    exc.match(r'not found')
+
+    sccache = fake(bin_path, 'sccache', FAKE_SCCACHE)
+    assert CompilerCache.find('auto') == sccache
+    ccache = fake(bin_path, 'ccache', FAKE_CCACHE)
+    assert CompilerCache.find('auto') == ccache
+    assert CompilerCache.find('sccache') == sccache
+    assert CompilerCache.find('off') is None
+
+
+def test_user_config(tmpdir):
+    path = CompilerCache.user_config(
+        '/usr/bin/ccache', Path(str(tmpdir)) / 'user-config.jam', 'gcc')
+    assert path.text() == 'using gcc : : "/usr/bin/ccache" g++ ;\n'
+
+
+def test_environ(tmpdir, monkeypatch):
+    monkeypatch.delenv('CCACHE_BASEDIR', raising=False)
+    assert CompilerCache.environ('ccache', str(tmpdir))['CCACHE_BASEDIR'] \
+        == Path(str(tmpdir)).realpath()
+    assert 'CCACHE_BASEDIR' not in CompilerCache.environ(
+        'sccache', str(tmpdir))
+
+
+def test_stats(bin_path):
+    ccache = fake(bin_path, 'ccache', FAKE_CCACHE)
+    (ccache + '.hits').write_text('4')
+    assert CompilerCache.stats(ccache) == {'hits': 5, 'misses': 3}
+    sccache = fake(bin_path, 'sccache', FAKE_SCCACHE)
+    assert CompilerCache.stats(sccache) == {'hits': 5, 'misses': 2}
+    assert CompilerCache.stats(bin_path / 'missing') is None
+
+
+def test_report(capsys):
+    assert CompilerCache.report(
+        'ccache', {'hits': 1, 'misses': 2}, {'hits': 7, 'misses': 4}) == {
+            'hits': 6, 'misses': 2}
+    assert '6 hits, 2 misses (75% hit rate)' in capsys.readouterr().out
+    assert CompilerCache.report('ccache', None, None) is None
+
+
+def test_Source_b2(bin_path, tmpdir, mocker):
+    ccache = fake(bin_path, 'ccache', FAKE_CCACHE)
+    hits = ccache + '.hits'
+    hits.write_text('0')
+    call = mocker.patch('Boost.Source._call', side_effect=(
+        lambda *args, **kwargs: hits.write_text('10') and 0))
+    report = mocker.spy(CompilerCache, 'report')
+    source = Source('1.66.0', rootpath=str(tmpdir))
+    source.path.makedirs()
+    source.b2(['--help'], jobs=1)
+    command = call.call_args[0][0]
+    config = source.path / 'pyboost-user-config.jam'
+    assert '--user-config={}'.format(config) in command
+    assert command[-1] == '--help'
+    assert config.text() == 'using gcc : : "{}" g++ ;\n'.format(ccache)
+    assert call.call_args[1]['env']['CCACHE_BASEDIR'] == source.path
+    assert report.spy_return == {'hits': 10, 'misses': 0}
+
+    source.b2(['--help'], jobs=1, compiler_cache='off')
+    assert not any(arg.startswith('--user-config=')
+                   for arg in call.call_args[0][0])
+    assert call.call_args[1]['env'] is None
@@ -1,35 +1,57 @@
-import Boost
-from Boost.Cons import Environment, TOOLSET
-
-
-def test_TOOLSET():
-    assert TOOLSET == Boost.TOOLSET
-
-
-class TestEnvironment(object):
-
-    def test_CPPPATH(self):
-        assert set(Environment()['CPPPATH']).issuperset(Boost.INCLUDE)
-
-    def test_LIBPATH(self):
-        assert set(Environment()['LIBPATH']).issuperset(Boost.LIB)
-
-    def test_CPPDEFINDES(self):
-        if TOOLSET == 'msvc':
-            assert set(Environment()['CPPDEFINES']).issuperset([
-                '_DLL', 'BOOST_ALL_DYN_LINK'])
-        else:
-            assert TOOLSET == 'gcc'
-
-    def test_CXXFLAGS(self):
-        if TOOLSET == 'msvc':
-            assert set(Environment()['CXXFLAGS']).issuperset(['/EHsc'])
-        else:
-            assert TOOLSET == 'gcc'
-
-    def test_LINKFLAGS(self):
-        if TOOLSET == 'msvc':
-            assert set(Environment()['LINKFLAGS']).issuperset([
-                '/NODEFAULTLIB:libcmt'])
-        else:
-            assert TOOLSET == 'gcc'
+import Boost
+from Boost.Cons import Environment, TOOLSET, _resolved
+from Boost.Profile import parse_profile
+
+
+def test_TOOLSET():
+    assert TOOLSET == Boost.TOOLSET
+
+
+class TestEnvironment(object):
+
+    def test_CPPPATH(self):
+        assert set(Environment()['CPPPATH']).issuperset(Boost.INCLUDE)
+
+    def test_LIBPATH(self):
+        assert set(Environment()['LIBPATH']).issuperset(Boost.LIB)
+
+    def test_CPPDEFINDES(self):
+        if TOOLSET == 'msvc':
+            assert set(Environment()['CPPDEFINES']).issuperset([
+                '_DLL', 'BOOST_ALL_DYN_LINK'])
+        else:
+            assert TOOLSET == 'gcc'
+
+    def test_CXXFLAGS(self):
+        if TOOLSET == 'msvc':
+            assert set(Environment()['CXXFLAGS']).issuperset(['/EHsc'])
+        else:
+            assert TOOLSET == 'gcc'
+
+    def test_LINKFLAGS(self):
+        if TOOLSET == 'msvc':
+            assert set(Environment()['LINKFLAGS']).issuperset([
+                '/NODEFAULTLIB:libcmt'])
+        else:
+            assert TOOLSET == 'gcc'
+
+    def test_BOOST_PROFILE(self, mocker, tmpdir):
+        mocker.patch.dict(_resolved, clear=True)
+        resolved = mocker.patch.object(Boost, '_resolved', return_value={
+            'INCLUDE': [str(tmpdir / 'include')],
+            'LIB': [str(tmpdir / 'lib')]})
+        env = Environment(BOOST_PROFILE='release-static-lto')
+        resolved.assert_called_once_with(parse_profile('release-static-lto'))
+        assert env['BOOST_PROFILE'] == 'release-static-lto'
+        assert str(tmpdir / 'include') in env['CPPPATH']
+        assert str(tmpdir / 'lib') in env['LIBPATH']
+        if TOOLSET == 'gcc':
+            assert '-flto' in env['CXXFLAGS']
+            assert '-flto' in env['LINKFLAGS']
+
+        # memoized per profile
+        assert Environment(BOOST_PROFILE=parse_profile(
+            'release-static-lto'))['CPPPATH'] == env['CPPPATH']
+        assert resolved.call_count == 1
+        Environment(BOOST_PROFILE='debug')
+        assert resolved.call_count == 2
@@ -0,0 +1,187 @@
+import os
+import sys
+
+from packaging.version import Version
+from path import Path
+import pytest
+
+from Boost import Config, Discovery
+from Boost.Discovery import (
+    Installation, component, discover, installations, read_version)
+
+PYTHON = 'python{}{}'.format(*sys.version_info)
+
+
+def make_installation(prefix, version='1.66.0', libs=(), lib='lib'):
+    """
+    Create fake Boost installation with `libs` files in `prefix`.
+    """
+    prefix = Path(prefix)
+    major, minor, patch = map(int, version.split('.'))
+    (prefix / 'include' / 'boost').makedirs_p()
+    (prefix / 'include' / 'boost' / 'version.hpp').write_text(
+        '#ifndef BOOST_VERSION_HPP\n'
+        '#define BOOST_VERSION {}\n'
+        '#define BOOST_LIB_VERSION "{}_{}"\n'
+        '#endif\n'.format(major * 100000 + minor * 100 + patch,
+                          major, minor))
+    libdir = (prefix / lib).makedirs_p()
+    for name in libs:
+        (libdir / name).write_text('')
+    return prefix
+
+
+@pytest.fixture
+def discovery(tmpdir, mocker):
+    """
+    All discovery providers, searching only in `tmpdir`.
+    """
+    mocker.patch.object(Config, 'DISCOVERY', ('root', 'cmake', 'system'))
+    mocker.patch.object(Config, 'BOOST_ROOT', None)
+    mocker.patch.object(Config, 'CMAKE_PREFIX_PATH', ())
+    mocker.patch.object(Config, 'SYSTEM_PREFIXES', (str(tmpdir / 'usr'), ))
+    mocker.patch('sysconfig.get_config_var', return_value=None)
+    mocker.patch.dict(Discovery._cache, clear=True)
+    return Path(str(tmpdir))
+
+
+def test_read_version(tmpdir):
+    assert read_version(str(tmpdir)) is None
+    make_installation(tmpdir, '1.74.0')
+    assert read_version(tmpdir / 'include') == '1.74.0'
+
+
+@pytest.mark.parametrize('libfile, name', [
+    ('libboost_system.so', 'system'),
+    ('libboost_system.so.1.66.0', 'system'),
+    ('libboost_system.so.1.74.0', None),
+    ('libboost_program_options-mt.a', 'program_options'),
+    ('boost_filesystem-vc141-mt-x64-1_66.lib', 'filesystem'),
+    ('boost_filesystem-vc141-mt-x64-1_74.lib', None),
+    ('libboost_unit_test_framework.so', 'test'),
+    ('libboost_math_c99f.a', 'math'),
+    ('libboost_{}.so'.format(PYTHON), 'python'),
+    ('libboost_numpy.so', 'python'),
+    ('libboost_python27.so', None),
+    ('libboost_mpi_{}.so'.format(PYTHON), 'mpi'),
+    ('libboost_system.so.txt', None),
+    ('README', None),
+])
+def test_component(libfile, name):
+    assert component(libfile, '1.66.0') == name
+
+
+class TestInstallation(object):
+
+    def test_examine(self, tmpdir):
+        prefix = make_installation(tmpdir, libs=[
+            'libboost_system.so', 'libboost_system.a',
+            'libboost_log_setup.so', 'libboost_log.so'])
+        installation = Installation.examine(
+            prefix / 'include', [prefix / 'lib', prefix / 'missing'],
+            'system')
+        assert installation == prefix
+        assert installation.version == Version('1.66.0')
+        assert installation.provider == 'system'
+        assert installation.include == prefix / 'include'
+        assert installation.lib == [prefix / 'lib']
+        assert installation.components == ('log', 'system')
+        assert not installation.header_only
+        assert installation.provides(['system'])
+        assert not installation.provides(['filesystem'])
+        # the complete set of foreign libraries is unknown
+        assert not installation.provides(None)
+        with pytest.raises(RuntimeError):
+            installation.write_info(version='1.65.1')
+
+        assert Installation.examine(prefix, [], 'system') is None
+
+    def test_examine_header_only(self, tmpdir):
+        prefix = make_installation(tmpdir)
+        installation = Installation.examine(
+            prefix / 'include', [prefix / 'lib'], 'root')
+        assert installation.header_only
+        assert installation.provides(None, header_only=True)
+        assert not installation.provides(None)
+        assert not installation.provides(['system'])
+
+
+class TestProviders(object):
+
+    def test_boost_root(self, discovery, mocker):
+        assert list(Discovery.boost_root()) == []
+
+        # source tree with staged libraries
+        root = (discovery / 'boost_1_66_0').makedirs()
+        make_installation(root, libs=['libboost_system.a'], lib='stage/lib')
+        (root / 'include' / 'boost').move(root / 'boost')
+        mocker.patch.object(Config, 'BOOST_ROOT', root)
+        installation, = installations(['root'])
+        assert installation.include == root
+        assert installation.lib == [root / 'stage' / 'lib']
+        assert installation.components == ('system', )
+
+    def test_cmake(self, discovery, mocker):
+        prefix = make_installation(
+            discovery / 'opt', '1.74.0', libs=['libboost_system.so.1.74.0'])
+        cmakedir = (prefix / 'lib' / 'cmake').makedirs()
+        (cmakedir / 'Boost-1.74.0').makedirs()
+        (cmakedir / 'Boost-1.74.0' / 'BoostConfig.cmake').write_text('')
+        (cmakedir / 'boost_headers-1.74.0').makedirs()
+        (prefix / 'headers' / 'boost').makedirs()
+        (prefix / 'include' / 'boost' / 'version.hpp').move(
+            prefix / 'headers' / 'boost')
+        (cmakedir / 'boost_headers-1.74.0' / 'boost_headers-config.cmake') \
+            .write_text('get_filename_component(_BOOST_INCLUDEDIR '
+                        '"${_BOOST_CMAKEDIR}/../../headers/" ABSOLUTE)\n')
+        assert installations(['cmake']) == []
+
+        mocker.patch.object(Config, 'CMAKE_PREFIX_PATH', (str(prefix), ))
+        installation, = installations(['cmake'])
+        assert installation.provider == 'cmake'
+        assert installation.version == Version('1.74.0')
+        assert installation.include == prefix / 'headers'
+        assert installation.components == ('system', )
+
+    def test_system(self, discovery):
+        assert installations(['system']) == []
+        prefix = make_installation(discovery / 'usr', libs=[
+            'libboost_system.so'])
+        installation, = installations(['system'])
+        assert installation == prefix
+        assert installation.provider == 'system'
+
+    def test_unknown(self):
+        with pytest.raises(ValueError) as exc:
+            installations(['invalid'])
+        exc.match(r'root, cmake, system')
+
+
+def test_installations_cache(discovery, mocker):
+    prefix = make_installation(discovery / 'usr', libs=['libboost_system.so'])
+    examine = mocker.spy(Installation, 'examine')
+    first, = installations(['system', 'system'])
+    assert installations(['system']) == [first]
+    assert examine.call_count == 1
+
+    # modified lib dir gets examined again
+    (prefix / 'lib' / 'libboost_filesystem.so').write_text('')
+    mtime = (prefix / 'lib').stat().st_mtime + 10
+    os.utime(prefix / 'lib', (mtime, mtime))
+    installation, = installations(['system'])
+    assert examine.call_count == 2
+    assert installation.components == ('filesystem', 'system')
+
+
+def test_discover(discovery, mocker):
+    make_installation(discovery / 'usr', libs=['libboost_system.so'])
+    root = make_installation(discovery / 'root', '1.65.1')
+    mocker.patch.object(Config, 'BOOST_ROOT', root)
+    assert discover() is None
+    assert discover(components=['system']).provider == 'system'
+    assert discover(header_only=True).provider == 'root'
+    assert discover('1.65.1', header_only=True).provider == 'root'
+    assert discover('1.65.1', ['system']) is None
+    assert discover('1.66.0', ['system']).provider == 'system'
+    assert discover('1.66.0', ['system'], providers=['root']) is None
+    assert discover(providers=[]) is None
@@ -0,0 +1,113 @@
+import json
+
+import pytest
+
+from Boost import Config, Events
+from Boost.Download import Download, sha256sum
+
+
+CHUNK_SIZE = 64 * 1024
+
+
+@pytest.fixture
+def download(tmpdir, http_server, boost_archive, boost_archive_sha256):
+    return Download(str(http_server) + '/' + boost_archive.name,
+                    str(tmpdir / boost_archive.name),
+                    sha256=boost_archive_sha256, connections=3,
+                    chunk_size=CHUNK_SIZE)
+
+
+def range_requests(server):
+    return [entry for entry in server.log if entry[2]]
+
+
+def test_sha256sum(boost_archive, boost_archive_sha256):
+    assert sha256sum(boost_archive) == boost_archive_sha256
+
+
+class TestDownload(object):
+
+    def test_run(self, download, boost_archive, http_server):
+        assert download.run() == download.path
+        assert download.path.bytes() == boost_archive.bytes()
+        assert not download.partial.exists()
+        assert not download.state_file.exists()
+        assert len(range_requests(http_server.server)) == -(
+            -boost_archive.size // CHUNK_SIZE)
+
+    def test_run_without_ranges(self, download, boost_archive, http_server):
+        http_server.server.ranges = False
+        assert download.run() == download.path
+        assert download.path.bytes() == boost_archive.bytes()
+        assert not range_requests(http_server.server)
+
+    def test_run_with_wrong_sha256(self, download):
+        download.sha256 = '0' * 64
+        with pytest.raises(RuntimeError) as exc:
+            download.run()
+        exc.match(r'SHA256 mismatch')
+        assert not download.path.exists()
+        assert not download.partial.exists()
+        assert not download.state_file.exists()
+
+    def test_resume(self, download, boost_archive, http_server, mocker):
+        mocker.patch.object(Config, 'HTTP_BACKOFF', 0)
+        server = http_server.server
+        server.failing_ranges.add(CHUNK_SIZE)
+        with pytest.raises(Exception):
+            download.run()
+        assert not download.path.exists()
+        assert download.partial.size == boost_archive.size
+        done = json.loads(download.state_file.text())['done']
+        assert 0 in done
+        assert CHUNK_SIZE not in done
+
+        server.failing_ranges.clear()
+        del server.log[:]
+        assert download.run() == download.path
+        assert download.path.bytes() == boost_archive.bytes()
+        fetched = [int(entry[2].split('=')[1].split('-')[0])
+                   for entry in range_requests(server)]
+        assert CHUNK_SIZE in fetched
+        assert not set(fetched) & set(done)
+
+    def test_failover(self, download, boost_archive, http_server, mocker):
+        mocker.patch.object(Config, 'HTTP_RETRIES', 0)
+        server = http_server.server
+        server.failing_ranges.add(CHUNK_SIZE)
+        mirror = boost_archive.dirname() / 'mirror.tar.bz2'
+        boost_archive.copy(mirror)
+        download.urls = [str(http_server) + '/missing.tar.bz2',
+                         download.url, str(mirror)]
+
+        events = []
+        subscriber = Events.subscribe(events.append)
+        try:
+            assert download.run() == download.path
+        finally:
+            Events.unsubscribe(subscriber)
+        assert download.path.bytes() == boost_archive.bytes()
+        assert [(event['url'], event['alternative']) for event in events
+                if event['event'] == 'download.failover'] == [
+            (download.urls[0], download.urls[1]),
+            (download.urls[1], download.urls[2])]
+        # failed server is abandoned
+        fetched = [int(entry[2].split('=')[1].split('-')[0])
+                   for entry in range_requests(server)]
+        assert fetched.count(CHUNK_SIZE) == 3
+        assert len(fetched) < 3 + -(-boost_archive.size // CHUNK_SIZE)
+
+    def test_failover_without_ranges(self, download, boost_archive,
+                                     http_server):
+        http_server.server.ranges = False
+        download.urls = ['http://127.0.0.1:1/boost_1_66_0.tar.bz2',
+                         download.url]
+        assert download.run() == download.path
+        assert download.path.bytes() == boost_archive.bytes()
+
+    def test_unavailable(self, download, http_server):
+        download.urls = [str(http_server) + '/missing.tar.bz2',
+                         str(download.path) + '.missing']
+        with pytest.raises(RuntimeError) as exc:
+            download.run()
+        exc.match(r'not available')
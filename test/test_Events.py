@@ -0,0 +1,135 @@
+import json
+import logging
+import sys
+
+from path import Path
+import pytest
+
+import Boost
+from Boost import Events
+from Boost.Source import _call, _LibraryTimer
+
+
+@pytest.fixture
+def events():
+    events = []
+    Events.subscribe(events.append)
+    yield events
+    Events.unsubscribe(events.append)
+
+
+def test_emit(events, capsys):
+    event = Events.emit('test', "Testing", answer=42)
+    assert events == [event]
+    assert event['event'] == 'test'
+    assert event['answer'] == 42
+    assert 'time' in event
+    assert capsys.readouterr().out == 'Testing\n'
+
+    Events.emit('test')
+    assert capsys.readouterr().out == ''
+
+
+def test_unsubscribe_printer(events, capsys):
+    Events.unsubscribe(Events.printer)
+    try:
+        Events.emit('test', "Testing")
+    finally:
+        Events.subscribe(Events.printer)
+    assert capsys.readouterr().out == ''
+    assert len(events) == 1
+
+
+def test_phase(events):
+    with Events.phase('download', "Downloading", url='url') as results:
+        results['bytes'] = 1000
+    start, end = events
+    assert start['event'] == 'phase.start'
+    assert start['message'] == "Downloading"
+    assert end['event'] == 'phase.end'
+    assert end['phase'] == 'download'
+    assert end['url'] == 'url'
+    assert end['bytes'] == 1000
+    assert end['duration'] >= 0
+    assert end['error'] is None
+    if end['duration']:
+        assert end['throughput'] == 1000 / end['duration']
+
+    with pytest.raises(RuntimeError):
+        with Events.phase('b2'):
+            raise RuntimeError('failed')
+    assert 'failed' in events[-1]['error']
+
+
+def test_LoggingSubscriber(caplog):
+    subscriber = Events.subscribe(Events.LoggingSubscriber())
+    try:
+        with caplog.at_level(logging.INFO, logger='Boost'):
+            Events.emit('test', "Testing", answer=42)
+            Events.emit('other')
+    finally:
+        Events.unsubscribe(subscriber)
+    first, second = caplog.records
+    assert first.getMessage() == "Testing"
+    assert first.event['answer'] == 42
+    assert second.getMessage() == 'other'
+
+
+def test_JSONLinesSubscriber(tmpdir):
+    path = Path(str(tmpdir)) / 'events.jsonl'
+    subscriber = Events.subscribe(Events.JSONLinesSubscriber(path))
+    try:
+        Events.emit('test', "Testing", path=path)
+        with Events.phase('extract'):
+            pass
+    finally:
+        Events.unsubscribe(subscriber)
+    events = [json.loads(line) for line in path.lines()]
+    assert [event['event'] for event in events] == [
+        'test', 'phase.start', 'phase.end']
+    assert events[0]['path'] == str(path)
+
+
+def test_LibraryTimer(events, mocker):
+    # further times are for emitting
+    mocker.patch('time.time', side_effect=[0, 1, 3, 4, 10, 11, 12])
+    timer = _LibraryTimer()
+    for line in [
+            'gcc.compile.c++ bin.v2/libs/system/build/gcc/error_code.o\n',
+            'gcc.compile.c++ bin.v2/libs/chrono/build/gcc/chrono.o\n',
+            'warning: some output\n',
+            '    "g++" -c bin.v2/libs/chrono/build/gcc/other.o\n',
+            'gcc.link.dll bin.v2/libs/system/build/gcc/libboost_system.so\n',
+            'gcc.link.dll bin.v2/libs/chrono/build/gcc/libboost_chrono.so\n',
+    ]:
+        timer(line)
+    timer.emit()
+    assert [(e['library'], e['duration'], e['actions'])
+            for e in events] == [('chrono', 9, 2), ('system', 4, 2)]
+
+
+def test_call(capfd):
+    lines = []
+    assert _call([sys.executable, '-c', 'print("line 1"); print("line 2")'],
+                 output=lines.append) == 0
+    assert lines == ['line 1\n', 'line 2\n']
+    assert capfd.readouterr().out == 'line 1\nline 2\n'
+
+
+def test_resolve_events(boost_archive_source, carefree_boost_home, events,
+                        mocker):
+    mocker.patch('sysconfig.get_path', return_value='/include')
+    Boost.resolve('1.66.0', components=['system'], jobs=1)
+    phases = [e['phase'] for e in events if e['event'] == 'phase.end']
+    assert phases == ['download', 'extract', 'bootstrap', 'b2', 'build',
+                      'b2', 'install', 'resolve']
+    download, extract = [e for e in events if e['event'] == 'phase.end'][:2]
+    assert download['bytes'] == Boost.Source(
+        '1.66.0', rootpath=Boost.CAREFREE_BOOST_CACHE).archive.size
+    assert extract['files'] > 0
+    assert [e['hit'] for e in events if e['event'] == 'cache'] == [False]
+
+    del events[:]
+    Boost.resolve('1.66.0', components=['system'], jobs=1)
+    assert [(e['cache'], e['hit']) for e in events
+            if e['event'] == 'cache'] == [('prefix', True)]
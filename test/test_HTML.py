@@ -0,0 +1,73 @@
+from Boost.HTML import Link, archives, links
+
+
+RELEASE_PAGE = """\
+<html><body>
+<h2><a href="/users/history/version_1_66_0.html">Version 1.66.0</a></h2>
+<table class="download-table">
+  <tr><th>Platform</th><th>File</th><th>SHA256 Hash</th></tr>
+  <tr><td rowspan="2">unix</td>
+    <td><a href="https://dl.example.com/boost_1_66_0.tar.bz2">
+      boost_1_66_0.tar.bz2</a></td>
+    <td>{bz2}</td></tr>
+  <tr><td><a href="https://dl.example.com/boost_1_66_0.tar.gz">
+      boost_1_66_0.tar.gz</a><td>{gz}</tr>
+  <tr><td>windows<td><a href="https://dl.example.com/boost_1_66_0.7z">
+      boost_1_66_0.7z</a><td>unknown</tr>
+</table>
+<p><a href="https://mirror.example.com/boost_1_66_0.tar.bz2">
+  boost_1_66_0.tar.bz2</a> &amp; <a name="anchor">Docs</a></p>
+</body></html>
+""".format(bz2='a' * 64, gz='b' * 64)
+
+
+def test_links():
+    result = list(links(RELEASE_PAGE))
+    assert [(link.text, link.href) for link in result] == [
+        ('Version 1.66.0', '/users/history/version_1_66_0.html'),
+        ('boost_1_66_0.tar.bz2',
+         'https://dl.example.com/boost_1_66_0.tar.bz2'),
+        ('boost_1_66_0.tar.gz', 'https://dl.example.com/boost_1_66_0.tar.gz'),
+        ('boost_1_66_0.7z', 'https://dl.example.com/boost_1_66_0.7z'),
+        ('boost_1_66_0.tar.bz2',
+         'https://mirror.example.com/boost_1_66_0.tar.bz2'),
+        ('Docs', None),
+    ]
+    assert result[0].row == []
+    assert result[1].row == ['a' * 64]
+    # unclosed cells
+    assert result[2].cells == ['boost_1_66_0.tar.gz', 'b' * 64]
+    assert result[2].row == ['b' * 64]
+    assert result[3].row == ['unknown']
+    assert result[4] == Link('boost_1_66_0.tar.bz2',
+                             'https://mirror.example.com/boost_1_66_0.tar.bz2',
+                             None, None)
+
+
+def test_links_streamed():
+    chunks = [RELEASE_PAGE[i:i + 7] for i in range(0, len(RELEASE_PAGE), 7)]
+    assert list(links(iter(chunks))) == list(links(RELEASE_PAGE))
+
+    ilinks = links(iter(['<a href="1">One</a><a hr', 'ef="2">Two</a>']))
+    assert next(ilinks) == ('One', '1', None, None)
+    assert next(ilinks) == ('Two', '2', None, None)
+
+
+def test_links_unclosed():
+    assert list(links('<a href="1">One<a href="2">Two')) == [
+        ('One', '1', None, None), ('Two', '2', None, None)]
+
+
+def test_archives():
+    result = archives(links(iter([RELEASE_PAGE[:300], RELEASE_PAGE[300:]])))
+    assert list(result.items()) == [
+        ('boost_1_66_0.tar.bz2', {
+            'url': 'https://dl.example.com/boost_1_66_0.tar.bz2',
+            'sha256': 'a' * 64}),
+        ('boost_1_66_0.tar.gz', {
+            'url': 'https://dl.example.com/boost_1_66_0.tar.gz',
+            'sha256': 'b' * 64}),
+        ('boost_1_66_0.7z', {
+            'url': 'https://dl.example.com/boost_1_66_0.7z',
+            'sha256': None}),
+    ]
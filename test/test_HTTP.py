@@ -0,0 +1,75 @@
+from concurrent.futures import ThreadPoolExecutor
+import json
+
+import requests
+
+from Boost import Config, Events, HTTP
+
+
+def test_session(mocker):
+    session = HTTP.session()
+    assert isinstance(session, HTTP.Session)
+    assert HTTP.session() is session
+
+    mocker.patch.object(Config, 'HTTP_RETRIES', 7)
+    mocker.patch.object(Config, 'DOWNLOAD_CONNECTIONS', 42)
+    changed = HTTP.session()
+    assert changed is not session
+    adapter = changed.get_adapter('https://www.boost.org')
+    assert adapter.max_retries.total == 7
+    assert adapter.max_retries.status_forcelist == HTTP.RETRY_STATUS
+    assert adapter._pool_maxsize == 42
+
+
+def test_session_request(mocker):
+    request = mocker.patch.object(requests.Session, 'request')
+    session = HTTP.Session()
+    session.get('https://www.boost.org')
+    kwargs = request.call_args[1]
+    assert kwargs['timeout'] == Config.HTTP_TIMEOUT
+    assert 'proxies' not in kwargs
+    assert 'verify' not in kwargs
+
+    mocker.patch.object(Config, 'HTTP_PROXY', 'http://proxy:3128')
+    mocker.patch.object(Config, 'CA_BUNDLE', '/etc/ssl/corporate.pem')
+    session.get('https://www.boost.org', timeout=5)
+    kwargs = request.call_args[1]
+    assert kwargs['timeout'] == 5
+    assert kwargs['proxies'] == {
+        'http': 'http://proxy:3128', 'https': 'http://proxy:3128'}
+    assert kwargs['verify'] == '/etc/ssl/corporate.pem'
+
+
+def test_iter_text(tmpdir, http_root, http_server):
+    (http_root / 'page.html').write_text('<a href="/">Home</a>')
+    url = str(http_server) + '/page.html'
+    assert ''.join(HTTP.iter_text(url)) == '<a href="/">Home</a>'
+
+    cache = tmpdir / 'cache'
+    assert ''.join(HTTP.iter_text(url, cache=cache)) == '<a href="/">Home</a>'
+    entry = json.loads(cache.listdir()[0].read())
+    assert entry['url'] == url
+    assert entry['last_modified']
+
+    events = []
+    subscriber = Events.subscribe(events.append)
+    try:
+        assert ''.join(HTTP.iter_text(url, cache=cache)) == (
+            '<a href="/">Home</a>')
+    finally:
+        Events.unsubscribe(subscriber)
+    assert [event['event'] for event in events] == ['http.not_modified']
+    assert http_server.server.log == [('GET', '/page.html', None)] * 3
+
+
+def test_iter_text_concurrent(tmpdir, http_root, http_server):
+    (http_root / 'page.html').write_text('<a href="/">Home</a>')
+    url = str(http_server) + '/page.html'
+    cache = tmpdir / 'cache'
+
+    def fetch(_):
+        return ''.join(HTTP.iter_text(url, cache=cache))
+
+    with ThreadPoolExecutor(8) as executor:
+        assert set(executor.map(fetch, range(32))) == {'<a href="/">Home</a>'}
+    assert len(cache.listdir()) == 1
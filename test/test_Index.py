@@ -0,0 +1,118 @@
+from concurrent.futures import ThreadPoolExecutor
+import json
+import time
+
+from furl import furl
+from packaging.version import Version
+import pytest
+
+from Boost.Index import Index
+from Boost import Source
+
+
+RELEASES = {
+    Version('1.65.1'): furl('http://www.boost.org/users/history/'
+                            'version_1_65_1.html'),
+    Version('1.66.0'): furl('http://www.boost.org/users/history/'
+                            'version_1_66_0.html'),
+}
+
+
+class Fetch(object):
+
+    def __init__(self, result):
+        self.result = result
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.result
+
+
+@pytest.fixture
+def index_path(tmpdir):
+    return tmpdir / 'releases.json'
+
+
+def test_Source_INDEX():
+    import Boost
+
+    assert isinstance(Source.INDEX, Index)
+    assert Source.INDEX.path == Boost.CAREFREE_BOOST_CACHE / 'releases.json'
+
+
+class TestIndex(object):
+
+    def test_release_urls(self, index_path):
+        fetch = Fetch(RELEASES)
+        index = Index(index_path, ttl=60, offline=False)
+        assert index.release_urls(fetch) == RELEASES
+        assert fetch.calls == 1
+        assert index.release_urls(fetch) == RELEASES
+        assert Index(index_path, ttl=60).release_urls(fetch) == RELEASES
+        assert fetch.calls == 1
+
+        data = json.loads(index_path.read())
+        assert data['releases'] == {
+            str(version): str(url) for version, url in RELEASES.items()}
+
+    def test_release_urls_revalidation(self, index_path):
+        index = Index(index_path, ttl=0, offline=False)
+        index.release_urls(Fetch(RELEASES))
+
+        latest = dict(RELEASES)
+        latest[Version('1.67.0')] = furl('http://www.boost.org/users/history/'
+                                         'version_1_67_0.html')
+        fetch = Fetch(latest)
+        time.sleep(0.01)
+        # stale data is served while revalidating in background
+        assert index.release_urls(fetch) == RELEASES
+        index.revalidate(fetch).join()
+        assert fetch.calls in (1, 2)
+        assert Index(index_path, ttl=60).release_urls(fetch) == latest
+
+    def test_release_urls_offline(self, index_path):
+        fetch = Fetch(RELEASES)
+        with pytest.raises(RuntimeError) as exc:
+            Index(index_path, offline=True).release_urls(fetch)
+        exc.match(r'offline')
+
+        Index(index_path, offline=False).release_urls(fetch)
+        index = Index(index_path, ttl=0, offline=True)
+        time.sleep(0.01)
+        assert index.release_urls(fetch) == RELEASES
+        assert fetch.calls == 1
+
+    def test_download(self, index_path):
+        url = furl('https://dl.bintray.com/boostorg/release/1.66.0/source/'
+                   'boost_1_66_0.tar.bz2')
+        sha256 = ('5721818253e6a0989583192f96782c4a'
+                  '98eb6204965316df9f5ad75819225ca9')
+        fetch = Fetch({'url': url, 'sha256': sha256})
+        index = Index(index_path, offline=False)
+        assert index.download(Version('1.66.0'), fetch) == {
+            'url': str(url), 'sha256': sha256}
+        assert Index(index_path, offline=True).download_url(
+            Version('1.66.0'), fetch) == url
+        assert fetch.calls == 1
+
+        with pytest.raises(RuntimeError) as exc:
+            Index(index_path, offline=True).download_url(
+                Version('1.65.1'), fetch)
+        exc.match(r'offline')
+
+    def test_download_with_only_url(self, index_path):
+        url = ('https://dl.bintray.com/boostorg/release/1.66.0/source/'
+               'boost_1_66_0.tar.bz2')
+        index_path.write(json.dumps({'downloads': {'1.66.0': url}}))
+        assert Index(index_path, offline=True).download(
+            Version('1.66.0'), None) == {'url': url, 'sha256': None}
+
+    def test_save_concurrent(self, index_path):
+        def save(number):
+            Index(index_path).save({'number': number})
+
+        with ThreadPoolExecutor(8) as executor:
+            list(executor.map(save, range(32)))
+        assert json.loads(index_path.read())['number'] in range(32)
+        assert index_path.dirpath().listdir() == [index_path]
@@ -1,20 +1,60 @@
-import pytest
-
-import Boost
-
-
-class TestLib(object):
-
-    def test__getitem__(self):
-        fullname = Boost.LIB['system']
-        assert any(path.glob('*{}*'.format(fullname)) for path in Boost.LIB)
-
-    def test__getitem__with_invalid_index(self):
-        with pytest.raises(IndexError) as exc:
-            Boost.LIB[len(Boost.LIB)]
-        exc.match(r'out of range')
-
-    def test__getitem__with_invalid_name(self):
-        with pytest.raises(LookupError) as exc:
-            Boost.LIB['invalid']
-        exc.match(repr('invalid'))
+import re
+
+import pytest
+
+from Boost.Lib import LIBFILE_REGEX_TEMPLATE
+import Boost
+
+
+class TestLib(object):
+
+    def test__getitem__(self):
+        fullname = Boost.LIB['system']
+        assert any(path.glob('*{}*'.format(fullname)) for path in Boost.LIB)
+
+    def test__getitem__with_invalid_index(self):
+        with pytest.raises(IndexError) as exc:
+            Boost.LIB[len(Boost.LIB)]
+        exc.match(r'out of range')
+
+    def test__getitem__with_invalid_name(self):
+        with pytest.raises(LookupError) as exc:
+            Boost.LIB['invalid']
+        exc.match(repr('invalid'))
+
+    def test_index(self, tmpdir):
+        libdir = tmpdir.mkdir('lib')
+        for name in ('libboost_system-mt.so', 'libboost_program_options-mt.a',
+                     'boost_python3-vc141-mt-x64-1_66.lib', 'README'):
+            libdir.join(name).write('')
+        lib = Boost.Lib([str(libdir)])
+        for name, fullname in lib.index.items():
+            assert re.match(LIBFILE_REGEX_TEMPLATE.format(re.escape(name)),
+                            'lib' + fullname)
+        assert lib['python'] == lib['python3-vc141'] == (
+            'boost_python3-vc141-mt-x64-1_66')
+        assert lib['program_options'] == 'boost_program_options-mt'
+        assert 'program' not in lib.index
+        assert lib['system'] == 'boost_system-mt'
+        with pytest.raises(LookupError):
+            lib['filesystem']
+
+        libdir.join('libboost_filesystem-mt.so').write('')
+        assert lib['filesystem'] == 'boost_filesystem-mt'
+
+    def test_resolve_many(self):
+        names = ['system', 'system']
+        assert Boost.LIB.resolve_many(names) == [Boost.LIB['system']] * 2
+
+    def test_resolve_many_with_invalid_names(self):
+        with pytest.raises(LookupError) as exc:
+            Boost.LIB.resolve_many(['system', 'invalid', 'other'])
+        exc.match("{!r}, {!r}".format('invalid', 'other'))
+
+    def test_header_only(self):
+        lib = Boost.Lib([], header_only=True)
+        assert lib.header_only
+        assert list(lib) == []
+        with pytest.raises(LookupError) as exc:
+            lib['system']
+        exc.match(r'header-only')
@@ -0,0 +1,41 @@
+import os
+
+import pytest
+
+from Boost.Lock import Lock
+
+
+@pytest.fixture
+def lock_path(tmpdir):
+    return str(tmpdir / 'locks' / 'test.lock')
+
+
+class TestLock(object):
+
+    def test_exclusive(self, lock_path):
+        with Lock(lock_path) as lock:
+            assert lock.locked
+            assert lock.holder.endswith(str(os.getpid()))
+            assert not Lock(lock_path).acquire(blocking=False)
+            assert not Lock(lock_path, shared=True).acquire(blocking=False)
+        assert not lock.locked
+        other = Lock(lock_path)
+        assert other.acquire(blocking=False)
+        other.release()
+
+    def test_shared(self, lock_path):
+        with Lock(lock_path, shared=True):
+            with Lock(lock_path, shared=True) as other:
+                assert other.locked
+            assert not Lock(lock_path).acquire(blocking=False)
+
+    def test_timeout(self, lock_path):
+        with Lock(lock_path):
+            with pytest.raises(RuntimeError) as exc:
+                Lock(lock_path, timeout=0.2, interval=0.05).acquire()
+            exc.match(r'Timeout')
+
+    def test_acquire_twice(self, lock_path):
+        with Lock(lock_path) as lock:
+            with pytest.raises(RuntimeError):
+                lock.acquire()
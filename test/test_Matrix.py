@@ -0,0 +1,62 @@
+import threading
+import time
+
+from packaging.version import Version
+
+from Boost.Matrix import Scheduler, Spec, parse_spec
+from Boost.Profile import DEFAULT, Profile
+
+
+def test_parse_spec():
+    assert parse_spec(None) == Spec(None, None, False, DEFAULT)
+    assert parse_spec('1.66.0') == Spec('1.66.0')
+    assert parse_spec(Version('1.66.0')) == Spec('1.66.0')
+    assert parse_spec(('1.66.0', 'system')) == Spec(
+        '1.66.0', components=['system'])
+    spec = parse_spec({'version': '1.66.0',
+                       'components': ['system', 'filesystem'],
+                       'profile': {'link': 'static'}})
+    assert spec.components == ('filesystem', 'system')
+    assert spec.profile == Profile(link='static')
+    assert parse_spec(spec) is spec
+    assert len({spec, Spec('1.66.0', ['filesystem', 'system'],
+                           profile=Profile(link='static'))}) == 1
+
+
+class TestScheduler(object):
+
+    def test_share(self):
+        scheduler = Scheduler(jobs=8, groups=3)
+        assert scheduler.jobs == 8
+        assert scheduler.share == 2
+        scheduler.done()
+        assert scheduler.share == 4
+        scheduler.done()
+        scheduler.done()
+        assert scheduler.share == 8
+        assert Scheduler(jobs=2, groups=3).share == 1
+
+    def test_budget(self):
+        scheduler = Scheduler(jobs=2, groups=4)
+        lock = threading.Lock()
+        running = []
+        peak = []
+
+        def build(jobs):
+            with lock:
+                running.append(jobs)
+                peak.append(sum(running))
+            time.sleep(0.1)
+            with lock:
+                running.remove(jobs)
+            return jobs
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(
+            scheduler(build))) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert results == [1] * 4
+        assert max(peak) == 2
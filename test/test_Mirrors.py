@@ -0,0 +1,79 @@
+from path import Path
+
+from Boost import Config, Events, HTTP, Mirrors
+
+
+UPSTREAM = ('https://dl.bintray.com/boostorg/release/1.66.0/source/'
+            'boost_1_66_0.tar.bz2')
+
+
+def test_candidates(mocker, tmpdir):
+    assert Mirrors.candidates(
+        'boost_1_66_0.tar.bz2', '1.66.0', UPSTREAM) == [UPSTREAM]
+
+    mocker.patch.object(Config, 'MIRRORS', (
+        'http://mirror.example.com/boost/',
+        'https://archives.example.com/release/{version}/source/{name}',
+        str(tmpdir),
+    ))
+    assert Mirrors.candidates(
+        'boost_1_66_0.tar.bz2', '1.66.0', UPSTREAM) == [
+        'http://mirror.example.com/boost/boost_1_66_0.tar.bz2',
+        'https://archives.example.com/release/1.66.0/source/'
+        'boost_1_66_0.tar.bz2',
+        str(tmpdir / 'boost_1_66_0.tar.bz2'),
+        UPSTREAM,
+    ]
+    assert Mirrors.candidates('boost_1_66_0.tar.bz2', '1.66.0', UPSTREAM,
+                              mirrors=()) == [UPSTREAM]
+
+
+def test_probe(http_server, boost_archive):
+    url = str(http_server) + '/' + boost_archive.name
+    result = Mirrors.probe(url, size=1024)
+    assert result['url'] == url
+    assert result['latency'] > 0
+    assert result['throughput'] > 0
+    assert result['size'] == boost_archive.size
+    assert http_server.server.log == [
+        ('GET', '/' + boost_archive.name, 'bytes=0-1023')]
+
+    http_server.server.ranges = False
+    session = HTTP.Session(retries=0)
+    assert Mirrors.probe(url, session=session)['size'] == boost_archive.size
+    assert Mirrors.probe(str(http_server) + '/missing.tar.bz2',
+                         session=session) is None
+    assert Mirrors.probe('http://127.0.0.1:1/boost.tar.bz2',
+                         session=session) is None
+
+
+def test_probe_local(boost_archive):
+    assert Mirrors.probe(str(boost_archive)) == {
+        'url': str(boost_archive), 'latency': 0.0,
+        'throughput': float('inf'), 'size': boost_archive.size}
+    assert Mirrors.probe(str(Path(boost_archive) + '.missing')) is None
+
+
+def test_rank(mocker):
+    results = {
+        'slow': {'latency': 0.01, 'throughput': 1e5, 'size': 10 ** 6},
+        'far': {'latency': 2.0, 'throughput': 1e7, 'size': 10 ** 6},
+        'fast': {'latency': 0.02, 'throughput': 1e7, 'size': None},
+    }
+    probe = mocker.patch.object(
+        Mirrors, 'probe', side_effect=lambda url, **_: (
+            url in results and dict(results[url], url=url) or None))
+    assert Mirrors.rank(['upstream']) == ['upstream']
+    assert not probe.called
+
+    events = []
+    subscriber = Events.subscribe(events.append)
+    try:
+        assert Mirrors.rank(['far', 'dead', 'slow', 'fast']) == [
+            'fast', 'far', 'slow']
+    finally:
+        Events.unsubscribe(subscriber)
+    assert events[-1]['event'] == 'mirrors'
+    assert events[-1]['unavailable'] == ['dead']
+
+    assert Mirrors.rank(['dead', 'gone']) == ['dead', 'gone']
@@ -0,0 +1,113 @@
+import errno
+import os
+import shutil
+
+from path import Path
+import pytest
+
+import Boost
+from Boost.ObjectStore import ObjectStore
+from Boost.__main__ import main
+
+
+def make_prefix(path, version):
+    prefix = Path(path)
+    (prefix / 'include' / 'boost').makedirs()
+    (prefix / 'include' / 'boost' / 'config.hpp').write_text('// config\n')
+    (prefix / 'include' / 'boost' / 'version.hpp').write_text(
+        '#define BOOST_LIB_VERSION "{}"\n'.format(version))
+    (prefix / 'bin').makedirs()
+    (prefix / 'bin' / 'tool').write_text('// config\n')
+    (prefix / 'bin' / 'tool').chmod(0o755)
+    return prefix
+
+
+@pytest.fixture
+def store(tmpdir):
+    return ObjectStore(Path(str(tmpdir)) / 'objects')
+
+
+def test_dedupe(store, tmpdir):
+    first = make_prefix(Path(str(tmpdir)) / 'first', '1_65_1')
+    second = make_prefix(Path(str(tmpdir)) / 'second', '1_66_0')
+    assert store.dedupe(first) == {'files': 0, 'bytes': 0}
+    assert len(store.objects) == 3
+    assert store.dedupe(second) == {'files': 2, 'bytes': 20}
+    assert len(store.objects) == 4
+
+    config = 'include/boost/config.hpp'
+    assert os.path.samefile(first / config, second / config)
+    assert (first / config).stat().st_nlink == 3
+    assert not os.path.samefile(first / config, second / 'bin' / 'tool')
+    assert os.access(second / 'bin' / 'tool', os.X_OK)
+    assert (second / 'include' / 'boost' / 'version.hpp').text() == (
+        '#define BOOST_LIB_VERSION "1_66_0"\n')
+    # idempotent
+    assert store.dedupe(second) == {'files': 0, 'bytes': 0}
+
+
+def test_prune(store, tmpdir):
+    first = make_prefix(Path(str(tmpdir)) / 'first', '1_65_1')
+    second = make_prefix(Path(str(tmpdir)) / 'second', '1_66_0')
+    store.dedupe(first)
+    store.dedupe(second)
+    assert store.prune() == 0
+
+    first.rmtree()
+    assert store.prune() == 1
+    assert len(store.objects) == 3
+
+
+def test_reflink_fallback(store, tmpdir, mocker):
+    first = make_prefix(Path(str(tmpdir)) / 'first', '1_65_1')
+    second = make_prefix(Path(str(tmpdir)) / 'second', '1_66_0')
+    store.dedupe(first)
+
+    os_link = os.link
+
+    def link(src, dst):
+        if dst.startswith(store.path):
+            return os_link(src, dst)
+
+        # existing objects have too many hardlinks already
+        raise OSError(errno.EMLINK, os.strerror(errno.EMLINK))
+
+    mocker.patch('os.link', side_effect=link)
+    reflink = mocker.patch('Boost.ObjectStore.reflink',
+                           side_effect=shutil.copy2)
+    assert store.dedupe(second) == {'files': 2, 'bytes': 20}
+    assert reflink.call_count == 2
+    assert (second / 'include' / 'boost' / 'config.hpp').text() == \
+        '// config\n'
+
+    reflink.side_effect = OSError(errno.ENOTSUP, 'not supported')
+    third = make_prefix(Path(str(tmpdir)) / 'third', '1_66_0')
+    assert store.dedupe(third) == {'files': 0, 'bytes': 0}
+
+
+def test_main_dedupe(carefree_boost_home, capsys):
+    first = make_prefix(carefree_boost_home / '1_65_1' / 'gcc', '1_65_1')
+    second = make_prefix(carefree_boost_home / '1_66_0' / 'gcc', '1_66_0')
+    (carefree_boost_home / '1_66_0' / '.gcc.tmp-42').makedirs()
+    assert Boost.prefixes() == [first, second]
+    assert main(['dedupe']) == 0
+    assert 'Deduplicated 2 files (20 bytes) in total' in \
+        capsys.readouterr().out
+    assert os.path.samefile(first / 'include' / 'boost' / 'config.hpp',
+                            second / 'include' / 'boost' / 'config.hpp')
+
+
+def test_resolve_dedupes(boost_archive_source, carefree_boost_home, mocker):
+    mocker.patch('sysconfig.get_path', return_value='/include')
+    system, _ = Boost.resolve('1.66.0', components=['system'], jobs=1)
+    mocker.patch.object(Boost.Config, 'DEDUPE', True)
+    headers, _ = Boost.resolve('1.66.0', components=['-python'], jobs=1)
+    assert system != headers
+    assert not os.path.samefile(
+        system / 'include' / 'boost' / 'version.hpp',
+        headers / 'include' / 'boost' / 'version.hpp')
+
+    # only prefixes installed while enabled share objects
+    Boost.objects().dedupe(system)
+    assert os.path.samefile(system / 'include' / 'boost' / 'version.hpp',
+                            headers / 'include' / 'boost' / 'version.hpp')
@@ -0,0 +1,112 @@
+from path import Path
+import pytest
+
+from Boost.Prefix import INFO_FILE, Prefix, parse_components, provides
+from Boost.Profile import DEFAULT, Profile, profiles
+
+
+def test_parse_components():
+    assert parse_components(None) is None
+    assert parse_components([]) is None
+    assert parse_components('system') == ('system', )
+    assert parse_components(['system', 'filesystem', 'system']) == (
+        'filesystem', 'system')
+    assert parse_components(['-python', '-mpi']) == ('-mpi', '-python')
+    with pytest.raises(ValueError) as exc:
+        parse_components(['system', '-python'])
+    exc.match(r"Can't mix")
+
+
+@pytest.mark.parametrize('installed, components, result', [
+    (None, None, True),
+    (None, ['system'], True),
+    (['system'], None, False),
+    (['filesystem', 'system'], ['system'], True),
+    (['system'], ['filesystem', 'system'], False),
+    (['system'], ['-python'], False),
+    (['-python'], ['system'], True),
+    (['-python'], ['python'], False),
+    (['-python'], ['-mpi', '-python'], True),
+    (['-mpi', '-python'], ['-python'], False),
+])
+def test_provides(installed, components, result):
+    assert provides(parse_components(installed),
+                    parse_components(components)) is result
+
+
+class TestPrefix(object):
+
+    def test_name(self):
+        assert Prefix.name('gcc') == 'gcc'
+        assert Prefix.name('gcc', ['system', 'filesystem']) == (
+            'gcc+filesystem+system')
+        assert Prefix.name('msvc', ['-python']) == 'msvc-python'
+        assert Prefix.name('gcc', ['system'], header_only=True) == 'headers'
+        assert Prefix.name('gcc', profile=DEFAULT) == 'gcc'
+        assert Prefix.name('gcc', ['system'], profile=Profile(
+            'debug', 'static')) == 'gcc@debug-static+system'
+        assert Prefix.name('gcc', profile='release-static-lto') == (
+            'gcc@release-static-lto')
+
+    def test_path_operations(self, tmpdir):
+        prefix = Prefix(str(tmpdir))
+        assert type(prefix / 'include') is Path
+
+    def test_info(self, tmpdir):
+        prefix = Prefix(str(tmpdir))
+        assert prefix.info == {}
+        assert prefix.components is None
+        assert prefix.provides(['system'])
+
+        prefix.write_info(version='1.66.0', components=['system'])
+        prefix.write_info(toolset='gcc')
+        assert prefix.info_file == Path(str(tmpdir)) / INFO_FILE
+        assert prefix.info == {
+            'version': '1.66.0', 'toolset': 'gcc', 'components': ['system']}
+        assert prefix.components == ('system', )
+        assert prefix.provides('system')
+        assert not prefix.provides(None)
+
+    def test_installed(self, tmpdir):
+        home = Path(str(tmpdir))
+        assert Prefix.installed(home / 'missing', 'gcc') == []
+        for name in ('gcc+system', 'gcc', 'gcc-python', 'msvc', 'gccx',
+                     'headers'):
+            (home / name).makedirs()
+        installed = Prefix.installed(home, 'gcc')
+        assert installed == [home / 'gcc', home / 'gcc+system',
+                             home / 'gcc-python']
+        assert all(type(prefix) is Prefix for prefix in installed)
+        assert Prefix.installed(home, 'gcc', header_only=True) == (
+            installed + [home / 'headers'])
+
+    def test_installed_profile(self, tmpdir):
+        home = Path(str(tmpdir))
+        static = Profile(link='static')
+        lto = profiles()['release-static-lto']
+        for name, profile in [('gcc', None),
+                              ('gcc@release-static', static),
+                              ('gcc@release-static+system', static),
+                              ('gcc@release-static-lto', lto)]:
+            prefix = Prefix((home / name).makedirs())
+            if profile is not None:
+                prefix.write_info(profile=dict(profile._asdict()))
+        assert Prefix.installed(home, 'gcc') == [home / 'gcc']
+        assert Prefix.installed(home, 'gcc', profile=static) == [
+            home / 'gcc@release-static', home / 'gcc@release-static+system']
+        assert Prefix.installed(home, 'gcc', profile='release-static-lto') == [
+            home / 'gcc@release-static-lto']
+
+        assert Prefix(home / 'gcc').profile == DEFAULT
+        assert Prefix(home / 'gcc@release-static').profile == static
+
+    def test_header_only(self, tmpdir):
+        prefix = Prefix(str(tmpdir))
+        assert not prefix.header_only
+        assert prefix.provides(None, header_only=True)
+
+        prefix.write_info(header_only=True)
+        assert prefix.header_only
+        assert prefix.provides(['system'], header_only=True)
+        assert not prefix.provides(None)
+        assert not prefix.provides(['system'])
@@ -0,0 +1,89 @@
+import pytest
+
+from Boost import Config
+from Boost.Profile import DEFAULT, Profile, parse_profile, profiles
+
+
+class TestProfile(object):
+
+    def test_default(self):
+        assert DEFAULT == Profile('release', 'shared', (), ())
+        assert DEFAULT.default
+        assert not Profile(link='static').default
+
+    def test_invalid(self):
+        with pytest.raises(ValueError) as exc:
+            Profile(variant='fast')
+        exc.match(r'variant')
+        with pytest.raises(ValueError) as exc:
+            Profile(link='dynamic')
+        exc.match(r'link mode')
+
+    def test_flags(self):
+        profile = Profile(cxxflags='-O3 -flto', linkflags=['-flto'])
+        assert profile.cxxflags == ('-O3', '-flto')
+        assert profile.linkflags == ('-flto', )
+        assert hash(profile) == hash(Profile(
+            cxxflags=['-O3', '-flto'], linkflags='-flto'))
+
+    def test_name(self):
+        assert DEFAULT.name == 'release'
+        assert Profile(link='static').name == 'release-static'
+        assert Profile('debug').name == 'debug'
+        assert Profile('debug', 'static').name == 'debug-static'
+        name = Profile(cxxflags='-O3').name
+        assert name.startswith('release-shared_')
+        assert len(name) == len('release-shared_') + 8
+        assert name != Profile(linkflags='-O3').name
+
+    def test_portable(self):
+        assert DEFAULT.portable
+        assert profiles()['release-static-lto'].portable
+        assert not profiles()['release-native'].portable
+
+    def test_extended(self):
+        profile = Profile(cxxflags='-O3').extended('-g', ['-s'])
+        assert profile == Profile(cxxflags='-O3 -g', linkflags='-s')
+        assert DEFAULT.extended() == DEFAULT
+
+    def test_args(self):
+        assert DEFAULT.args() == ['variant=release', 'link=shared']
+        assert Profile('debug', 'static', '-O0 -g', '-g').args() == [
+            'variant=debug', 'link=static', 'cxxflags=-O0', 'cxxflags=-g',
+            'linkflags=-g']
+
+
+def test_profiles():
+    assert list(profiles()) == [
+        'release', 'release-static', 'release-static-lto', 'release-native',
+        'debug']
+    assert profiles()['release'] is DEFAULT
+    assert profiles()['release-static-lto'].link == 'static'
+    assert '-flto' in profiles()['release-static-lto'].cxxflags
+    assert profiles()['release-native'].cxxflags == ('-march=native', )
+    for name, profile in profiles().items():
+        assert profile.name == name
+
+
+def test_parse_profile(mocker):
+    assert parse_profile(None) == DEFAULT
+    profile = Profile(link='static')
+    assert parse_profile(profile) is profile
+    assert parse_profile({'link': 'static'}) == profile
+    assert parse_profile(dict(profile._asdict())) == profile
+    assert parse_profile('release-static-lto') is profiles()[
+        'release-static-lto']
+    assert parse_profile('debug-static') == Profile('debug', 'static')
+    with pytest.raises(ValueError) as exc:
+        parse_profile('static')
+    exc.match(r'release-static-lto')
+    with pytest.raises(TypeError):
+        parse_profile(42)
+
+    mocker.patch.object(Config, 'PROFILE', 'release-static')
+    assert parse_profile(None) == profile
+    mocker.patch.object(Config, 'CXXFLAGS', '-O3')
+    mocker.patch.object(Config, 'LINKFLAGS', '-s')
+    assert parse_profile(None) == Profile(
+        link='static', cxxflags='-O3', linkflags='-s')
+    assert parse_profile('debug') == Profile('debug')
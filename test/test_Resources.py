@@ -0,0 +1,66 @@
+from path import Path
+import pytest
+
+from Boost import Config, Resources
+
+
+@pytest.fixture
+def cgroup_root(tmpdir, mocker):
+    root = Path(str(tmpdir))
+    mocker.patch.object(Resources, 'CGROUP_ROOT', root)
+    mocker.patch.object(Resources, '_read', side_effect=lambda path: (
+        '0::/\n' if path == '/proc/self/cgroup'
+        else Path(path).isfile() and Path(path).text().strip() or None))
+    return root
+
+
+def test_parse_size():
+    assert Config.parse_size('512') == 512
+    assert Config.parse_size('2K') == 2048
+    assert Config.parse_size('1.5G') == 3 * 1024 ** 3 // 2
+    assert Config.parse_size('4GiB') == 4 * 1024 ** 3
+    with pytest.raises(ValueError):
+        Config.parse_size('many')
+
+
+def test_cpus_with_cgroup_v2_quota(cgroup_root, mocker):
+    mocker.patch('os.sched_getaffinity', return_value=set(range(64)))
+    (cgroup_root / 'cpu.max').write_text('250000 100000\n')
+    assert Resources.cpus() == 3
+
+    (cgroup_root / 'cpu.max').write_text('max 100000\n')
+    assert Resources.cpus() == 64
+
+
+def test_cpus_with_cgroup_v1_quota(cgroup_root, mocker):
+    mocker.patch('os.sched_getaffinity', return_value=set(range(8)))
+    (cgroup_root / 'cpu.cfs_quota_us').write_text('400000\n')
+    (cgroup_root / 'cpu.cfs_period_us').write_text('100000\n')
+    assert Resources.cpus() == 4
+
+
+def test_memory_with_cgroup_limit(cgroup_root):
+    (cgroup_root / 'memory.max').write_text(str(4 * 1024 ** 3))
+    (cgroup_root / 'memory.current').write_text(str(1024 ** 3))
+    assert Resources.memory() == 3 * 1024 ** 3
+
+
+class TestJobs(object):
+
+    def test_explicit(self, mocker):
+        mocker.patch.object(Config, 'JOBS', 3)
+        assert Resources.jobs(5) == 5
+        assert Resources.jobs() == 3
+
+    def test_memory_per_job(self, mocker):
+        mocker.patch.object(Config, 'JOBS', None)
+        mocker.patch.object(Config, 'MEMORY_PER_JOB', 1024 ** 3)
+        mocker.patch.object(Resources, 'cpus', return_value=16)
+        memory = mocker.patch.object(Resources, 'memory')
+
+        memory.return_value = 5 * 1024 ** 3 // 2
+        assert Resources.jobs() == 2
+        memory.return_value = 1024
+        assert Resources.jobs() == 1
+        memory.return_value = None
+        assert Resources.jobs() == 16
@@ -1,183 +1,461 @@
-import re
-import platform
-
-from bs4 import BeautifulSoup
-from furl import furl
-from packaging.version import Version
-from path import Path
-import pytest
-import requests
-
-from Boost.Source import BOOST_URL, MIN_BOOST_VERSION, MSVC, TOOLSET, _toolset
-from Boost import Source
-import Boost
-
-
-WIN = platform.system() == 'Windows'
-
-
-def test_import():
-    assert Source is Boost.Source
-
-
-def test_unsupported_toolset(mocker):
-    mocker.patch('platform.python_compiler').return_value = 'UNSUPPORTED'
-    with pytest.raises(RuntimeError) as exc:
-        _toolset()
-    exc.match(repr('UNSUPPORTED'))
-
-
-def test_TOOLSET():
-    assert TOOLSET in ['gcc', 'msvc']
-    compiler = platform.python_compiler()
-    if TOOLSET == 'gcc':
-        assert compiler.startswith('GCC')
-    elif TOOLSET == 'msvc':
-        assert compiler.startswith('MSC')
-
-
-def test_MSVC():
-    assert MSVC is (TOOLSET == 'msvc')
-
-
-def test_BOOST_URL():
-    assert BOOST_URL == furl('http://www.boost.org')
-
-
-def test_MIN_BOOST_VERSION(boost_versions):
-    assert MIN_BOOST_VERSION == min(boost_versions)
-
-
-class TestMeta(object):
-
-    def test_LATEST_VERSION(self, boost_versions):
-        assert Source.LATEST_VERSION == max(boost_versions)
-
-    def test_VERSIONS(self, boost_versions):
-        assert Source.VERSIONS == sorted(boost_versions)
-
-    def test_RELEASE_URLS(self, boost_release_links):
-        assert Source.RELEASE_URLS == {
-            Version(re.match(r'^Version\s+(?P<version>[0-9.]+)$',
-                             link.text.strip())
-                    .group('version')):
-            furl('http://www.boost.org' + link.get('href'))
-            for link in boost_release_links}
-
-    def test_LATEST(self, boost_versions):
-        latest = Source.LATEST
-        assert isinstance(latest, Source)
-        assert latest.version == max(boost_versions)
-        assert latest.path == Path(
-            'boost_' + str(latest.version).replace('.', '_')
-        ).realpath()
-
-
-class TestSource(object):
-
-    def test__init__without_version(self, boost_versions):
-        source = Source()
-        assert source.version == max(boost_versions)
-        assert source.path == Path(
-            'boost_' + str(source.version).replace('.', '_')
-        ).realpath()
-        assert source.path.dirname() != Path(__file__).realpath().dirname()
-
-    def test__init__with_rootpath(self, boost_versions):
-        source = Source(rootpath=Path(__file__).dirname())
-        assert source.version == max(boost_versions)
-        assert source.path == Path(__file__).realpath().dirname() / (
-            'boost_' + str(source.version).replace('.', '_'))
-
-    def test_version(self, boost_versions):
-        for version in boost_versions:
-            assert isinstance(version, Version)
-            assert Source(version).version == version
-
-    def test_boost_lib_version(self, boost_versions):
-        for version in boost_versions:
-            assert isinstance(version, Version)
-            assert (Source(version).boost_lib_version ==
-                    str(version).replace('.', '_'))
-
-    def test_path(self, boost_test_sources, boost_source_rootpath):
-        for source in boost_test_sources:
-            assert source.path == boost_source_rootpath / (
-                'boost_' + str(source.version).replace('.', '_'))
-
-    def test_archive(self, boost_test_sources, boost_source_rootpath):
-        for source in boost_test_sources:
-            assert source.archive == boost_source_rootpath / (
-                'boost_' + str(source.version).replace('.', '_') + '.tar.bz2')
-
-    def test_download_url(self, boost_test_sources, boost_release_links):
-        for source in boost_test_sources:
-            for release_link in boost_release_links:
-                if str(source.version) in release_link.text:
-                    break
-            else:
-                raise RuntimeError("no Boost release link found for {}"
-                                   .format(source.version))
-
-            release_url = furl('http://www.boost.org' +
-                               release_link.get('href'))
-            response = requests.get(release_url)
-            html = BeautifulSoup(response.text, 'html5lib')
-            for link in html.find_all('a'):
-                if link.text.strip().endswith('.tar.bz2'):
-                    assert source.download_url == furl(link.get('href'))
-                    break
-            else:
-                raise RuntimeError("no .tar.bz2 link found in {}"
-                                   .format(release_url))
-
-    def test_download(self, boost_test_sources, boost_source_rootpath):
-        for source in boost_test_sources:
-            archive = source.download()
-            assert archive == Path(archive).realpath() == source.archive
-            assert archive.isfile()
-            assert archive.dirname() == boost_source_rootpath
-
-    def test_extract_without_download(self, boost_test_sources):
-        for source in boost_test_sources:
-            with pytest.raises(FileNotFoundError) as exc:
-                source.extract()
-            exc.match(re.escape(repr(source.archive)))
-
-    def test_extract(self, boost_test_sources, boost_source_rootpath):
-        for source in boost_test_sources:
-            source.download()
-            path = source.extract()
-            assert path == Path(path).realpath() == source.path
-            assert path.isdir()
-            assert path.dirname() == boost_source_rootpath
-            for ext in ('.bat', '.sh'):
-                assert (path / 'bootstrap' + ext).isfile()
-
-    def test_b2_without_extract(self, boost_test_sources):
-        for source in boost_test_sources:
-            with pytest.raises(FileNotFoundError) as exc:
-                source.b2(['--help'])
-            exc.match(re.escape(repr(source.path)))
-
-    def test_b2_without_bootstrap(self, boost_test_sources):
-        for source in boost_test_sources:
-            source.download()
-            source.extract()
-            if TOOLSET == 'msvc':
-                with pytest.raises(RuntimeError):
-                    source.b2(['--help'])
-            else:
-                with pytest.raises(FileNotFoundError):
-                    source.b2(['--help'])
-
-    def test_bootstrap_and_b2(self, boost_test_sources):
-        for source in reversed(boost_test_sources):
-            source.download()
-            source.extract()
-            for ext in ('.exe', ''):
-                assert not (source.path / 'b2' + ext).exists()
-            source.bootstrap()
-            ext = WIN and '.exe' or ''
-            assert (source.path / 'b2' + ext).exists()
-            source.b2(['--help'])
+import asyncio
+import io
+import os
+import re
+import platform
+import sys
+import tarfile
+
+from bs4 import BeautifulSoup
+from furl import furl
+from packaging.specifiers import SpecifierSet
+from packaging.version import Version
+from path import Path
+import pytest
+import requests
+
+from Boost.Index import Index
+from Boost.Mirrors import PROBE_SIZE
+from Boost.Source import (
+    BOOST_URL, MIN_BOOST_VERSION, MSVC, TOOLSET, _call, _extractall,
+    _release_urls, _toolset, parse_version, version_matches)
+from Boost.Prefix import Prefix
+from Boost import Source
+import Boost
+
+
+WIN = platform.system() == 'Windows'
+
+
+HISTORY_PAGE = """\
+<h2><a href="/users/history/version_1_66_0.html">Version 1.66.0</a></h2>
+<p><a href="/users/history/version_1_66_0.html">Release Notes</a>
+   <a href="https://dl.example.com/1.66.0/">Download</a></p>
+<h2><a href="/users/history/version_1_65_1.html">Version 1.65.1</a></h2>
+<p><a href="https://dl.example.com/1.65.1/">Download</a></p>
+<h2><a href="/users/history/version_1_41_0.html">Version 1.41.0</a></h2>
+<p><a href="https://dl.example.com/1.41.0/">Download</a></p>
+<h2><a href="/users/history/version_1_10_0.html">Version 1.10.0</a></h2>
+"""
+
+RELEASE_PAGE = """\
+<table>
+  <tr><th>File</th><th>SHA256 Hash</th></tr>
+  <tr><td><a href="https://dl.example.com/1.66.0/boost_1_66_0.7z">
+    boost_1_66_0.7z</a></td><td>{}</td></tr>
+  <tr><td><a href="https://dl.example.com/1.66.0/boost_1_66_0.tar.bz2">
+    boost_1_66_0.tar.bz2</a></td><td>{}</td></tr>
+</table>
+""".format('7' * 64, 'b' * 64)
+
+
+def test_import():
+    assert Source is Boost.Source
+
+
+def test_unsupported_toolset(mocker):
+    mocker.patch('platform.python_compiler').return_value = 'UNSUPPORTED'
+    with pytest.raises(RuntimeError) as exc:
+        _toolset()
+    exc.match(repr('UNSUPPORTED'))
+
+
+def test_TOOLSET():
+    assert TOOLSET in ['gcc', 'msvc']
+    compiler = platform.python_compiler()
+    if TOOLSET == 'gcc':
+        assert compiler.startswith('GCC')
+    elif TOOLSET == 'msvc':
+        assert compiler.startswith('MSC')
+
+
+def test_MSVC():
+    assert MSVC is (TOOLSET == 'msvc')
+
+
+def test_BOOST_URL():
+    assert BOOST_URL == furl('http://www.boost.org')
+
+
+def test_MIN_BOOST_VERSION(boost_versions):
+    assert MIN_BOOST_VERSION == min(boost_versions)
+
+
+def test_parse_version():
+    assert parse_version(None) is None
+    assert parse_version('1.66.0') == Version('1.66.0')
+    assert parse_version(Version('1.66.0')) == Version('1.66.0')
+    assert parse_version('>=1.70,<1.80') == SpecifierSet('<1.80,>=1.70')
+    with pytest.raises(ValueError) as exc:
+        parse_version('latest')
+    exc.match(repr('latest'))
+
+
+def test_version_matches():
+    assert version_matches('1.66.0', None)
+    assert version_matches(Version('1.66.0'), '1.66')
+    assert not version_matches('1.66.0', '1.65.1')
+    assert version_matches('1.74.0', '>=1.70,<1.80')
+    assert not version_matches('1.80.0', '>=1.70,<1.80')
+
+
+@pytest.mark.parametrize('data_filter', [True, False])
+def test__extractall(data_filter, monkeypatch, tmpdir):
+    if not data_filter:
+        monkeypatch.delattr(tarfile, 'data_filter', raising=False)
+    archive = io.BytesIO()
+    with tarfile.open(fileobj=archive, mode='w|bz2') as tar:
+        info = tarfile.TarInfo('../ESCAPED.txt')
+        info.size = 3
+        tar.addfile(info, io.BytesIO(b'bad'))
+    archive.seek(0)
+    target = Path(str(tmpdir)) / 'target'
+    target.mkdir()
+    with tarfile.open(fileobj=archive, mode='r|bz2') as tar:
+        with pytest.raises(tarfile.TarError):
+            _extractall(tar, target)
+    assert not (Path(str(tmpdir)) / 'ESCAPED.txt').exists()
+
+    archive = io.BytesIO()
+    with tarfile.open(fileobj=archive, mode='w|bz2') as tar:
+        info = tarfile.TarInfo('boost_1_66_0/boost/version.hpp')
+        info.size = 2
+        tar.addfile(info, io.BytesIO(b'//'))
+    archive.seek(0)
+    with tarfile.open(fileobj=archive, mode='r|bz2') as tar:
+        _extractall(tar, target)
+    assert (target / 'boost_1_66_0/boost/version.hpp').text() == '//'
+
+
+@pytest.fixture
+def release_urls(mocker):
+    """
+    Fake :attr:`Boost.Source.RELEASE_URLS` without network access.
+    """
+    urls = {Version(version): furl('http://www.boost.org/users/history/'
+                                   'version_{}.html'.format(
+                                       version.replace('.', '_')))
+            for version in ('1.65.1', '1.66.0', '1.67.0')}
+    mocker.patch.object(type(Source), 'RELEASE_URLS',
+                        new_callable=mocker.PropertyMock, return_value=urls)
+    return urls
+
+
+class TestMeta(object):
+
+    def test_latest_version(self, release_urls):
+        assert Source.latest_version() == Version('1.67.0')
+        assert Source.latest_version('<1.67') == Version('1.66.0')
+        assert Source.latest_version('~=1.65.0') == Version('1.65.1')
+        with pytest.raises(RuntimeError) as exc:
+            Source.latest_version('>=1.70')
+        exc.match(r'1\.65\.1, 1\.66\.0, 1\.67\.0')
+
+    def test_LATEST_VERSION(self, boost_versions):
+        assert Source.LATEST_VERSION == max(boost_versions)
+
+    def test_VERSIONS(self, boost_versions):
+        assert Source.VERSIONS == sorted(boost_versions)
+
+    def test_RELEASE_URLS(self, boost_release_links):
+        assert Source.RELEASE_URLS == {
+            Version(re.match(r'^Version\s+(?P<version>[0-9.]+)$',
+                             link.text.strip())
+                    .group('version')):
+            furl('http://www.boost.org' + link.get('href'))
+            for link in boost_release_links}
+
+    def test_specifier(self, release_urls, tmpdir):
+        source = Source('>=1.65,<1.67', rootpath=str(tmpdir))
+        assert source.version == Version('1.66.0')
+        assert source.path == Path(str(tmpdir)).realpath() / 'boost_1_66_0'
+        assert Source('1.65.1').version == Version('1.65.1')
+
+    def test_LATEST(self, boost_versions):
+        latest = Source.LATEST
+        assert isinstance(latest, Source)
+        assert latest.version == max(boost_versions)
+        assert latest.path == Path(
+            'boost_' + str(latest.version).replace('.', '_')
+        ).realpath()
+
+
+class TestSource(object):
+
+    def test__init__without_version(self, boost_versions):
+        source = Source()
+        assert source.version == max(boost_versions)
+        assert source.path == Path(
+            'boost_' + str(source.version).replace('.', '_')
+        ).realpath()
+        assert source.path.dirname() != Path(__file__).realpath().dirname()
+
+    def test__init__with_rootpath(self, boost_versions):
+        source = Source(rootpath=Path(__file__).dirname())
+        assert source.version == max(boost_versions)
+        assert source.path == Path(__file__).realpath().dirname() / (
+            'boost_' + str(source.version).replace('.', '_'))
+
+    def test_version(self, boost_versions):
+        for version in boost_versions:
+            assert isinstance(version, Version)
+            assert Source(version).version == version
+
+    def test_boost_lib_version(self, boost_versions):
+        for version in boost_versions:
+            assert isinstance(version, Version)
+            assert (Source(version).boost_lib_version ==
+                    str(version).replace('.', '_'))
+
+    def test_path(self, boost_test_sources, boost_source_rootpath):
+        for source in boost_test_sources:
+            assert source.path == boost_source_rootpath / (
+                'boost_' + str(source.version).replace('.', '_'))
+
+    def test_archive(self, boost_test_sources, boost_source_rootpath):
+        for source in boost_test_sources:
+            assert source.archive == boost_source_rootpath / (
+                'boost_' + str(source.version).replace('.', '_') + '.tar.bz2')
+
+    def test_download_url(self, boost_test_sources, boost_release_links):
+        for source in boost_test_sources:
+            for release_link in boost_release_links:
+                if str(source.version) in release_link.text:
+                    break
+            else:
+                raise RuntimeError("no Boost release link found for {}"
+                                   .format(source.version))
+
+            release_url = furl('http://www.boost.org' +
+                               release_link.get('href'))
+            response = requests.get(release_url)
+            html = BeautifulSoup(response.text, 'html5lib')
+            for link in html.find_all('a'):
+                if link.text.strip().endswith('.tar.bz2'):
+                    assert source.download_url == furl(link.get('href'))
+                    break
+            else:
+                raise RuntimeError("no .tar.bz2 link found in {}"
+                                   .format(release_url))
+
+    def test_scraping(self, mocker, tmpdir, http_root, http_server):
+        history = (http_root / 'users' / 'history').makedirs()
+        (history / 'index.html').write_text(HISTORY_PAGE)
+        (history / 'version_1_66_0.html').write_text(RELEASE_PAGE)
+        mocker.patch('Boost.Source.BOOST_URL', furl(str(http_server)))
+        release_urls = _release_urls()
+        assert release_urls == {
+            Version(version): furl('{}/users/history/version_{}.html'.format(
+                http_server, version.replace('.', '_')))
+            for version in ['1.66.0', '1.65.1']}
+
+        meta = type(Source)
+        mocker.patch.object(meta, 'RELEASE_URLS', release_urls)
+        mocker.patch.object(meta, 'INDEX', Index(
+            str(tmpdir / 'releases.json'), offline=False))
+        source = Source('1.66.0', rootpath=str(tmpdir))
+        assert source.download_url == furl(
+            'https://dl.example.com/1.66.0/boost_1_66_0.tar.bz2')
+        assert source.sha256 == 'b' * 64
+        assert source.archives == {
+            'boost_1_66_0.7z': {
+                'url': 'https://dl.example.com/1.66.0/boost_1_66_0.7z',
+                'sha256': '7' * 64},
+            'boost_1_66_0.tar.bz2': {
+                'url': 'https://dl.example.com/1.66.0/boost_1_66_0.tar.bz2',
+                'sha256': 'b' * 64},
+        }
+
+    def test_download(self, boost_test_sources, boost_source_rootpath):
+        for source in boost_test_sources:
+            archive = source.download()
+            assert archive == Path(archive).realpath() == source.archive
+            assert archive.isfile()
+            assert archive.dirname() == boost_source_rootpath
+
+    def test_extract_without_download(self, boost_test_sources):
+        for source in boost_test_sources:
+            with pytest.raises(FileNotFoundError) as exc:
+                source.extract()
+            exc.match(re.escape(repr(source.archive)))
+
+    def test_extract(self, boost_test_sources, boost_source_rootpath):
+        for source in boost_test_sources:
+            source.download()
+            path = source.extract()
+            assert path == Path(path).realpath() == source.path
+            assert path.isdir()
+            assert path.dirname() == boost_source_rootpath
+            for ext in ('.bat', '.sh'):
+                assert (path / 'bootstrap' + ext).isfile()
+
+    def test_b2_without_extract(self, boost_test_sources):
+        for source in boost_test_sources:
+            with pytest.raises(FileNotFoundError) as exc:
+                source.b2(['--help'])
+            exc.match(re.escape(repr(source.path)))
+
+    def test_b2_without_bootstrap(self, boost_test_sources):
+        for source in boost_test_sources:
+            source.download()
+            source.extract()
+            if TOOLSET == 'msvc':
+                with pytest.raises(RuntimeError):
+                    source.b2(['--help'])
+            else:
+                with pytest.raises(FileNotFoundError):
+                    source.b2(['--help'])
+
+    def test_bootstrap_and_b2(self, boost_test_sources):
+        for source in reversed(boost_test_sources):
+            source.download()
+            source.extract()
+            for ext in ('.exe', ''):
+                assert not (source.path / 'b2' + ext).exists()
+            source.bootstrap()
+            ext = WIN and '.exe' or ''
+            assert (source.path / 'b2' + ext).exists()
+            source.b2(['--help'])
+
+    def test_b2_jobs(self, tmpdir, mocker):
+        call = mocker.patch('Boost.Source._call', return_value=0)
+        source = Source('1.66.0', rootpath=str(tmpdir))
+        source.path.makedirs()
+        source.b2(['--help'], jobs=7)
+        command = call.call_args[0][0]
+        assert '-j7' in command
+        assert command[-1] == '--help'
+
+        mocker.patch('Boost.Resources.jobs', return_value=42)
+        source.b2()
+        assert '-j42' in call.call_args[0][0]
+
+    def test_async(self, boost_archive_source, mocker):
+        source = boost_archive_source
+        assert asyncio.run(source.adownload()) == source.archive
+        assert asyncio.run(source.aextract()) == source.path
+        assert source.extracted
+
+        call = mocker.patch('Boost.Source._call', return_value=0)
+        mocker.patch.object(Source, 'bootstrapped', True)
+        asyncio.run(source.abuild(['system'], jobs=3))
+        assert '-j3' in call.call_args[0][0]
+        assert source.built(['system'])
+
+    def test_components_args(self):
+        assert Source.components_args() == []
+        assert Source.components_args(['system', 'filesystem']) == [
+            '--with-filesystem', '--with-system']
+        assert Source.components_args(['-python']) == ['--without-python']
+
+    def test_download_with_extract(self, boost_archive_source,
+                                   boost_archive):
+        source = boost_archive_source
+        path = source.download(extract=True)
+        assert path == source.path
+        assert (path / 'boost' / 'version.hpp').isfile()
+        assert source.archive.bytes() == boost_archive.bytes()
+        assert not (source.archive + '.part').exists()
+
+    def test_download_with_extract_without_keep(self, boost_archive_source):
+        source = boost_archive_source
+        assert source.download(extract=True, keep=False) == source.path
+        assert (source.path / 'bootstrap.sh').isfile()
+        assert not source.archive.exists()
+
+    def test_download_with_extract_and_wrong_sha256(
+            self, boost_archive_source, mocker):
+        source = boost_archive_source
+        mocker.patch.object(Source, 'sha256', '0' * 64)
+        with pytest.raises(RuntimeError) as exc:
+            source.download(extract=True)
+        exc.match(r'SHA256 mismatch')
+        assert not source.path.exists()
+        assert not source.archive.exists()
+        assert not (source.archive + '.part').exists()
+
+    def test_download_from_mirror(self, boost_archive_source, boost_archive,
+                                  http_server, tmpdir, mocker):
+        mirror = Path(str(tmpdir.mkdir('mirror')))
+        boost_archive.copy(mirror / boost_archive.name)
+        mocker.patch.object(Boost.Config, 'MIRRORS', (
+            str(http_server) + '/missing/', str(mirror)))
+        source = boost_archive_source
+        assert source.download() == source.archive
+        assert source.archive.bytes() == boost_archive.bytes()
+        # only probed
+        assert {entry[2] for entry in http_server.server.log} == {
+            'bytes=0-{}'.format(PROBE_SIZE - 1)}
+
+    def test_download_with_extract_from_failing_mirror(
+            self, boost_archive_source, boost_archive, http_server, tmpdir,
+            mocker):
+        mirror = Path(str(tmpdir.mkdir('mirror')))
+        (mirror / boost_archive.name).write_bytes(b'corrupted')
+        mocker.patch('Boost.Mirrors.rank', side_effect=list)
+        mocker.patch.object(Boost.Config, 'MIRRORS', (str(mirror), ))
+        source = boost_archive_source
+        assert source.download(extract=True) == source.path
+        assert source.archive.bytes() == boost_archive.bytes()
+
+    @pytest.mark.parametrize('link', ['copy', 'hardlink', 'symlink'])
+    def test_install_headers(self, boost_archive_source, tmpdir, link):
+        source = boost_archive_source
+        source.download(extract=True)
+        prefix = Path(str(tmpdir)) / 'prefix'
+        source.install(prefix, header_only=True, link=link)
+        header = prefix / 'include' / 'boost' / 'version.hpp'
+        assert header.text() == (source.path / 'boost' / 'version.hpp').text()
+        assert (prefix / 'include' / 'boost').islink() is (link == 'symlink')
+        if link == 'hardlink':
+            assert header.stat().st_nlink == 2
+        assert Prefix(prefix).header_only
+        assert Prefix(prefix).info['version'] == '1.66.0'
+        assert not (prefix / 'lib').exists()
+
+    def test_install_headers_with_invalid_link(self, tmpdir):
+        with pytest.raises(ValueError):
+            Source('1.66.0', rootpath=str(tmpdir)).install_headers(
+                str(tmpdir), link='invalid')
+
+    def test_engine_key(self, boost_archive_source):
+        source = boost_archive_source
+        source.download(extract=True)
+        key = source.engine_key
+        assert source.engine_version == '2015.07'
+        assert key.startswith('2015.07-')
+        # bootstrap build outputs don't change the key
+        (source.engine_path / 'bootstrap').makedirs()
+        (source.engine_path / 'bootstrap' / 'jam0.c').write_text('')
+        assert source.engine_key == key
+
+        (source.engine_path / 'jam.c').write_text('')
+        assert source.engine_key != key
+
+    def test_bootstrap_with_cached_engine(
+            self, boost_archive_source, carefree_boost_home, mocker):
+        source = boost_archive_source
+        source.download(extract=True)
+        cached = source.engine_cache
+        assert cached == (carefree_boost_home / '.cache' / 'b2' /
+                          source.engine_key / TOOLSET / 'b2')
+        source.bootstrap()
+        assert cached.isfile()
+        assert cached.bytes() == (source.path / 'b2').bytes()
+        assert cached.dirname().listdir() == [cached]
+
+        source.path.rmtree()
+        source.extract()
+        call = mocker.patch('Boost.Source._call', wraps=_call)
+        source.bootstrap()
+        assert not call.called
+        assert source.bootstrapped
+        assert os.access(source.path / 'b2', os.X_OK)
+        config = (source.path / 'project-config.jam').text()
+        assert 'using gcc ;' in config
+        assert '"{}"'.format(sys.executable) in config
+
+        source.path.rmtree()
+        source.extract()
+        source.bootstrap(cache=False)
+        assert call.called